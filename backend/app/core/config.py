@@ -2,6 +2,7 @@
 import json
 import os
 from pathlib import Path
+from urllib.parse import urlparse
 from dotenv import load_dotenv
 import urllib3
 
@@ -58,4 +59,16 @@ def get_urls(category: str):
         seq = conf.get("seq", "")
         list_url = f"{base_domain}/menu/{menu_id}.do"
         info_url = f"{base_domain}/menu/board/info/{menu_id}.do"
-        return list_url, info_url, seq
\ No newline at end of file
+        return list_url, info_url, seq
+
+
+# 호스트(netloc) -> 사이트 유형 (상세 페이지 URL만으로 파서/추출 규칙을 고르기 위함)
+SITE_TYPE_BY_NETLOC = {
+    urlparse(str(conf.get("domain", ""))).netloc: conf.get("type", "main_cms")
+    for conf in NOTICE_CONFIGS.values()
+    if conf.get("domain")
+}
+
+
+def get_site_type_for_url(url: str) -> str:
+    return SITE_TYPE_BY_NETLOC.get(urlparse(url).netloc, "main_cms")
@@ -0,0 +1,294 @@
+# app/core/html_parser.py
+"""
+HTML 파서 추상화 계층
+
+크롤러/스크래퍼는 BeautifulSoup이나 selectolax를 직접 다루지 않고
+parse_html()이 돌려주는 HtmlNode의 공통 API(select / text / attr / find_all ...)만 사용합니다.
+
+기본 백엔드 (HTML_PARSER 환경 변수로 바꿀 수 있음):
+  1. lxml      (BeautifulSoup + lxml 트리 빌더)
+  2. html.parser (표준 라이브러리, 가장 느림)
+selectolax(lexbor)는 설치되어 있어도 자동으로 쓰지 않습니다. HTML_PARSER=selectolax로 켭니다.
+
+사이트 유형별로 백엔드를 바꾸려면 HTML_PARSER_<SITE_TYPE> 를 설정합니다. (예: HTML_PARSER_DAEPLE=html.parser)
+"""
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, CData, NavigableString, SoupStrainer, Tag
+
+from app.core.logger import get_logger
+
+logger = get_logger()
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as _SelectolaxParser  # type: ignore
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    _SelectolaxParser = None
+    SELECTOLAX_AVAILABLE = False
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+BACKEND_SELECTOLAX = "selectolax"
+BACKEND_LXML = "lxml"
+BACKEND_HTML_PARSER = "html.parser"
+
+
+def available_backends() -> List[str]:
+    backends = []
+    if SELECTOLAX_AVAILABLE:
+        backends.append(BACKEND_SELECTOLAX)
+    if LXML_AVAILABLE:
+        backends.append(BACKEND_LXML)
+    backends.append(BACKEND_HTML_PARSER)
+    return backends
+
+
+def _resolve_backend(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    name = name.strip().lower()
+    if name in available_backends():
+        return name
+    logger.warning(f"⚠️ [Parser] '{name}' 백엔드를 사용할 수 없어 기본값으로 대체합니다")
+    return None
+
+
+# selectolax는 명시적으로 골랐을 때만 사용 (설치 여부에 따라 동작이 바뀌지 않도록)
+DEFAULT_BACKEND = _resolve_backend(os.getenv("HTML_PARSER")) or (
+    BACKEND_LXML if LXML_AVAILABLE else BACKEND_HTML_PARSER
+)
+
+# 사이트 유형별 백엔드 오버라이드
+SITE_TYPE_BACKENDS: Dict[str, str] = {}
+for _site_type in ("main_cms", "library", "daeple"):
+    _backend = _resolve_backend(os.getenv(f"HTML_PARSER_{_site_type.upper()}"))
+    if _backend:
+        SITE_TYPE_BACKENDS[_site_type] = _backend
+
+
+def backend_for(site_type: Optional[str] = None) -> str:
+    if site_type and site_type in SITE_TYPE_BACKENDS:
+        return SITE_TYPE_BACKENDS[site_type]
+    return DEFAULT_BACKEND
+
+
+# ============================================================
+# 공통 노드 API
+# ============================================================
+class HtmlNode(ABC):
+    """파서 백엔드와 무관한 요소 노드 인터페이스"""
+
+    tag: str = ""
+    # CSS 셀렉터를 네이티브 코드로 처리하는 백엔드 (select를 여러 번 부르는 편이 파이썬 순회보다 빠름)
+    native_css: bool = False
+
+    @abstractmethod
+    def select(self, css: str) -> List["HtmlNode"]:
+        ...
+
+    @abstractmethod
+    def select_one(self, css: str) -> Optional["HtmlNode"]:
+        ...
+
+    @abstractmethod
+    def text(self, separator: str = "", strip: bool = False) -> str:
+        ...
+
+    @abstractmethod
+    def attr(self, name: str) -> Optional[str]:
+        ...
+
+    @abstractmethod
+    def find_all(self, *tags: str) -> List["HtmlNode"]:
+        """하위 요소를 문서 순서대로 반환 (tags가 없으면 모든 요소)"""
+        ...
+
+    @abstractmethod
+    def children(self) -> Iterator[Union["HtmlNode", str]]:
+        """직계 자식을 문서 순서대로 반환 (요소는 HtmlNode, 텍스트는 str, 주석 등은 생략)"""
+        ...
+
+    @abstractmethod
+    def parent(self) -> Optional["HtmlNode"]:
+        ...
+
+    @abstractmethod
+    def key(self) -> int:
+        """같은 요소를 가리키는 노드끼리 같은 값을 갖는 식별자"""
+        ...
+
+    @abstractmethod
+    def decompose(self):
+        ...
+
+    @abstractmethod
+    def html(self) -> str:
+        ...
+
+
+class SoupNode(HtmlNode):
+    """BeautifulSoup(html.parser / lxml) 백엔드"""
+
+    __slots__ = ("_tag",)
+
+    def __init__(self, tag: Union[Tag, BeautifulSoup]):
+        self._tag = tag
+
+    @property
+    def tag(self) -> str:  # type: ignore[override]
+        return self._tag.name or ""
+
+    def select(self, css: str) -> List[HtmlNode]:
+        return [SoupNode(t) for t in self._tag.select(css)]
+
+    def select_one(self, css: str) -> Optional[HtmlNode]:
+        found = self._tag.select_one(css)
+        return SoupNode(found) if found is not None else None
+
+    def text(self, separator: str = "", strip: bool = False) -> str:
+        return self._tag.get_text(separator, strip=strip)
+
+    def attr(self, name: str) -> Optional[str]:
+        value = self._tag.get(name)
+        if value is None:
+            return None
+        if isinstance(value, list):
+            return " ".join(value)
+        return str(value)
+
+    def find_all(self, *tags: str) -> List[HtmlNode]:
+        found = self._tag.find_all(list(tags) if tags else True)
+        return [SoupNode(t) for t in found if isinstance(t, Tag)]
+
+    def children(self) -> Iterator[Union[HtmlNode, str]]:
+        for child in self._tag.children:
+            if isinstance(child, Tag):
+                yield SoupNode(child)
+            elif type(child) in (NavigableString, CData):
+                yield str(child)
+
+    def parent(self) -> Optional[HtmlNode]:
+        parent = self._tag.parent
+        return SoupNode(parent) if parent is not None else None
+
+    def key(self) -> int:
+        return id(self._tag)
+
+    def decompose(self):
+        self._tag.decompose()
+
+    def html(self) -> str:
+        return str(self._tag)
+
+
+class SelectolaxNode(HtmlNode):
+    """selectolax 백엔드 (노드가 살아있는 동안 문서 객체를 함께 붙잡아 둡니다)"""
+
+    __slots__ = ("_node", "_doc")
+    native_css = True
+
+    def __init__(self, node, doc):
+        self._node = node
+        self._doc = doc
+
+    @property
+    def tag(self) -> str:  # type: ignore[override]
+        return self._node.tag or ""
+
+    def select(self, css: str) -> List[HtmlNode]:
+        return [SelectolaxNode(n, self._doc) for n in self._node.css(css)]
+
+    def select_one(self, css: str) -> Optional[HtmlNode]:
+        found = self._node.css_first(css)
+        return SelectolaxNode(found, self._doc) if found is not None else None
+
+    def text(self, separator: str = "", strip: bool = False) -> str:
+        return self._node.text(deep=True, separator=separator, strip=strip)
+
+    def attr(self, name: str) -> Optional[str]:
+        return self._node.attributes.get(name)
+
+    def find_all(self, *tags: str) -> List[HtmlNode]:
+        wanted = set(tags)
+        nodes = []
+        for n in self._node.traverse(include_text=False):
+            if n.mem_id == self._node.mem_id:
+                continue
+            if not wanted or n.tag in wanted:
+                nodes.append(SelectolaxNode(n, self._doc))
+        return nodes
+
+    def children(self) -> Iterator[Union[HtmlNode, str]]:
+        for child in self._node.iter(include_text=True):
+            tag = child.tag
+            if tag == "-text":
+                yield child.text_content or ""
+            elif tag and not tag.startswith("-"):
+                yield SelectolaxNode(child, self._doc)
+
+    def parent(self) -> Optional[HtmlNode]:
+        parent = self._node.parent
+        return SelectolaxNode(parent, self._doc) if parent is not None else None
+
+    def key(self) -> int:
+        return self._node.mem_id
+
+    def decompose(self):
+        self._node.decompose()
+
+    def html(self) -> str:
+        return self._node.html or ""
+
+
+def remove_nodes(nodes: Iterable[HtmlNode]):
+    """
+    노드들을 트리에서 제거합니다.
+    중첩된 경우 바깥 노드만 제거합니다. (이미 해제된 자식 노드를 다시 건드리지 않도록)
+    """
+    nodes = list(nodes)
+    keys = {n.key() for n in nodes}
+    outermost = []
+    for node in nodes:
+        ancestor = node.parent()
+        while ancestor is not None and ancestor.key() not in keys:
+            ancestor = ancestor.parent()
+        if ancestor is None:
+            outermost.append(node)
+    # 제거는 중첩 여부를 모두 판정한 뒤에 수행
+    for node in outermost:
+        node.decompose()
+
+
+# ============================================================
+# 파싱 진입점
+# ============================================================
+def parse_html(
+    markup: Union[str, bytes],
+    site_type: Optional[str] = None,
+    backend: Optional[str] = None,
+    strain: Optional[Tuple[str, str]] = None,
+) -> HtmlNode:
+    """
+    HTML을 파싱해 루트 노드를 반환합니다.
+
+    strain=(tag, class)를 주면 BeautifulSoup 백엔드는 해당 영역만 트리로 만듭니다.
+    (selectolax는 전체 파싱이 충분히 빨라 무시합니다)
+    """
+    name = backend or backend_for(site_type)
+
+    if name == BACKEND_SELECTOLAX and _SelectolaxParser is not None:
+        doc = _SelectolaxParser(markup or "<html></html>")
+        if doc.root is not None:
+            return SelectolaxNode(doc.root, doc)
+
+    parse_only = SoupStrainer(strain[0], class_=strain[1]) if strain else None
+    features = BACKEND_LXML if name == BACKEND_LXML else BACKEND_HTML_PARSER
+    return SoupNode(BeautifulSoup(markup, features, parse_only=parse_only))
+
@@ -1,19 +1,389 @@
 # app/core/http.py
+import asyncio
+import time
 import httpx
 import os
+from bisect import bisect_left
+from collections import deque
+from typing import Any, Deque, Dict, List
+from urllib.parse import urlparse
 from fastapi import HTTPException
 from app.core.logger import get_logger
 
 logger = get_logger()
 
+# HTTP/2는 h2 패키지가 설치된 경우에만 사용 (httpx[http2])
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+HTTP2_ENABLED = HTTP2_AVAILABLE and os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+# 호스트(netloc)당 동시에 열어둘 수 있는 요청 수
+HOST_MAX_CONNECTIONS = max(1, int(os.getenv("HTTP_HOST_MAX_CONNECTIONS", "6")))
+
+# 요청 기본 타임아웃 (초). 호스트별 응답 시간이 쌓이면 그보다 짧게 조정됨
+DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "20"))
+CONNECT_TIMEOUT = 5.0
+# 연속 실패가 이만큼 쌓이면 호스트 회로를 열어 요청을 바로 실패시킴
+CIRCUIT_FAILURE_THRESHOLD = max(1, int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5")))
+# 회로를 연 뒤 시험 요청(half-open)을 보내기까지 기다리는 시간 (초, 시험 요청이 실패할 때마다 2배)
+CIRCUIT_COOLDOWN = float(os.getenv("CIRCUIT_COOLDOWN", "60"))
+CIRCUIT_COOLDOWN_MAX = float(os.getenv("CIRCUIT_COOLDOWN_MAX", "900"))
+# 응답 시간 기반 타임아웃: p95 × 배수 (ADAPTIVE_TIMEOUT_MIN ~ 요청 타임아웃 사이)
+ADAPTIVE_TIMEOUT_ENABLED = os.getenv("ADAPTIVE_TIMEOUT_ENABLED", "true").lower() == "true"
+ADAPTIVE_TIMEOUT_MULTIPLIER = float(os.getenv("ADAPTIVE_TIMEOUT_MULTIPLIER", "4"))
+ADAPTIVE_TIMEOUT_MIN = float(os.getenv("ADAPTIVE_TIMEOUT_MIN", "3"))
+# 호스트별로 기억할 최근 응답 시간 수 / 타임아웃 조정을 시작할 최소 표본 수
+LATENCY_WINDOW = 200
+LATENCY_MIN_SAMPLES = 20
+# 응답 시간 히스토그램 구간 상한 (ms)
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# 호스트별 요청 속도 (AIMD 토큰 버킷, 초당 요청 수)
+# 빠르게 응답하면 HOST_RATE_INCREASE씩 올리고, 429/503/타임아웃/느린 응답이면 절반으로 내림
+HOST_RATE_START = float(os.getenv("HOST_RATE_START", "2"))
+HOST_RATE_MIN = float(os.getenv("HOST_RATE_MIN", "0.2"))
+HOST_RATE_MAX = float(os.getenv("HOST_RATE_MAX", "10"))
+HOST_RATE_INCREASE = float(os.getenv("HOST_RATE_INCREASE", "0.5"))
+# 이보다 느린 응답은 서버가 버거워하는 신호로 보고 속도를 내림 (초)
+HOST_RATE_SLOW_LATENCY = float(os.getenv("HOST_RATE_SLOW_LATENCY", "3"))
+# 호스트별 최대 속도 (예: "web.kangnam.ac.kr=3,dls.kangnam.ac.kr=1"). 기본: 메인 포털은 낮게 유지
+HOST_RATE_LIMITS = {
+    netloc.strip(): float(limit)
+    for netloc, _, limit in (
+        item.partition("=") for item in os.getenv("HOST_RATE_LIMITS", "web.kangnam.ac.kr=3").split(",") if "=" in item
+    )
+}
+# 속도를 내린 뒤 다시 내릴 수 있기까지의 최소 간격 (초): 이미 보낸 요청들의 실패로 연달아 깎이지 않도록
+HOST_RATE_DECREASE_INTERVAL = 1.0
+# Retry-After로 멈출 수 있는 최대 시간 (초)
+HOST_RATE_MAX_PAUSE = 60.0
+
+# Connection 헤더는 HTTP/2에서 금지된 헤더이므로 넣지 않습니다 (keep-alive는 httpx 기본 동작)
 DEFAULT_HEADERS = {
   "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
   "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-  "Connection": "keep-alive"
 }
 
 _global_client: httpx.AsyncClient | None = None
 _is_shutting_down = False  # [New] 종료 신호 플래그
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+_host_health: Dict[str, "HostHealth"] = {}
+_host_limiters: Dict[str, "HostRateLimiter"] = {}
+
+
+class ConnectionStats:
+    """커넥션 재사용률과 핸드셰이크(TCP+TLS) 소요 시간 집계"""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.http2_requests = 0
+        self.handshake_seconds = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        reuse_ratio = self.reused_connections / self.requests if self.requests else 0.0
+        avg_handshake_ms = (self.handshake_seconds / self.new_connections * 1000) if self.new_connections else 0.0
+        return {
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(reuse_ratio, 3),
+            "http2_requests": self.http2_requests,
+            "handshake_seconds": round(self.handshake_seconds, 3),
+            "avg_handshake_ms": round(avg_handshake_ms, 1),
+        }
+
+
+connection_stats = ConnectionStats()
+
+
+def _make_trace():
+    """httpcore trace 확장으로 요청 하나가 새 커넥션을 열었는지 기록합니다."""
+    state = {"new": False, "started": 0.0, "handshake": 0.0, "http2": False}
+
+    async def trace(event_name: str, info: dict):
+        if event_name in ("connection.connect_tcp.started", "connection.start_tls.started"):
+            state["new"] = True
+            state["started"] = time.perf_counter()
+        elif event_name in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            state["handshake"] += time.perf_counter() - state["started"]
+        elif event_name.startswith("http2."):
+            state["http2"] = True
+
+    return trace, state
+
+
+def _record_trace(state: dict):
+    connection_stats.requests += 1
+    if state["new"]:
+        connection_stats.new_connections += 1
+        connection_stats.handshake_seconds += state["handshake"]
+    else:
+        connection_stats.reused_connections += 1
+    if state["http2"]:
+        connection_stats.http2_requests += 1
+
+
+def log_connection_stats(reset: bool = True):
+    stats = connection_stats.snapshot()
+    if stats["requests"]:
+        logger.info(
+            f"🔌 [HTTP] 요청 {stats['requests']}건, 커넥션 재사용 {stats['reused_connections']}건 "
+            f"({stats['reuse_ratio'] * 100:.0f}%), 신규 {stats['new_connections']}건 "
+            f"(평균 핸드셰이크 {stats['avg_handshake_ms']:.0f}ms), HTTP/2 {stats['http2_requests']}건"
+        )
+    if reset:
+        connection_stats.reset()
+    return stats
+
+# ============================================================
+# 호스트별 상태 (서킷 브레이커 + 응답 시간 기반 타임아웃)
+# ============================================================
+class CircuitOpenError(httpx.TransportError):
+    """호스트 회로가 열려 있어 요청을 보내지 않고 실패"""
+
+
+class HostHealth:
+    """
+    호스트(netloc) 하나의 상태
+    closed    : 정상. 연속 실패(타임아웃/접속 오류/5xx)가 CIRCUIT_FAILURE_THRESHOLD번이면 open
+    open      : cooldown 동안 요청을 보내지 않고 CircuitOpenError
+    half_open : cooldown이 지나면 시험 요청 하나만 통과. 성공하면 closed, 실패하면 cooldown을 늘려 다시 open
+    """
+
+    def __init__(self, netloc: str):
+        self.netloc = netloc
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.cooldown = CIRCUIT_COOLDOWN
+        self.opened_at = 0.0
+        self.probing = False
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.histogram: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.requests = 0
+        self.failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def check(self):
+        """
+        속도 제한 토큰/슬롯을 기다리기 전에 부르는 검사: 회로가 열려 있으면 바로 CircuitOpenError. (상태는 바꾸지 않음)
+        죽은 호스트는 속도도 HOST_RATE_MIN까지 내려가 있으므로, 거절될 요청이 토큰을 기다리며 몇 초씩 잠들지 않도록 합니다.
+        """
+        if self.state == "open" and time.monotonic() - self.opened_at < self.cooldown:
+            self.rejected += 1
+            raise CircuitOpenError(f"circuit open for {self.netloc}")
+        if self.state == "half_open" and self.probing:
+            self.rejected += 1
+            raise CircuitOpenError(f"circuit half-open for {self.netloc} (probe in flight)")
+
+    def acquire(self) -> bool:
+        """요청을 보내도 되면 True (half-open 시험 요청이면 probing 표시). 회로가 열려 있으면 CircuitOpenError."""
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.cooldown:
+                self.rejected += 1
+                raise CircuitOpenError(f"circuit open for {self.netloc}")
+            self.state = "half_open"
+            logger.info(f"🟡 [HTTP] {self.netloc} 회로 half-open: 시험 요청 전송")
+        if self.state == "half_open":
+            if self.probing:
+                self.rejected += 1
+                raise CircuitOpenError(f"circuit half-open for {self.netloc} (probe in flight)")
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self, seconds: float):
+        self.requests += 1
+        self.latencies.append(seconds)
+        self.histogram[bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+        self.consecutive_failures = 0
+        if self.state != "closed":
+            logger.info(f"🟢 [HTTP] {self.netloc} 회로 닫힘 (복구)")
+            self.state = "closed"
+            self.cooldown = CIRCUIT_COOLDOWN
+
+    def record_failure(self, timed_out_after: float | None = None):
+        """
+        실패 집계. 타임아웃이면 그 타임아웃 값을 응답 시간 표본으로 넣어
+        호스트가 느려졌을 때 p95(= 다음 타임아웃)가 따라 늘어나게 합니다.
+        """
+        self.requests += 1
+        self.failures += 1
+        self.consecutive_failures += 1
+        if timed_out_after is not None:
+            self.latencies.append(timed_out_after)
+        if self.state == "half_open":
+            self.cooldown = min(CIRCUIT_COOLDOWN_MAX, self.cooldown * 2)
+            self._open()
+        elif self.state == "closed" and self.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+            self._open()
+
+    def _open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        # 지난 응답 시간은 더 이상 믿을 수 없으므로 비움: 복구 후 표본이 다시 쌓일 때까지 요청 타임아웃 전체를 씀
+        self.latencies.clear()
+        logger.warning(
+            f"🔴 [HTTP] {self.netloc} 회로 열림: 연속 실패 {self.consecutive_failures}회, {self.cooldown:.0f}초 동안 요청 차단"
+        )
+
+    def percentile(self, q: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def timeout(self, limit: float) -> float:
+        """관측한 p95 × ADAPTIVE_TIMEOUT_MULTIPLIER (ADAPTIVE_TIMEOUT_MIN ~ limit). 표본이 적으면 limit."""
+        if not ADAPTIVE_TIMEOUT_ENABLED or len(self.latencies) < LATENCY_MIN_SAMPLES:
+            return limit
+        p95 = self.percentile(0.95) or 0.0
+        return max(min(ADAPTIVE_TIMEOUT_MIN, limit), min(limit, p95 * ADAPTIVE_TIMEOUT_MULTIPLIER))
+
+    def snapshot(self) -> Dict[str, Any]:
+        def ms(value: float | None) -> float | None:
+            return round(value * 1000, 1) if value is not None else None
+
+        labels = [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at)) if self.state == "open" else 0.0
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_seconds": round(retry_in, 1),
+            "times_opened": self.times_opened,
+            "requests": self.requests,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "timeout_seconds": round(self.timeout(DEFAULT_TIMEOUT), 2),
+            "latency_ms": {"p50": ms(self.percentile(0.5)), "p95": ms(self.percentile(0.95)), "p99": ms(self.percentile(0.99))},
+            "histogram": dict(zip(labels, self.histogram)),
+        }
+
+
+class HostRateLimiter:
+    """
+    호스트 하나의 요청 속도 제한 (토큰 버킷, AIMD)
+    rate(초당 요청 수)만큼 토큰이 차고 요청마다 하나씩 씁니다. (버스트는 최대 1초 분량)
+    빠른 응답마다 rate += HOST_RATE_INCREASE (최대 max_rate),
+    429/503/타임아웃/느린 응답이면 rate를 절반으로 (최소 HOST_RATE_MIN), Retry-After가 있으면 그동안 멈춤.
+    """
+
+    def __init__(self, netloc: str):
+        self.netloc = netloc
+        self.max_rate = HOST_RATE_LIMITS.get(netloc, HOST_RATE_MAX)
+        self.rate = min(HOST_RATE_START, self.max_rate)
+        self.tokens = 1.0
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self._lock = asyncio.Lock()
+        self.increases = 0
+        self.decreases = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self.priority_requests = 0
+
+    async def acquire(self):
+        """토큰이 찰 때까지 기다립니다. (대기 순서대로)"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated_at) * self.rate)
+                    self.updated_at = now
+                    if self.tokens >= 1.0:
+                        self.tokens -= 1.0
+                        return
+                    wait = (1.0 - self.tokens) / self.rate
+                self.wait_seconds += wait
+                await asyncio.sleep(wait)
+
+    def take(self):
+        """
+        기다리지 않고 토큰 하나를 씁니다. (사용자가 기다리는 요청용 우선 차선)
+        토큰은 최대 1초 분량까지 빚질 수 있어, 뒤따르는 크롤링 요청이 그만큼 늦춰지고 호스트 전체 속도는 그대로 유지됩니다.
+        """
+        now = time.monotonic()
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        self.tokens = max(-max(1.0, self.rate), self.tokens - 1.0)
+        self.priority_requests += 1
+
+    def on_success(self, seconds: float):
+        if seconds > HOST_RATE_SLOW_LATENCY:
+            self._decrease(f"느린 응답 {seconds:.1f}초")
+            return
+        if self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + HOST_RATE_INCREASE)
+            self.increases += 1
+
+    def on_throttle(self, reason: str, retry_after: str | None = None):
+        self.throttled += 1
+        if retry_after:
+            try:
+                pause = min(HOST_RATE_MAX_PAUSE, float(retry_after))
+                self.paused_until = max(self.paused_until, time.monotonic() + pause)
+            except ValueError:
+                pass  # HTTP 날짜 형식은 무시하고 감속만
+        self._decrease(reason)
+
+    def _decrease(self, reason: str):
+        now = time.monotonic()
+        if now - self.last_decrease < HOST_RATE_DECREASE_INTERVAL:
+            return
+        self.last_decrease = now
+        previous = self.rate
+        self.rate = max(HOST_RATE_MIN, self.rate / 2)
+        self.tokens = min(self.tokens, 1.0)
+        self.decreases += 1
+        logger.info(f"🐢 [HTTP] {self.netloc} 요청 속도 {previous:.1f} → {self.rate:.1f}/초 ({reason})")
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "rate_per_sec": round(self.rate, 2),
+            "max_rate_per_sec": self.max_rate,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "throttled": self.throttled,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "priority_requests": self.priority_requests,
+            "paused_seconds": round(max(0.0, self.paused_until - time.monotonic()), 1),
+        }
+
+
+def get_host_limiter(netloc: str) -> HostRateLimiter:
+    limiter = _host_limiters.get(netloc)
+    if limiter is None:
+        limiter = HostRateLimiter(netloc)
+        _host_limiters[netloc] = limiter
+    return limiter
+
+
+def get_host_health(netloc: str) -> HostHealth:
+    health = _host_health.get(netloc)
+    if health is None:
+        health = HostHealth(netloc)
+        _host_health[netloc] = health
+    return health
+
+
+def get_host_health_stats() -> Dict[str, Dict[str, Any]]:
+    return {
+        netloc: {**health.snapshot(), "rate": get_host_limiter(netloc).snapshot()}
+        for netloc, health in sorted(_host_health.items())
+    }
+
 
 def get_client() -> httpx.AsyncClient:
     global _global_client
@@ -24,7 +394,7 @@ def get_client() -> httpx.AsyncClient:
 
     if _global_client is None:
         limits = httpx.Limits(max_keepalive_connections=20, max_connections=50)
-        timeout = httpx.Timeout(20.0, connect=5.0)
+        timeout = httpx.Timeout(DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT)
         
         # SSL 검증 설정 (환경 변수로 제어)
         ssl_verify = os.getenv("SSL_VERIFY", "False").lower() == "true"
@@ -34,11 +404,12 @@ def get_client() -> httpx.AsyncClient:
             limits=limits,
             headers=DEFAULT_HEADERS,
             verify=ssl_verify,
-            follow_redirects=True
+            follow_redirects=True,
+            http2=HTTP2_ENABLED
         )
         
         verify_status = "활성화" if ssl_verify else "비활성화"
-        logger.info(f"🔒 SSL 검증: {verify_status}")
+        logger.info(f"🔒 SSL 검증: {verify_status} / HTTP/2: {'사용' if HTTP2_ENABLED else '미사용'}")
         
     return _global_client
 
@@ -51,21 +422,148 @@ async def close_client():
         _global_client = None
         logger.info("💤 HTTP Client Closed")
 
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    netloc = urlparse(url).netloc
+    sem = _host_semaphores.get(netloc)
+    if sem is None:
+        sem = asyncio.Semaphore(HOST_MAX_CONNECTIONS)
+        _host_semaphores[netloc] = sem
+    return sem
+
+
+async def request_get(
+    url: str,
+    params: dict | None = None,
+    headers: dict | None = None,
+    timeout: float | None = None,
+    priority: bool = False,
+) -> httpx.Response:
+    """
+    공유 커넥션 풀을 통한 GET 요청 (호스트별 동시 요청 수 / 요청 속도 제한 + 커넥션 재사용 통계)
+    호스트 회로가 열려 있으면 CircuitOpenError, 타임아웃은 호스트의 최근 응답 시간에 맞춰 줄어듭니다.
+    상태 코드 검사는 호출 측에서 합니다. (5xx는 호스트 실패로 집계)
+    priority=True(사용자가 기다리는 요청)는 속도 제한 대기열에 서지 않고 토큰만 씁니다.
+    """
+    client = get_client()
+    trace, state = _make_trace()
+    netloc = urlparse(url).netloc
+    health = get_host_health(netloc)
+    limiter = get_host_limiter(netloc)
+
+    # 회로가 열려 있으면 토큰을 쓰거나 기다리지 않고 바로 실패
+    health.check()
+    # 토큰은 슬롯을 잡기 전에 받음: 토큰을 기다리는 크롤링 요청이 슬롯을 차지해 우선 요청까지 막지 않도록
+    if priority:
+        limiter.take()
+    else:
+        await limiter.acquire()
+    async with _host_semaphore(url):
+        # 대기하는 동안 회로가 열렸을 수 있으므로 토큰과 슬롯을 얻은 뒤 확인
+        probe = health.acquire()
+        full_limit = timeout if timeout is not None else DEFAULT_TIMEOUT
+        # half-open 시험 요청은 줄어든 타임아웃이 아니라 요청 타임아웃 전체로 보냄
+        limit = full_limit if probe else health.timeout(full_limit)
+        started = time.perf_counter()
+        try:
+            response = await client.get(
+                url,
+                params=params,
+                headers=headers,
+                extensions={"trace": trace},
+                timeout=httpx.Timeout(limit, connect=min(limit, CONNECT_TIMEOUT)),
+            )
+        except httpx.TransportError as e:
+            timed_out = isinstance(e, httpx.TimeoutException)
+            health.record_failure(timed_out_after=limit if timed_out else None)
+            if timed_out:
+                limiter.on_throttle("타임아웃")
+            raise
+        finally:
+            if probe:
+                health.probing = False
+        elapsed = time.perf_counter() - started
+        if response.status_code in (429, 503):
+            limiter.on_throttle(f"HTTP {response.status_code}", response.headers.get("retry-after"))
+        if response.status_code >= 500:
+            health.record_failure()
+        else:
+            health.record_success(elapsed)
+            if response.status_code != 429:
+                limiter.on_success(elapsed)
+    _record_trace(state)
+    return response
+
+
 async def fetch_html(url: str, params: dict | None = None) -> str:
     try:
         # 종료 중일 때 get_client 호출 시 에러가 발생하므로 여기서 잡힘
-        client = get_client()
-        response = await client.get(url, params=params)
+        response = await request_get(url, params=params)
         response.raise_for_status()
         return response.text
 
     except httpx.HTTPStatusError as e:
         logger.error(f"❌ HTTP Error {e.response.status_code} at {url}")
         raise HTTPException(status_code=502, detail="Upstream Server Error")
+    except CircuitOpenError:
+        logger.warning(f"⛔ 회로 열림, 요청 생략: {url}")
+        raise HTTPException(status_code=503, detail="Upstream Temporarily Unavailable")
     except Exception as e:
         # 종료 중 발생하는 에러는 로그 레벨을 낮추거나 무시
         if _is_shutting_down:
             logger.warning(f"🛑 Shutdown interrupt at {url}")
             return "" 
         logger.error(f"❌ Connection Error at {url}: {str(e)}")
-        raise HTTPException(status_code=500, detail="Proxy Connection Failed")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Proxy Connection Failed")
+
+
+class ConditionalFetchResult:
+    """조건부 GET 결과 (304이면 text는 빈 문자열)"""
+
+    def __init__(self, not_modified: bool, text: str = "", etag: str | None = None, last_modified: str | None = None):
+        self.not_modified = not_modified
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+async def fetch_html_conditional(
+    url: str,
+    params: dict | None = None,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> ConditionalFetchResult:
+    """If-None-Match / If-Modified-Since를 붙여 요청하고 304이면 본문 없이 반환합니다."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    try:
+        response = await request_get(url, params=params, headers=headers)
+        if response.status_code == 304:
+            return ConditionalFetchResult(
+                not_modified=True,
+                etag=response.headers.get("ETag") or etag,
+                last_modified=response.headers.get("Last-Modified") or last_modified,
+            )
+        response.raise_for_status()
+        return ConditionalFetchResult(
+            not_modified=False,
+            text=response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    except httpx.HTTPStatusError as e:
+        logger.error(f"❌ HTTP Error {e.response.status_code} at {url}")
+        raise HTTPException(status_code=502, detail="Upstream Server Error")
+    except CircuitOpenError:
+        logger.warning(f"⛔ 회로 열림, 요청 생략: {url}")
+        raise HTTPException(status_code=503, detail="Upstream Temporarily Unavailable")
+    except Exception as e:
+        if _is_shutting_down:
+            logger.warning(f"🛑 Shutdown interrupt at {url}")
+            return ConditionalFetchResult(not_modified=False)
+        logger.error(f"❌ Connection Error at {url}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Proxy Connection Failed")
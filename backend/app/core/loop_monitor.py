@@ -0,0 +1,68 @@
+# app/core/loop_monitor.py
+"""
+이벤트 루프 지연(lag) 모니터
+
+짧은 주기로 sleep하는 백그라운드 태스크가 예정보다 얼마나 늦게 깨어났는지를 기록합니다.
+늦어진 만큼이 "루프가 다른 작업(파싱 등)에 막혀 있던 시간"입니다.
+크롤링 전후 구간의 통계를 비교해 파싱 오프로딩 효과를 확인할 수 있습니다.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from app.core.logger import get_logger
+
+logger = get_logger()
+
+LOOP_MONITOR_INTERVAL = float(os.getenv("LOOP_MONITOR_INTERVAL", "0.05"))
+# 이 값(초) 이상 늦어진 샘플만 "막힘"으로 집계
+BLOCKED_THRESHOLD = 0.01
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = LOOP_MONITOR_INTERVAL, max_samples: int = 20000):
+        self.interval = interval
+        self._samples: Deque[Tuple[float, float]] = deque(maxlen=max_samples)
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._samples.append((now, max(0.0, now - started - self.interval)))
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats_since(self, since: float) -> Dict[str, Any]:
+        """since(time.monotonic 기준) 이후 샘플의 지연 통계 (ms)"""
+        lags = sorted(lag for ts, lag in self._samples if ts >= since)
+        if not lags:
+            return {"samples": 0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0, "blocked_ms": 0.0}
+
+        def pct(p: float) -> float:
+            return lags[min(len(lags) - 1, int(len(lags) * p))] * 1000
+
+        return {
+            "samples": len(lags),
+            "p50_ms": round(pct(0.50), 1),
+            "p95_ms": round(pct(0.95), 1),
+            "max_ms": round(lags[-1] * 1000, 1),
+            "blocked_ms": round(sum(lag for lag in lags if lag >= BLOCKED_THRESHOLD) * 1000, 1),
+        }
+
+
+loop_monitor = LoopLagMonitor()
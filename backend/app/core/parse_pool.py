@@ -0,0 +1,83 @@
+# app/core/parse_pool.py
+"""
+CPU 바운드 HTML 파싱을 이벤트 루프 밖에서 실행하기 위한 실행기
+
+PARSE_POOL_MODE
+  - process : 제한된 ProcessPoolExecutor (기본값)
+  - thread  : ThreadPoolExecutor (GIL이 없는 파이썬 빌드에서는 자동 선택)
+  - inline  : 이벤트 루프에서 직접 실행 (비교/디버깅용)
+
+작업 함수는 모듈 최상위 함수여야 하며, 인자로 바이트/문자열을 받고 일반 dict를 반환해야 합니다.
+"""
+import asyncio
+import multiprocessing
+import os
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from app.core.logger import get_logger
+
+logger = get_logger()
+
+MODE_PROCESS = "process"
+MODE_THREAD = "thread"
+MODE_INLINE = "inline"
+
+
+def _default_mode() -> str:
+    # free-threaded 빌드(3.13t 이상)에서는 스레드만으로도 병렬 파싱이 가능
+    gil_check = getattr(sys, "_is_gil_enabled", None)
+    if gil_check is not None and not gil_check():
+        return MODE_THREAD
+    return MODE_PROCESS
+
+
+PARSE_POOL_MODE = os.getenv("PARSE_POOL_MODE", "").strip().lower() or _default_mode()
+if PARSE_POOL_MODE not in (MODE_PROCESS, MODE_THREAD, MODE_INLINE):
+    PARSE_POOL_MODE = _default_mode()
+PARSE_POOL_WORKERS = max(1, int(os.getenv("PARSE_POOL_WORKERS") or min(4, os.cpu_count() or 1)))
+
+_executor: Optional[Executor] = None
+
+
+def get_executor() -> Optional[Executor]:
+    global _executor
+    if PARSE_POOL_MODE == MODE_INLINE:
+        return None
+    if _executor is None:
+        if PARSE_POOL_MODE == MODE_THREAD:
+            _executor = ThreadPoolExecutor(max_workers=PARSE_POOL_WORKERS, thread_name_prefix="parse")
+        else:
+            # spawn: 이벤트 루프/DB 스레드를 가진 부모 프로세스를 fork하지 않도록
+            _executor = ProcessPoolExecutor(
+                max_workers=PARSE_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        logger.info(f"🧵 파싱 실행기 준비: {PARSE_POOL_MODE} x {PARSE_POOL_WORKERS}")
+    return _executor
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+        logger.info("💤 파싱 실행기 종료")
+
+
+async def run_parse(func: Callable[..., Any], *args: Any) -> Any:
+    """func(*args)를 파싱 실행기에서 실행합니다. 워커 풀이 깨지면 다시 만들고 한 번 재시도합니다."""
+    executor = get_executor()
+    if executor is None:
+        return func(*args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        logger.warning("⚠️ 파싱 워커 풀이 비정상 종료되어 재생성합니다")
+        shutdown_executor()
+        executor = get_executor()
+        return await loop.run_in_executor(executor, func, *args)
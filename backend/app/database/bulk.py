@@ -0,0 +1,212 @@
+# app/database/bulk.py
+"""
+공지 대량 저장 / 집합 단위 갱신
+
+ORM 객체를 한 건씩 add 하는 대신 INSERT ... ON CONFLICT (link, category) 를 사용합니다.
+  - PostgreSQL(asyncpg)과 SQLite 모두 같은 방언 insert 구문으로 처리
+  - 충돌(이미 다른 경로에서 저장된 공지)은 해당 행만 건너뛰고 나머지는 그대로 저장
+  - RETURNING 으로 실제로 새로 들어간 행의 id만 돌려받아 알림 대상으로 사용
+필독 플래그도 행을 불러와 속성을 바꾸지 않고 UPDATE ... WHERE ... RETURNING 으로 바뀐 행만 돌려받습니다.
+알림 발송 이력은 행 수가 많으면 PostgreSQL(asyncpg)에서 COPY로 임시 테이블에 넣은 뒤 INSERT ... SELECT 한 번으로 옮깁니다.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import and_, or_, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import get_logger
+from app.database.models import CrawlFailureLog, Notice, NotificationHistory, NotificationOutbox
+
+logger = get_logger()
+
+# execute 한 번에 넘길 행 수 (실제 VALUES 묶음 크기는 SQLAlchemy가 바인드 파라미터 상한에 맞춰 나눔)
+INSERT_CHUNK_SIZE = 500
+
+NOTICE_CONFLICT_COLUMNS = ("link", "category")
+
+# 발송 이력이 이 행 수 이상이면 (PostgreSQL + asyncpg) COPY 경로 사용
+HISTORY_COPY_THRESHOLD = 1000
+HISTORY_COLUMNS = ("device_id", "notice_id", "sent_at")
+# 트랜잭션이 끝나면 비워지는 세션 임시 테이블 (연결마다 한 번 생성)
+_HISTORY_STAGE_DDL = text(
+    "CREATE TEMP TABLE IF NOT EXISTS notification_history_stage "
+    "(device_id integer, notice_id integer, sent_at timestamptz) ON COMMIT DELETE ROWS"
+)
+_HISTORY_STAGE_MERGE = text(
+    "INSERT INTO notification_history (device_id, notice_id, sent_at) "
+    "SELECT device_id, notice_id, sent_at FROM notification_history_stage "
+    "ON CONFLICT ON CONSTRAINT uix_notification_device_notice DO NOTHING"
+)
+_HISTORY_STAGE_CLEAR = text("TRUNCATE notification_history_stage")
+
+
+def _chunks(items: Sequence[Any], size: int) -> Iterable[Sequence[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _dialect_insert(db: AsyncSession):
+    """ON CONFLICT / RETURNING을 지원하는 방언의 insert (지원하는 DB는 PostgreSQL과 SQLite뿐)"""
+    name = db.get_bind().dialect.name
+    if name == "postgresql":
+        return pg_insert
+    if name == "sqlite":
+        return sqlite_insert
+    raise RuntimeError(f"지원하지 않는 데이터베이스입니다: {name} (PostgreSQL / SQLite만 지원)")
+
+
+async def insert_notices(
+    db: AsyncSession,
+    rows: Sequence[Dict[str, Any]],
+    update_columns: Optional[Sequence[str]] = None,
+) -> List[Tuple[int, str]]:
+    """
+    공지 행들을 저장하고 (id, link) 목록을 반환합니다. 커밋은 호출자가 합니다.
+
+    update_columns가 없으면 ON CONFLICT DO NOTHING (새로 들어간 행만 반환),
+    있으면 ON CONFLICT DO UPDATE SET <update_columns> (갱신된 행도 반환)입니다.
+    """
+    if not rows:
+        return []
+
+    insert = _dialect_insert(db)
+    stmt = insert(Notice)
+    if update_columns:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(NOTICE_CONFLICT_COLUMNS),
+            set_={col: getattr(stmt.excluded, col) for col in update_columns},
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=list(NOTICE_CONFLICT_COLUMNS))
+    stmt = stmt.returning(Notice.id, Notice.link)
+
+    # executemany 형태로 넘기면 SQLAlchemy가 행들을 여러 VALUES 묶음으로 나눠 보내며(insertmanyvalues)
+    # 컴파일된 구문을 재사용합니다.
+    saved: List[Tuple[int, str]] = []
+    for chunk in _chunks(list(rows), INSERT_CHUNK_SIZE):
+        result = await db.execute(stmt, list(chunk))
+        saved.extend((int(row[0]), str(row[1])) for row in result.all())
+    return saved
+
+
+async def insert_notification_history(db: AsyncSession, rows: Sequence[Dict[str, Any]]) -> None:
+    """
+    알림 발송 이력 (device_id, notice_id[, sent_at])을 저장합니다. 이미 있는 조합은 건너뜁니다. (커밋은 호출자가 합니다)
+
+    PostgreSQL(asyncpg)에서 HISTORY_COPY_THRESHOLD행 이상이면 COPY 경로,
+    그 외에는 INSERT ... ON CONFLICT DO NOTHING 을 executemany(여러 VALUES 묶음)로 보냅니다.
+    """
+    if not rows:
+        return
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql" and bind.dialect.driver == "asyncpg" and len(rows) >= HISTORY_COPY_THRESHOLD:
+        await _copy_notification_history(db, rows)
+        return
+
+    insert = _dialect_insert(db)
+    stmt = insert(NotificationHistory).on_conflict_do_nothing(index_elements=["device_id", "notice_id"])
+    for chunk in _chunks(list(rows), INSERT_CHUNK_SIZE):
+        await db.execute(stmt, list(chunk))
+
+
+async def _copy_notification_history(db: AsyncSession, rows: Sequence[Dict[str, Any]]) -> None:
+    """COPY로 임시 테이블에 넣고 INSERT ... SELECT ... ON CONFLICT DO NOTHING 으로 옮깁니다. (같은 트랜잭션)"""
+    now = datetime.now(timezone.utc)
+    records = [(row["device_id"], row["notice_id"], row.get("sent_at") or now) for row in rows]
+
+    await db.execute(_HISTORY_STAGE_DDL)
+    connection = await db.connection()
+    raw = await connection.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(
+        "notification_history_stage", records=records, columns=list(HISTORY_COLUMNS)
+    )
+    await db.execute(_HISTORY_STAGE_MERGE)
+    # 같은 트랜잭션에서 다시 호출될 수 있으므로 바로 비움
+    await db.execute(_HISTORY_STAGE_CLEAR)
+
+
+async def enqueue_notifications(db: AsyncSession, notice_ids: Sequence[int]) -> None:
+    """알림 발송 대기열(outbox)에 공지를 넣습니다. 이미 있으면 건너뜁니다. (커밋은 호출자가 합니다)"""
+    if not notice_ids:
+        return
+    rows = [{"notice_id": notice_id, "status": "pending"} for notice_id in notice_ids]
+    insert = _dialect_insert(db)
+    stmt = insert(NotificationOutbox).on_conflict_do_nothing(index_elements=["notice_id"])
+    for chunk in _chunks(rows, INSERT_CHUNK_SIZE):
+        await db.execute(stmt, list(chunk))
+
+
+async def insert_crawl_failures(db: AsyncSession, rows: Sequence[Dict[str, Any]]) -> Set[Tuple[str, str]]:
+    """
+    상세 수집 실패 행들을 넣고 새로 들어간 (url, category)를 반환합니다. (커밋은 호출자가 합니다)
+    이미 기록된 URL은 ON CONFLICT (url, category) DO NOTHING으로 건너뛰므로 동시에 기록해도 행이 겹치지 않습니다.
+    """
+    if not rows:
+        return set()
+    insert = _dialect_insert(db)
+    stmt = (
+        insert(CrawlFailureLog)
+        .on_conflict_do_nothing(index_elements=["url", "category"])
+        .returning(CrawlFailureLog.url, CrawlFailureLog.category)
+    )
+    inserted: Set[Tuple[str, str]] = set()
+    for chunk in _chunks(list(rows), INSERT_CHUNK_SIZE):
+        result = await db.execute(stmt, list(chunk))
+        inserted.update((str(row[0]), str(row[1])) for row in result.all())
+    return inserted
+
+
+async def expire_pins(db: AsyncSession, category: str, cutoff: datetime) -> List[Tuple[int, str]]:
+    """cutoff 이전에 수집된 카테고리의 필독 공지를 해제하고 해제된 (id, title) 목록을 반환합니다. (커밋은 호출자가 합니다)"""
+    result = await db.execute(
+        update(Notice)
+        .where(and_(Notice.category == category, Notice.is_pinned == True, Notice.crawled_at < cutoff))
+        .values(is_pinned=False)
+        .returning(Notice.id, Notice.title)
+        .execution_options(synchronize_session=False)
+    )
+    return [(int(row[0]), str(row[1])) for row in result.all()]
+
+
+async def reconcile_pins(
+    db: AsyncSession, category: str, pinned_links: Sequence[str], cutoff: datetime
+) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+    """
+    카테고리의 필독 상태를 목록의 필독 집합에 맞춥니다. (UPDATE 두 번, 커밋은 호출자가 합니다)
+
+    최종 상태: pinned_links에 있고 cutoff 이후에 수집된 공지만 필독.
+    반환: (새로 필독이 된 (id, title) 목록, 해제된 (id, title) 목록)
+    """
+    links = list(pinned_links)
+    pinned: List[Tuple[int, str]] = []
+    if links:
+        result = await db.execute(
+            update(Notice)
+            .where(and_(
+                Notice.category == category,
+                Notice.is_pinned == False,
+                Notice.link.in_(links),
+                Notice.crawled_at >= cutoff,
+            ))
+            .values(is_pinned=True)
+            .returning(Notice.id, Notice.title)
+            .execution_options(synchronize_session=False)
+        )
+        pinned = [(int(row[0]), str(row[1])) for row in result.all()]
+
+    # 목록에 필독이 하나도 없으면 카테고리의 필독 공지 전부가 해제 대상
+    conditions = [Notice.category == category, Notice.is_pinned == True]
+    if links:
+        conditions.append(or_(Notice.link.not_in(links), Notice.crawled_at < cutoff))
+    result = await db.execute(
+        update(Notice)
+        .where(and_(*conditions))
+        .values(is_pinned=False)
+        .returning(Notice.id, Notice.title)
+        .execution_options(synchronize_session=False)
+    )
+    unpinned = [(int(row[0]), str(row[1])) for row in result.all()]
+    return pinned, unpinned
@@ -56,11 +56,62 @@ async def close_db_connection():
 
 
 
+def _add_missing_columns(sync_conn):
+    """이미 있는 테이블에 빠진 칼럼을 ALTER TABLE ADD COLUMN으로 추가합니다. (NULL 허용 칼럼만)"""
+    from sqlalchemy import inspect, text
+    inspector = inspect(sync_conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=sync_conn.dialect)
+            sync_conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            logger.info(f"🗄️ 칼럼 추가: {table.name}.{column.name}")
+
+
+def _create_missing_indexes(sync_conn):
+    from sqlalchemy import inspect
+    inspector = inspect(sync_conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.unique and index.name not in existing and "id" in table.c:
+                _drop_duplicates(sync_conn, table, [column.name for column in index.columns])
+            index.create(sync_conn, checkfirst=True)
+
+
+def _drop_duplicates(sync_conn, table, columns):
+    """UNIQUE 인덱스를 나중에 추가할 때: 같은 키의 행 중 가장 최근(id 최대) 것만 남깁니다."""
+    from sqlalchemy import delete, func, select
+    keep = select(func.max(table.c.id)).group_by(*(table.c[name] for name in columns)).scalar_subquery()
+    result = sync_conn.execute(delete(table).where(table.c.id.not_in(keep)))
+    if result.rowcount:
+        logger.info(f"🗄️ 중복 행 {result.rowcount}개 삭제: {table.name} ({', '.join(columns)})")
+
+
 async def init_db():
     """DB 테이블 비동기 생성"""
     try:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
+            # create_all은 이미 있는 테이블에 나중에 추가된 칼럼도 만들지 않으므로 따로 보충
+            await conn.run_sync(_add_missing_columns)
+            # create_all은 이미 있는 테이블에 나중에 추가된 인덱스를 만들지 않으므로 따로 보충
+            await conn.run_sync(_create_missing_indexes)
         logger.info("🗄️ 데이터베이스 초기화 완료")
     except Exception as e:
-        logger.critical(f"🔥 DB 초기화 실패: {e}")
\ No newline at end of file
+        logger.critical(f"🔥 DB 초기화 실패: {e}")
+        return
+
+    # 검색 인덱스는 실패해도 LIKE 검색으로 동작하므로 별도 트랜잭션에서 준비
+    from app.services.search_index import get_backend, setup_search_index
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(setup_search_index)
+        logger.info(f"🔎 검색 백엔드: {get_backend()}")
+    except Exception as e:
+        logger.warning(f"⚠️ {e}")
\ No newline at end of file
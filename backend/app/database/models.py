@@ -79,6 +79,26 @@ class Notice(Base):
         UniqueConstraint('link', 'category', name='uix_link_category'),
     )
 
+# [목록 키셋 페이지네이션용 복합 인덱스]
+# 정렬 순서(is_pinned DESC, date DESC NULLS LAST, id DESC)를 그대로 따라 읽을 수 있도록 만듭니다.
+# SQLite는 CREATE INDEX에 NULLS LAST를 쓸 수 없지만 NULL을 가장 작은 값으로 취급해 DESC에서 자연히 맨 뒤로 갑니다.
+Index(
+    'idx_notice_feed_category', Notice.category,
+    Notice.is_pinned.desc(), Notice.date.desc().nulls_last(), Notice.id.desc(),
+).ddl_if(dialect='postgresql')
+Index(
+    'idx_notice_feed_all',
+    Notice.is_pinned.desc(), Notice.date.desc().nulls_last(), Notice.id.desc(),
+).ddl_if(dialect='postgresql')
+Index(
+    'idx_notice_feed_category_lite', Notice.category,
+    Notice.is_pinned.desc(), Notice.date.desc(), Notice.id.desc(),
+).ddl_if(dialect='sqlite')
+Index(
+    'idx_notice_feed_all_lite',
+    Notice.is_pinned.desc(), Notice.date.desc(), Notice.id.desc(),
+).ddl_if(dialect='sqlite')
+
 # ============================================================
 # Keyword (알림 키워드/카테고리)
 # ============================================================
@@ -184,4 +204,99 @@ class CrawlFailureLog(Base):
     last_retry_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), 
         nullable=True
-    )
\ No newline at end of file
+    )
+    # 다음 재시도 시각 (NULL이면 최대 시도 횟수를 넘겨 포기한 URL)
+    next_retry_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True),
+        nullable=True,
+        index=True
+    )
+    # 목록에서 읽은 제목 / 필독 여부 (재시도로 저장할 때 사용)
+    list_title: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    is_pinned: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True, default=False)
+    # 재시도로 저장할 때 키워드 알림을 보낼지 (백필에서 실패한 과거 공지는 False, NULL은 True로 취급)
+    notify: Mapped[Optional[bool]] = mapped_column(Boolean, nullable=True, default=True)
+
+    # (url, category)당 한 행. 기존 테이블에도 init_db가 만들 수 있도록 제약조건 대신 UNIQUE 인덱스로 둠
+    __table_args__ = (
+        Index('uix_crawl_failure_url_category', 'url', 'category', unique=True),
+    )
+# ============================================================
+# 크롤링 워터마크 (카테고리별 증분 수집 기준점)
+# ============================================================
+class CrawlWatermark(Base):
+    __tablename__ = "crawl_watermarks"
+
+    category: Mapped[str] = mapped_column(String, primary_key=True)
+    # 마지막으로 처리한 목록 1페이지의 가장 최신 일반 게시글 encMenuBoardSeq
+    last_board_seq: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # 1페이지 일반 게시글 seq 목록 (최신순). 기준 글이 삭제돼도 멈출 지점을 찾기 위해 함께 보관
+    recent_seqs: Mapped[List[str]] = mapped_column(JSONEncodedDict, default=[])
+    # 필독 공지 URL 집합 다이제스트 (바뀌었을 때만 필독 상태를 재정리)
+    pinned_digest: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # 목록 영역 다이제스트 (재시작 후에도 변경 없는 목록을 건너뛰기 위해)
+    list_digest: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+# ============================================================
+# 백필 체크포인트 (중단된 과거 공지 수집을 이어서 진행하기 위한 진행 상태)
+# ============================================================
+class BackfillCheckpoint(Base):
+    __tablename__ = "backfill_checkpoints"
+
+    category: Mapped[str] = mapped_column(String, primary_key=True)
+    # running / paused / completed / failed
+    status: Mapped[str] = mapped_column(String, default="running")
+    # 목표: 최대 페이지 수 / 이 날짜보다 오래된 공지를 만나면 종료
+    target_pages: Mapped[int] = mapped_column(default=0)
+    target_date: Mapped[Optional[DateType]] = mapped_column(Date, nullable=True)
+    # 다음에 가져올 목록 페이지 (재개 지점)
+    next_page: Mapped[int] = mapped_column(default=1)
+    scanned: Mapped[int] = mapped_column(default=0)
+    inserted: Mapped[int] = mapped_column(default=0)
+    failed: Mapped[int] = mapped_column(default=0)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
+
+# ============================================================
+# 알림 발송 대기열 (outbox: 새 공지와 같은 트랜잭션으로 기록, 워커가 비동기로 발송)
+# ============================================================
+class NotificationOutbox(Base):
+    __tablename__ = "notification_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    notice_id: Mapped[int] = mapped_column(
+        ForeignKey("notices.id", ondelete="CASCADE"),
+        unique=True
+    )
+    # pending / processing / done / failed
+    status: Mapped[str] = mapped_column(String, default="pending")
+    attempts: Mapped[int] = mapped_column(default=0)
+    # 이 시각 이후에 처리 (재시도 백오프)
+    available_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+    # 워커가 가져간 시각 (임대 시간이 지나도 processing이면 워커가 죽은 것으로 보고 다시 처리)
+    locked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+    )
+
+    __table_args__ = (
+        Index('idx_outbox_status_available', 'status', 'available_at'),
+    )
@@ -23,8 +23,10 @@ from app.core.config import NOTICE_CONFIGS
 from app.database.database import engine, Base, AsyncSessionLocal, init_db
 from app.core.logger import get_logger
 from app.core.http import close_client, get_client
+from app.core.parse_pool import shutdown_executor
+from app.core.loop_monitor import loop_monitor
 from app.core.env_validator import validate_environment
-from app.services import knu_notice_service, notification_service
+from app.services import knu_notice_service, notification_service, crawl_retry, crawl_scheduler, backfill, push_dispatcher, push_outbox, retention, view_counter
 from app.routers import knu, health
 
 # 환경 변수 검증 (서버 시작 전 실행)
@@ -42,26 +44,8 @@ limiter = Limiter(key_func=get_remote_address, default_limits=["200/minute"])
 
 async def scheduled_crawl_job():
     logger.info("🚀 [스케줄러] 정기 크롤링 시작")
-    categories = list(NOTICE_CONFIGS.keys())
-    
-    for i, cat in enumerate(categories):
-        async with AsyncSessionLocal() as db:
-            try:
-                await knu_notice_service.crawl_and_sync_notices(db, cat)
-            except asyncio.CancelledError:
-                logger.warning(f"🛑 [{cat}] 작업 취소됨")
-                raise
-            except Exception as e:
-                logger.error(f"❌ [{cat}] 크롤링 실패: {e}")
-        
-        try:
-            if i < len(categories) - 1:
-                await asyncio.sleep(2)
-        except asyncio.CancelledError:
-            logger.warning("🛑 대기 중 작업 취소됨")
-            raise
-
-    logger.info("🏁 [스케줄러] 크롤링 완료")
+    report = await crawl_scheduler.run_crawl_sweep()
+    logger.info(f"🏁 [스케줄러] 크롤링 완료 ({report['wall_time']:.1f}초)")
 
 async def initial_crawl():
     try:
@@ -84,11 +68,20 @@ async def lifespan(app: FastAPI):
         logger.error(f"❌ HTTP Client 초기화 실패: {e}")
         raise
     
+    loop_monitor.start()
+    
     logger.info("⚡ API Server Started! (Kangrimi Backend)")
     
     if not scheduler.running:
         scheduler.add_job(scheduled_crawl_job, 'interval', minutes=30)
+        scheduler.add_job(view_counter.flush, 'interval', seconds=view_counter.VIEW_FLUSH_INTERVAL)
+        scheduler.add_job(knu_notice_service.retry_failed_details, 'interval', seconds=crawl_retry.CRAWL_RETRY_INTERVAL)
+        scheduler.add_job(retention.run, 'interval', hours=retention.RETENTION_INTERVAL_HOURS)
         scheduler.start()
+
+    # 알림 발송 대기열 워커 / 푸시 영수증 확인
+    push_outbox.start()
+    push_dispatcher.start_receipt_poller()
     
     crawl_task = asyncio.create_task(initial_crawl())
     
@@ -106,10 +99,24 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"⚠️ 작업 종료 중 에러: {e}")
 
+    # 백필은 체크포인트에 paused로 남겨 다음 실행 때 이어서 진행
+    await backfill.stop_backfill(timeout=5.0)
+
     if scheduler.running:
         scheduler.shutdown(wait=False)
+
+    # 처리 중이던 알림은 대기열에 남아 다음 실행 때 이어서 발송
+    await push_outbox.stop(timeout=5.0)
+    await push_dispatcher.stop()
+
+    # 버퍼에 남은 조회수 증가분 반영
+    flushed = await view_counter.flush()
+    if flushed:
+        logger.info(f"👁️ 종료 전 조회수 반영: {flushed}개 공지")
         
     await close_client()
+    shutdown_executor()
+    await loop_monitor.stop()
     await engine.dispose()
     
     logger.info("👋 서버 리소스가 정리되었습니다.")
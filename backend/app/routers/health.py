@@ -4,6 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 import firebase_admin
 from app.database.database import get_db
+from app.core.http import get_host_health_stats
 from app.core.logger import get_logger
 
 router = APIRouter()
@@ -16,11 +17,13 @@ async def health_check(db: AsyncSession = Depends(get_db)):
     - 데이터베이스 연결 상태
     - Firebase 초기화 상태
     - 전반적인 서비스 가용성
+    - 크롤링 대상 호스트별 회로 상태 / 응답 시간
     """
     health_status = {
         "status": "healthy",
         "database": "unknown",
         "firebase": "unknown",
+        "upstream": {},
         "details": {}
     }
     
@@ -46,7 +49,14 @@ async def health_check(db: AsyncSession = Depends(get_db)):
         health_status["firebase"] = "error"
         health_status["details"]["firebase_error"] = str(e)
     
-    # 3. 전체 상태 판단
+    # 3. 크롤링 대상 호스트 (회로가 열린 호스트가 있어도 API 자체는 정상으로 봄)
+    hosts = get_host_health_stats()
+    health_status["upstream"] = hosts
+    unavailable = [netloc for netloc, stats in hosts.items() if stats["state"] != "closed"]
+    if unavailable:
+        health_status["details"]["upstream_unavailable"] = unavailable
+
+    # 4. 전체 상태 판단
     if health_status["database"] != "connected":
         return {"status_code": 503, **health_status}
     
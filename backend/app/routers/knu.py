@@ -1,17 +1,18 @@
 # app/routers/knu.py
+import hashlib
 import json
 from typing import List, Optional, cast
 from datetime import date as DateType
 
-from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, or_, desc, func, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, delete, desc, func, and_
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from app.database.database import get_db
-from app.database.models import Notice, Device, Scrap, Keyword
+from app.database.models import CrawlFailureLog, Notice, Device, Scrap, Keyword, device_keywords
 from app.schemas import (
     NoticeListResponse, 
     NoticeDetailResponse, 
@@ -19,10 +20,11 @@ from app.schemas import (
     ScrapRequest,
     KeywordSubscriptionRequest
 )
-from app.services import knu_notice_service
-from app.services.scraper import scrape_notice_content
+from app.services import knu_notice_service, crawl_retry, detail_fetcher, device_cache, list_cache, crawl_scheduler, backfill, notice_counts, push_dispatcher, push_outbox, response_cache, retention, scrap_membership, search_index, view_counter
 from app.core.logger import get_logger
 from app.utils.security import ensure_allowed_url
+from app.utils import http_cache
+from app.utils.pagination import decode_cursor, next_cursor_for
 from app.core.config import NOTICE_CONFIGS
 from app.middleware.auth import verify_admin_key
 
@@ -39,56 +41,97 @@ GENERAL_CATEGORIES = ["academic", "scholar", "learning", "job", "event_internal"
 @router.get("/notices")
 async def read_notices(
     request: Request,
+    response: Response,
     category: str = "all",
     q: Optional[str] = Query(None, description="검색어"),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
     sort_by: str = Query("date", pattern="^(date|views)$"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (있으면 page 대신 사용)"),
+    include_total: Optional[bool] = Query(None, description="전체 개수 포함 여부 (기본: page 모드 포함, 커서 모드 생략)"),
     token: Optional[str] = Query(None, description="스크랩 확인용 토큰"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     공지사항 목록 조회 (페이지네이션 + 메타데이터 포함)
-    """
-    skip = (page - 1) * size
-    
-    # 전체 개수 조회
-    count_stmt = select(func.count(Notice.id))
-    if category != "all":
-        count_stmt = count_stmt.where(Notice.category == category)
-    if q:
-        count_stmt = count_stmt.where(Notice.title.like(f"%{q}%"))
     
-    total_result = await db.execute(count_stmt)
-    total = total_result.scalar() or 0
-    
-    # 목록 조회
-    results = await knu_notice_service.search_notices(
-        db, category, query=q, skip=skip, limit=size, sort_by=sort_by
+    - 무한 스크롤: cursor 없이 첫 페이지를 받고, 이후 응답의 next_cursor를 그대로 넘기면
+      OFFSET 없이 인덱스를 따라 이어 읽으므로 몇 번째 페이지든 비용이 같습니다.
+    - page 파라미터(OFFSET 방식)도 그대로 지원합니다.
+    - 응답 본문은 조회 조건별로 캐시되며(response_cache), 스크랩 여부만 요청마다 덧씌웁니다.
+    - ETag가 If-None-Match와 같으면 DB 조회 없이 304를 반환합니다.
+    """
+    cache_control = http_cache.PRIVATE_REVALIDATE if token else f"public, max-age={http_cache.NOTICE_LIST_MAX_AGE}"
+    etag = http_cache.make_etag(
+        "notices", http_cache.version(category), http_cache.current_window(),
+        category, q or "", page, size, sort_by, cursor or "", include_total,
+        token or "", http_cache.scrap_version(token),
     )
+    if http_cache.matches(request, etag):
+        return http_cache.not_modified(etag, cache_control)
+    http_cache.set_headers(response, etag, cache_control)
 
-    # 스크랩 여부 확인
+    seek = decode_cursor(cursor, sort_by)
+    skip = (page - 1) * size
+    if include_total is None:
+        include_total = seek is None
+
+    cache_key = response_cache.make_key(category, q, page, size, sort_by, cursor, include_total)
+    body = response_cache.get(cache_key)
+    if body is None:
+        body = await _load_notice_page(db, category, q, skip, page, size, sort_by, seek, include_total)
+        response_cache.put(cache_key, body)
+
+    # 스크랩 여부 확인 (캐시된 본문은 공유되므로 복사본에 표시)
     if token:
-        stmt_device = select(Device).filter(Device.token == token)
-        res_device = await db.execute(stmt_device)
-        device = res_device.scalars().first()
+        device_id = await device_cache.resolve(db, token)
         
-        if device:
-            stmt_scrap = select(Scrap.notice_id).filter(Scrap.device_id == device.id)
-            res_scrap = await db.execute(stmt_scrap)
-            my_scrap_ids = set(res_scrap.scalars().all())
+        if device_id is not None:
+            # 이 페이지의 공지들에 대해서만 스크랩 여부 확인
+            my_scrap_ids = await scrap_membership.scraped_ids(db, device_id, [item["id"] for item in body["items"]])
             
-            for notice in results:
-                # [수정] Notice 객체의 동적 속성 할당 (NoticeListResponse에서 처리됨)
-                setattr(notice, "is_scraped", notice.id in my_scrap_ids)
+            return {
+                **body,
+                "items": [
+                    {**item, "is_scraped": item["id"] in my_scrap_ids}
+                    for item in view_counter.merge_items(body["items"])
+                ]
+            }
 
-    return {
+    # 아직 반영되지 않은 조회수 증가분을 더함 (캐시된 본문은 그대로 두고 복사본에)
+    items = view_counter.merge_items(body["items"])
+    return body if items is body["items"] else {**body, "items": items}
+
+
+async def _load_notice_page(
+    db: AsyncSession, category: str, q: Optional[str], skip: int, page: int, size: int,
+    sort_by: str, seek: Optional[dict], include_total: bool
+) -> dict:
+    """목록 응답 본문을 DB에서 만들어 JSON 호환 dict로 반환합니다. (캐시 저장용)"""
+    # 전체 개수 조회 (검색어가 없으면 카테고리별 캐시 사용)
+    total: Optional[int] = None
+    if include_total:
+        if q:
+            count_stmt = select(func.count(Notice.id)).where(search_index.match_clause(q, title_only=True))
+            if category != "all":
+                count_stmt = count_stmt.where(Notice.category == category)
+            total = (await db.execute(count_stmt)).scalar() or 0
+        else:
+            total = await notice_counts.get_count(db, category)
+    
+    # 목록 조회
+    results = await knu_notice_service.search_notices(
+        db, category, query=q, skip=skip, limit=size, sort_by=sort_by, cursor=seek
+    )
+
+    return jsonable_encoder({
         "items": results,
         "total": total,
         "page": page,
         "size": size,
-        "total_pages": (total + size - 1) // size if total > 0 else 0
-    }
+        "total_pages": ((total + size - 1) // size if total > 0 else 0) if total is not None else None,
+        "next_cursor": next_cursor_for(results, size, sort_by)
+    })
 
 # ============================================================
 # 공지사항 상세 조회 (캐싱 로직 유지)
@@ -96,6 +139,7 @@ async def read_notices(
 @router.get("/notice/detail", response_model=NoticeDetailResponse)
 async def get_notice_detail(
     request: Request,
+    response: Response,
     url: str, 
     notice_id: Optional[int] = None, 
     token: Optional[str] = Query(None),
@@ -103,6 +147,16 @@ async def get_notice_detail(
 ):
     ensure_allowed_url(url)
 
+    # 어느 카테고리 공지인지는 DB를 봐야 알 수 있으므로 전체("all") 버전을 사용
+    cache_control = http_cache.PRIVATE_REVALIDATE if token else f"public, max-age={http_cache.NOTICE_LIST_MAX_AGE}"
+    etag = http_cache.make_etag(
+        "detail", http_cache.version("all"), http_cache.current_window(),
+        url, notice_id or 0, token or "", http_cache.scrap_version(token),
+    )
+    if http_cache.matches(request, etag):
+        return http_cache.not_modified(etag, cache_control)
+    http_cache.set_headers(response, etag, cache_control)
+
     notice_in_db = None
     is_scraped = False
 
@@ -110,51 +164,53 @@ async def get_notice_detail(
         stmt = select(Notice).filter(Notice.id == notice_id)
         result = await db.execute(stmt)
         notice_in_db = result.scalars().first()
+    if notice_in_db is None:
+        # notice_id 없이 url만 온 경우에도 link 인덱스로 저장된 공지를 먼저 찾음
+        stmt = select(Notice).filter(Notice.link == url).order_by(Notice.id).limit(1)
+        result = await db.execute(stmt)
+        notice_in_db = result.scalars().first()
 
-    # 캐싱 로직
-    if notice_in_db and notice_in_db.content and len(notice_in_db.content) > 10:
-        logger.info(f"💾 [Cache Hit] DB 데이터를 반환합니다: {notice_id}")
+    # 캐싱 로직: 저장된 공지는 요청 경로에서 원문을 수집하지 않음
+    if notice_in_db and (
+        not detail_fetcher.needs_rescrape(notice_in_db.content)
+        or detail_fetcher.DETAIL_STALE_WHILE_REVALIDATE
+        or detail_fetcher.recently_scraped(url)
+    ):
+        if detail_fetcher.needs_rescrape(notice_in_db.content):
+            logger.info(f"🔄 [Stale] 저장된 데이터를 반환하고 본문은 백그라운드에서 보강합니다: {notice_in_db.id}")
+            detail_fetcher.refresh_in_background(url)
+        else:
+            logger.info(f"💾 [Cache Hit] DB 데이터를 반환합니다: {notice_in_db.id}")
         scraped_data = {
             "title": notice_in_db.title,
-            "texts": [notice_in_db.content],
+            "texts": [notice_in_db.content or ""],
             "images": notice_in_db.images or [],
             "files": notice_in_db.files or [],
             "univ_views": notice_in_db.univ_views,
-            "date": notice_in_db.date
+            "date": notice_in_db.date,
+            "is_pinned": notice_in_db.is_pinned
         }
     else:
         logger.info(f"🌐 [Scraping] 원문 페이지를 수집합니다: {url}")
-        fetched = await scrape_notice_content(url)
+        # 같은 URL을 동시에 여는 요청들은 수집 하나를 함께 기다림
+        fetched = await detail_fetcher.scrape_once(url)
         if not fetched:
             raise HTTPException(status_code=404, detail="원문 페이지를 불러올 수 없습니다.")
         scraped_data = fetched
+        if notice_in_db:
+            await detail_fetcher.save_content(url, fetched)
 
     # 스크랩 여부 확인
-    if notice_id and token:
-        stmt_device = select(Device).filter(Device.token == token)
-        res_device = await db.execute(stmt_device)
-        device = res_device.scalars().first()
-        if device:
-            stmt_check = select(Scrap).filter(
-                Scrap.device_id == device.id, 
-                Scrap.notice_id == notice_id
-            )
-            res_check = await db.execute(stmt_check)
-            is_scraped = bool(res_check.scalars().first())
-
-    # DB 업데이트
-    if notice_in_db and not (notice_in_db.content and len(notice_in_db.content) > 10):
-        notice_in_db.content = "\n\n".join(scraped_data.get("texts", []))
-        try:
-            await db.commit()
-        except Exception:
-            await db.rollback()
+    if notice_in_db and token:
+        device_id = await device_cache.resolve(db, token)
+        if device_id is not None:
+            is_scraped = notice_in_db.id in await scrap_membership.scraped_ids(db, device_id, [notice_in_db.id])
 
     univ_views = scraped_data.get("univ_views", 0)
-    app_views = notice_in_db.app_views if notice_in_db else 0
+    app_views = ((notice_in_db.app_views or 0) + view_counter.pending(notice_in_db.id)) if notice_in_db else 0
     # [수정] NoticeDetailResponse 스키마에 맞춰 정확한 타입 가딩 후 반환
     return {
-        "id": notice_id if notice_id else 0,
+        "id": notice_in_db.id if notice_in_db else (notice_id or 0),
         "title": scraped_data["title"],
         "link": url,
         "date": scraped_data["date"],
@@ -182,27 +238,21 @@ async def increment_view_count(
     notice_id: int, 
     db: AsyncSession = Depends(get_db)
 ):
-    stmt = select(Notice).filter(Notice.id == notice_id)
-    result = await db.execute(stmt)
-    notice = result.scalars().first()
+    """
+    조회수 증가. 증가분은 메모리 버퍼에 모았다가 주기적으로 한 번에 반영합니다. (view_counter)
+    응답의 app_views는 저장된 값 + 반영 대기 중인 증가분입니다.
+    """
+    result = await db.execute(select(Notice.app_views).where(Notice.id == notice_id))
+    stored = result.first()
     
-    if not notice:
+    if stored is None:
         raise HTTPException(status_code=404, detail="공지사항을 찾을 수 없습니다")
     
-    try:
-        current_views = notice.app_views or 0
-        notice.app_views = current_views + 1
-        await db.commit()
-        await db.refresh(notice)
-        
-        return {
-            "success": True,
-            "app_views": notice.app_views
-        }
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"조회수 증가 에러: {e}")
-        raise HTTPException(status_code=500, detail="조회수 증가 실패")
+    view_counter.increment(notice_id)
+    return {
+        "success": True,
+        "app_views": (stored[0] or 0) + view_counter.pending(notice_id)
+    }
 
 # ============================================================
 # AI 요약 생성 (Rate Limiting 강화)
@@ -234,19 +284,20 @@ async def register_device(
     request: DeviceRegisterRequest, 
     db: AsyncSession = Depends(get_db)
 ):
-    stmt = select(Device).filter(Device.token == request.token)
-    result = await db.execute(stmt)
-    existing = result.scalars().first()
+    existing_id = await device_cache.resolve(db, request.token)
     
-    if not existing:
+    if existing_id is None:
         new_device = Device(token=request.token)
         db.add(new_device)
         logger.info(f"✨ 기기 등록: {request.token[:8]}...")
     else:
+        new_device = None
         logger.info(f"🔄 기기 확인: {request.token[:8]}...")
     
     try:
         await db.commit()
+        if new_device is not None:
+            device_cache.remember(request.token, new_device.id)
         return {"message": "success"}
     except:
         await db.rollback()
@@ -261,20 +312,16 @@ async def toggle_scrap(
     request: ScrapRequest, 
     db: AsyncSession = Depends(get_db)
 ):
-    res_device = await db.execute(
-        select(Device).filter(Device.token == request.token)
-    )
-    device = res_device.scalars().first()
-    if not device:
+    device_id = await device_cache.resolve(db, request.token)
+    if device_id is None:
         raise HTTPException(status_code=404, detail="기기 등록이 필요합니다.")
 
-    res_notice = await db.execute(select(Notice).filter(Notice.id == notice_id))
-    notice = res_notice.scalars().first()
-    if not notice:
+    res_notice = await db.execute(select(Notice.id).filter(Notice.id == notice_id))
+    if res_notice.first() is None:
         raise HTTPException(status_code=404, detail="공지사항이 없습니다.")
 
     stmt_scrap = select(Scrap).filter(
-        Scrap.device_id == device.id, 
+        Scrap.device_id == device_id, 
         Scrap.notice_id == notice_id
     )
     res_scrap = await db.execute(stmt_scrap)
@@ -284,11 +331,15 @@ async def toggle_scrap(
         if existing_scrap:
             await db.delete(existing_scrap)
             await db.commit()
+            scrap_membership.record_toggle(device_id, notice_id, False)
+            http_cache.bump_scrap_version(request.token)
             return {"status": "removed", "message": "스크랩 취소됨"}
         else:
-            new_scrap = Scrap(device_id=device.id, notice_id=notice_id)
+            new_scrap = Scrap(device_id=device_id, notice_id=notice_id)
             db.add(new_scrap)
             await db.commit()
+            scrap_membership.record_toggle(device_id, notice_id, True)
+            http_cache.bump_scrap_version(request.token)
             return {"status": "added", "message": "스크랩 저장됨"}
     except Exception as e:
         await db.rollback()
@@ -300,16 +351,15 @@ async def toggle_scrap(
 # ============================================================
 @router.get("/scraps", response_model=List[NoticeListResponse])
 async def get_my_scraps(token: str, db: AsyncSession = Depends(get_db)):
-    res_device = await db.execute(select(Device).filter(Device.token == token))
-    device = res_device.scalars().first()
+    device_id = await device_cache.resolve(db, token)
     
-    if not device:
+    if device_id is None:
         return []
 
     stmt = (
         select(Notice)
         .join(Scrap, Notice.id == Scrap.notice_id)
-        .filter(Scrap.device_id == device.id)
+        .filter(Scrap.device_id == device_id)
         .order_by(Scrap.created_at.desc())
     )
     result = await db.execute(stmt)
@@ -329,14 +379,15 @@ async def get_device_subscriptions(
     db: AsyncSession = Depends(get_db),
 ):
     """기기에 저장된 구독 카테고리 목록 반환 (프론트엔드 동기화용)"""
-    stmt_device = select(Device).filter(Device.token == token).options(
-        selectinload(Device.subscriptions)
-    )
-    res_device = await db.execute(stmt_device)
-    device = res_device.scalars().first()
-    if not device:
+    device_id = await device_cache.resolve(db, token)
+    if device_id is None:
         return {"categories": []}
-    categories = [kw.word for kw in device.subscriptions]
+    stmt = (
+        select(Keyword.word)
+        .join(device_keywords, device_keywords.c.keyword_id == Keyword.id)
+        .where(device_keywords.c.device_id == device_id)
+    )
+    categories = list((await db.execute(stmt)).scalars().all())
     return {"categories": categories}
 
 
@@ -348,17 +399,16 @@ async def update_device_subscriptions(
     request: KeywordSubscriptionRequest,
     db: AsyncSession = Depends(get_db),
 ):
-    stmt_device = select(Device).filter(Device.token == request.token).options(
-        selectinload(Device.subscriptions)
-    )
-    res_device = await db.execute(stmt_device)
-    device = res_device.scalars().first()
+    device_id = await device_cache.resolve(db, request.token)
+    created = device_id is None
 
-    if not device:
+    if created:
         device = Device(token=request.token)
         db.add(device)
         await db.flush()
+        device_id = device.id
 
+    keyword_ids: List[int] = []
     if request.categories:
         stmt_keys = select(Keyword).where(Keyword.word.in_(request.categories))
         res_keys = await db.execute(stmt_keys)
@@ -376,17 +426,23 @@ async def update_device_subscriptions(
             all_keywords = existing_keywords + new_keywords
         else:
             all_keywords = existing_keywords
-        
-        device.subscriptions = all_keywords
-    else:
-        device.subscriptions = []
+        keyword_ids = [k.id for k in all_keywords]
 
+    # 기기 객체/관계를 불러오지 않고 연결 테이블을 통째로 교체
     try:
+        await db.execute(delete(device_keywords).where(device_keywords.c.device_id == device_id))
+        if keyword_ids:
+            await db.execute(
+                device_keywords.insert(),
+                [{"device_id": device_id, "keyword_id": keyword_id} for keyword_id in keyword_ids]
+            )
         await db.commit()
-        logger.info(f"🔔 구독 업데이트: {device.token[:8]}... -> {request.categories}")
+        if created:
+            device_cache.remember(request.token, device_id)
+        logger.info(f"🔔 구독 업데이트: {request.token[:8]}... -> {request.categories}")
         return {
             "message": "subscriptions updated", 
-            "count": len(device.subscriptions)
+            "count": len(keyword_ids)
         }
     except Exception as e:
         await db.rollback()
@@ -396,9 +452,8 @@ async def update_device_subscriptions(
 # ============================================================
 # 카테고리 목록 조회
 # ============================================================
-@router.get("/categories")
-async def get_categories():
-    """notices.json 기반 카테고리 목록 반환 (프론트엔드 동적 구성용)"""
+def _build_categories() -> dict:
+    """notices.json 기반 카테고리 목록 (NOTICE_CONFIGS는 실행 중 바뀌지 않음)"""
     general = []
     dept = []
 
@@ -424,6 +479,24 @@ async def get_categories():
         "dept": dept
     }
 
+
+# 서버 시작 시 한 번만 직렬화해 두고 그대로 내려줌
+_CATEGORIES_BODY = json.dumps(_build_categories(), ensure_ascii=False).encode("utf-8")
+_CATEGORIES_ETAG = '"' + hashlib.sha1(_CATEGORIES_BODY).hexdigest()[:20] + '"'
+_CATEGORIES_CACHE_CONTROL = f"public, max-age={http_cache.CATEGORIES_MAX_AGE}"
+
+
+@router.get("/categories")
+async def get_categories(request: Request):
+    """notices.json 기반 카테고리 목록 반환 (프론트엔드 동적 구성용)"""
+    if http_cache.matches(request, _CATEGORIES_ETAG):
+        return http_cache.not_modified(_CATEGORIES_ETAG, _CATEGORIES_CACHE_CONTROL)
+    return Response(
+        content=_CATEGORIES_BODY,
+        media_type="application/json",
+        headers={"ETag": _CATEGORIES_ETAG, "Cache-Control": _CATEGORIES_CACHE_CONTROL},
+    )
+
 # ============================================================
 # 수동 크롤링 실행 (관리자 전용 - API 키 인증 필요)
 # ============================================================
@@ -440,32 +513,142 @@ async def manual_crawl(
     """
     try:
         categories_to_crawl = [category] if category and category in NOTICE_CONFIGS else list(NOTICE_CONFIGS.keys())
-        
+        logger.info(f"🚀 수동 크롤링 시작: {len(categories_to_crawl)}개 카테고리")
+
+        report = await crawl_scheduler.run_crawl_sweep(categories_to_crawl)
+
+        # 필독 공지 개수 확인 (카테고리별 한 번에 집계)
+        stmt = (
+            select(Notice.category, func.count(Notice.id))
+            .where(and_(Notice.category.in_(categories_to_crawl), Notice.is_pinned == True))
+            .group_by(Notice.category)
+        )
+        result = await db.execute(stmt)
+        pinned_counts = {str(row[0]): int(row[1]) for row in result.all()}
+
         results = {}
         for cat in categories_to_crawl:
-            logger.info(f"🚀 수동 크롤링 시작: {cat}")
-            await knu_notice_service.crawl_and_sync_notices(db, cat)
-            
-            # 필독 공지 개수 확인
-            stmt = select(func.count(Notice.id)).where(
-                and_(Notice.category == cat, Notice.is_pinned == True)
-            )
-            result = await db.execute(stmt)
-            pinned_count = result.scalar() or 0
-            
             results[cat] = {
-                "status": "success",
-                "pinned_count": pinned_count
+                **report["results"].get(cat, {"status": "unknown"}),
+                "pinned_count": pinned_counts.get(cat, 0)
             }
-        
+
         return {
             "message": "크롤링 완료",
-            "results": results
+            "results": results,
+            "wall_time": report["wall_time"],
+            "hosts": report["hosts"],
+            "connections": report["connections"],
+            "loop_lag": report["loop_lag"]
         }
     except Exception as e:
         logger.error(f"❌ 수동 크롤링 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/admin/crawl/failures")
+async def get_crawl_failures(
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+    api_key: str = Depends(verify_admin_key)
+):
+    """[관리자 전용] 상세 수집 재시도 대기열 (재시도 대기 / 포기한 URL)"""
+    waiting = func.count(CrawlFailureLog.id).filter(CrawlFailureLog.next_retry_at.is_not(None))
+    given_up = func.count(CrawlFailureLog.id).filter(CrawlFailureLog.next_retry_at.is_(None))
+    counts = (await db.execute(select(waiting, given_up))).one()
+    result = await db.execute(
+        select(CrawlFailureLog).order_by(CrawlFailureLog.next_retry_at.asc().nulls_last()).limit(limit)
+    )
+    return {
+        "waiting": int(counts[0] or 0),
+        "given_up": int(counts[1] or 0),
+        "stats": crawl_retry.get_stats(),
+        "items": [
+            {
+                "url": row.url,
+                "category": row.category,
+                "retry_count": row.retry_count,
+                "next_retry_at": row.next_retry_at,
+                "last_retry_at": row.last_retry_at,
+                "error": row.error_message,
+            }
+            for row in result.scalars().all()
+        ],
+    }
+
+# ============================================================
+# 과거 공지 백필 (관리자 전용 - API 키 인증 필요)
+# ============================================================
+@router.post("/admin/backfill")
+async def start_backfill(
+    category: Optional[str] = Query(None, description="백필할 카테고리 (없으면 전체)"),
+    pages: Optional[int] = Query(None, ge=1, le=500, description="목록을 넘길 최대 페이지 수"),
+    until: Optional[DateType] = Query(None, description="이 날짜보다 오래된 공지를 만나면 종료"),
+    restart: bool = Query(False, description="체크포인트를 무시하고 1페이지부터 다시 시작"),
+    api_key: str = Depends(verify_admin_key)
+):
+    """
+    [관리자 전용] 목록을 여러 페이지 넘기며 과거 공지를 수집합니다. (백그라운드 실행)
+    
+    중단된 카테고리는 체크포인트의 다음 페이지부터 재개합니다. 진행 상황은 GET /admin/backfill 로 확인합니다.
+    """
+    if category and category not in NOTICE_CONFIGS:
+        raise HTTPException(status_code=404, detail="존재하지 않는 카테고리입니다.")
+    try:
+        targets = backfill.start_backfill([category] if category else None, pages, until, restart)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {"message": "백필 시작", "categories": targets}
+
+
+@router.get("/admin/backfill")
+async def get_backfill_status(
+    db: AsyncSession = Depends(get_db),
+    api_key: str = Depends(verify_admin_key)
+):
+    """[관리자 전용] 백필 진행 상황 (카테고리별 체크포인트 + 처리량)"""
+    return await backfill.get_status(db)
+
+
+@router.post("/admin/backfill/stop")
+async def stop_backfill(api_key: str = Depends(verify_admin_key)):
+    """[관리자 전용] 실행 중인 백필을 중단합니다. (다음 실행 시 이어서 진행)"""
+    await backfill.stop_backfill()
+    return {"message": "백필 중단"}
+
+# ============================================================
+# 캐시 상태 (관리자 전용 - API 키 인증 필요)
+# ============================================================
+@router.get("/admin/cache")
+async def get_cache_stats(api_key: str = Depends(verify_admin_key)):
+    """[관리자 전용] 목록 응답 캐시 / 게시판 목록 캐시 적중 통계"""
+    return {
+        "notice_list": response_cache.get_stats(),
+        "board_list": list_cache.get_stats(),
+        "http": http_cache.get_stats(),
+        "detail": detail_fetcher.get_stats(),
+        "views": view_counter.get_stats(),
+        "scraps": scrap_membership.get_stats(),
+        "devices": device_cache.get_stats(),
+    }
+
+@router.get("/admin/push")
+async def get_push_stats(api_key: str = Depends(verify_admin_key)):
+    """[관리자 전용] 푸시 전송 통계 / 알림 대기열 상태별 건수"""
+    return {
+        "dispatcher": push_dispatcher.get_stats(),
+        "outbox": await push_outbox.get_status(),
+    }
+
+@router.get("/admin/retention")
+async def get_retention_status(api_key: str = Depends(verify_admin_key)):
+    """[관리자 전용] 보존 기간 설정 / 마지막 정리 결과"""
+    return retention.get_stats()
+
+@router.post("/admin/retention")
+async def run_retention(api_key: str = Depends(verify_admin_key)):
+    """[관리자 전용] 보존 기간이 지난 발송 이력 / 크롤링 실패 로그 / 대기열 항목을 지금 정리합니다."""
+    return await retention.run()
+
 # ============================================================
 # 고급 검색 (신규)
 # ============================================================
@@ -478,21 +661,35 @@ async def advanced_search(
     date_to: Optional[DateType] = Query(None),
     page: int = Query(1, ge=1),
     size: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor (있으면 page 대신 사용)"),
+    order: str = Query("date", pattern="^(relevance|date)$", description="검색어가 있을 때 정렬 (최신순/관련도)"),
     db: AsyncSession = Depends(get_db)
 ):
     """
     고급 검색 (제목+내용, 기간 필터)
+
+    - 기본은 필독 우선 최신순(order=date) + cursor 페이지네이션입니다.
+    - 검색어가 있을 때 order=relevance를 주면 관련도 순이며 각 항목에 score, snippet이 포함됩니다.
+      관련도 순은 page로만 이어 읽습니다.
     """
+    if q and order == "relevance":
+        items = await search_index.ranked_search(
+            db, q, category=category, date_from=date_from, date_to=date_to,
+            limit=size, offset=(page - 1) * size,
+        )
+        return {
+            "items": items,
+            "page": page,
+            "size": size,
+            "next_cursor": None
+        }
+
+    seek = decode_cursor(cursor, "date")
     stmt = select(Notice)
     
-    # 검색어 (제목 + 내용)
+    # 검색어 (제목 + 내용, 여러 단어는 모두 포함)
     if q:
-        stmt = stmt.where(
-            or_(
-                Notice.title.ilike(f"%{q}%"),
-                Notice.content.ilike(f"%{q}%")
-            )
-        )
+        stmt = stmt.where(search_index.match_clause(q))
     
     # 카테고리 필터
     if category and category != "all":
@@ -506,20 +703,15 @@ async def advanced_search(
     
     # 정렬 및 페이지네이션
     # [수정] 고급 검색에서도 필독 공지를 가장 먼저 보여줌
-    stmt = stmt.order_by(
-        Notice.is_pinned.desc(), 
-        Notice.date.desc().nulls_last(), 
-        Notice.id.desc()
+    notices = await knu_notice_service.fetch_notice_feed(
+        db, stmt, "date", seek, limit=size, skip=(page - 1) * size
     )
-    stmt = stmt.offset((page - 1) * size).limit(size)
-    
-    result = await db.execute(stmt)
-    notices = result.scalars().all()
     
     return {
         "items": notices,
         "page": page,
-        "size": size
+        "size": size,
+        "next_cursor": next_cursor_for(notices, size, "date")
     }
 
 # ============================================================
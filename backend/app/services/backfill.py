@@ -0,0 +1,309 @@
+# app/services/backfill.py
+"""
+과거 공지 백필 (관리자 실행)
+
+정기 크롤링은 목록 1페이지(와 워터마크까지의 몇 페이지)만 읽기 때문에
+새로 배포하거나 DB를 복구하면 카테고리당 공지가 10~20개뿐입니다.
+백필은 CMS 목록을 페이지 단위로 목표 깊이(또는 목표 날짜)까지 넘기며
+  - 목록 요청은 스케줄러와 같은 호스트 예산(crawl_scheduler)을 거치고
+  - 상세 요청은 정기 크롤링과 같은 scrape_detail 경로(호스트별 속도 제한)를 사용하며
+  - 저장은 BACKFILL_BATCH_SIZE 단위 대량 INSERT로 커밋하고 (키워드 알림은 보내지 않음)
+  - 페이지가 끝날 때마다 backfill_checkpoints 테이블에 다음 페이지를 기록합니다.
+    상세 수집에 실패한 URL은 같은 트랜잭션에서 재시도 대기열(crawl_retry)에 알림 없이(notify=False) 넣으므로
+    체크포인트가 실패한 공지를 두고 넘어가지 않습니다.
+중단(서버 종료/중지 요청) 후 다시 실행하면 체크포인트의 next_page부터 이어서 진행합니다.
+"""
+import asyncio
+import os
+import time
+from datetime import date as DateType
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import NOTICE_CONFIGS
+from app.core.logger import get_logger
+from app.database import bulk
+from app.database.database import AsyncSessionLocal
+from app.database.models import BackfillCheckpoint, Notice
+from app.services import crawl_retry, crawl_scheduler, knu_notice_service, notice_counts, response_cache
+
+logger = get_logger()
+
+# 동시에 백필할 카테고리 수 / 한 번에 커밋할 공지 수 / 기본 목표 페이지 수
+BACKFILL_MAX_CONCURRENCY = max(1, int(os.getenv("BACKFILL_MAX_CONCURRENCY", "2")))
+BACKFILL_BATCH_SIZE = max(1, int(os.getenv("BACKFILL_BATCH_SIZE", "20")))
+BACKFILL_DEFAULT_PAGES = max(1, int(os.getenv("BACKFILL_DEFAULT_PAGES", "20")))
+
+STATUS_RUNNING = "running"
+STATUS_PAUSED = "paused"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+
+class BackfillProgress:
+    """이번 실행의 카테고리별 진행 상황 (처리량 계산용, 메모리에만 유지)"""
+
+    def __init__(self, category: str):
+        self.category = category
+        self.started = time.monotonic()
+        self.page = 0
+        self.inserted = 0
+        self.scanned = 0
+        self.done = False
+
+    def rate(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.inserted / elapsed if elapsed > 0 else 0.0
+
+
+_task: Optional[asyncio.Task] = None
+_run_started: Optional[float] = None
+_progress: Dict[str, BackfillProgress] = {}
+
+
+def is_running() -> bool:
+    return _task is not None and not _task.done()
+
+
+def start_backfill(
+    categories: Optional[List[str]] = None,
+    max_pages: Optional[int] = None,
+    until: Optional[DateType] = None,
+    restart: bool = False,
+) -> List[str]:
+    """백필을 백그라운드 태스크로 시작하고 대상 카테고리를 반환합니다. 이미 실행 중이면 RuntimeError."""
+    global _task, _run_started
+    if is_running():
+        raise RuntimeError("백필이 이미 실행 중입니다")
+
+    targets = [c for c in (categories or list(NOTICE_CONFIGS.keys())) if c in NOTICE_CONFIGS]
+    pages = max(1, max_pages or BACKFILL_DEFAULT_PAGES)
+
+    _progress.clear()
+    _run_started = time.monotonic()
+    _task = asyncio.create_task(_run(targets, pages, until, restart))
+    logger.info(f"📥 [백필] 시작: {len(targets)}개 카테고리, 최대 {pages}페이지" + (f", {until} 이후" if until else ""))
+    return targets
+
+
+async def stop_backfill(timeout: float = 10.0):
+    """실행 중인 백필을 취소합니다. 진행 상황은 체크포인트에 paused로 남습니다."""
+    global _task
+    if not is_running():
+        return
+    assert _task is not None
+    _task.cancel()
+    try:
+        await asyncio.wait_for(_task, timeout=timeout)
+    except (asyncio.CancelledError, asyncio.TimeoutError):
+        pass
+    except Exception as e:
+        logger.error(f"⚠️ [백필] 종료 중 에러: {e}")
+    _task = None
+
+
+async def get_status(db: AsyncSession) -> Dict[str, Any]:
+    result = await db.execute(select(BackfillCheckpoint).order_by(BackfillCheckpoint.category))
+    checkpoints = result.scalars().all()
+
+    categories = {}
+    for cp in checkpoints:
+        live = _progress.get(cp.category)
+        categories[cp.category] = {
+            "status": cp.status,
+            "next_page": cp.next_page,
+            "target_pages": cp.target_pages,
+            "target_date": cp.target_date.isoformat() if cp.target_date else None,
+            "scanned": cp.scanned,
+            "inserted": cp.inserted,
+            "failed": cp.failed,
+            "last_error": cp.last_error,
+            "notices_per_sec": round(live.rate(), 2) if live else None,
+        }
+
+    total_inserted = sum(p.inserted for p in _progress.values())
+    elapsed = time.monotonic() - _run_started if _run_started is not None else 0.0
+    return {
+        "running": is_running(),
+        "elapsed": round(elapsed, 1),
+        "inserted_this_run": total_inserted,
+        "notices_per_sec": round(total_inserted / elapsed, 2) if elapsed > 0 else 0.0,
+        "categories": categories,
+    }
+
+
+async def _run(categories: List[str], max_pages: int, until: Optional[DateType], restart: bool):
+    slots = asyncio.Semaphore(BACKFILL_MAX_CONCURRENCY)
+    results = await asyncio.gather(
+        *(_backfill_category(cat, max_pages, until, restart, slots) for cat in categories),
+        return_exceptions=True,
+    )
+    for cat, result in zip(categories, results):
+        if isinstance(result, Exception) and not isinstance(result, asyncio.CancelledError):
+            logger.error(f"❌ [백필] [{cat}] 실패: {result}")
+
+    total = sum(p.inserted for p in _progress.values())
+    elapsed = time.monotonic() - (_run_started or time.monotonic())
+    logger.info(f"🏁 [백필] 종료: {total}개 저장, {elapsed:.1f}초 ({total / elapsed if elapsed else 0:.2f}건/초)")
+
+
+async def _backfill_category(
+    category: str, max_pages: int, until: Optional[DateType], restart: bool, slots: asyncio.Semaphore
+):
+    async with slots:
+        progress = _progress.setdefault(category, BackfillProgress(category))
+        budget = crawl_scheduler.get_host_budget(crawl_scheduler.category_netloc(category))
+
+        async with AsyncSessionLocal() as db:
+            cp = await db.get(BackfillCheckpoint, category)
+            if cp is None:
+                cp = BackfillCheckpoint(category=category)
+                db.add(cp)
+            if restart or cp.next_page is None:
+                cp.next_page, cp.scanned, cp.inserted, cp.failed = 1, 0, 0, 0
+            elif cp.next_page > 1:
+                logger.info(f"↩️ [백필] [{category}] {cp.next_page}페이지부터 재개")
+            cp.status = STATUS_RUNNING
+            cp.target_pages = max_pages
+            cp.target_date = until
+            cp.last_error = None
+            await db.commit()
+
+            previous_urls: Set[str] = set()
+            try:
+                while cp.next_page <= max_pages:
+                    page = cp.next_page
+                    progress.page = page
+                    async with budget.slot():
+                        rows = await knu_notice_service.fetch_cms_list_page(category, page)
+
+                    # 빈 페이지이거나, 페이지 파라미터가 무시되어 같은 목록이 반복되면 끝
+                    if not rows or set(rows) == previous_urls:
+                        break
+                    previous_urls = set(rows)
+
+                    inserted, failures, reached_date = await _backfill_page(db, category, rows, until)
+                    failed = len(failures)
+                    # 실패한 URL 기록과 체크포인트 전진을 한 번에 커밋 (기록이 실패하면 이 페이지부터 다시)
+                    await crawl_retry.record_failures(db, failures)
+                    cp.next_page = page + 1
+                    cp.scanned += len(rows)
+                    cp.inserted += inserted
+                    cp.failed += failed
+                    await db.commit()
+
+                    progress.scanned += len(rows)
+                    progress.inserted += inserted
+                    logger.info(
+                        f"📥 [백필] [{category}] {page}페이지: 신규 {inserted}개 / 실패 {failed}개 "
+                        f"(누적 {cp.inserted}개, {progress.rate():.2f}건/초)"
+                    )
+                    if reached_date:
+                        logger.info(f"📅 [백필] [{category}] 목표 날짜({until}) 이전 공지에 도달")
+                        break
+
+                cp.status = STATUS_COMPLETED
+                await db.commit()
+            except asyncio.CancelledError:
+                await _mark(db, cp, STATUS_PAUSED)
+                logger.warning(f"⏸️ [백필] [{category}] 중단됨 (다음 실행 시 {cp.next_page}페이지부터 재개)")
+                raise
+            except Exception as e:
+                await _mark(db, cp, STATUS_FAILED, str(e))
+                raise
+            finally:
+                progress.done = True
+
+
+async def _mark(db: AsyncSession, cp: BackfillCheckpoint, status: str, error: Optional[str] = None):
+    try:
+        await db.rollback()
+        await db.refresh(cp)
+        cp.status = status
+        cp.last_error = error
+        await db.commit()
+    except Exception as e:
+        logger.error(f"⚠️ [백필] [{cp.category}] 체크포인트 저장 실패: {e}")
+
+
+async def _backfill_page(
+    db: AsyncSession, category: str, rows: Dict[str, Dict[str, Any]], until: Optional[DateType]
+) -> Tuple[int, List[Dict[str, Any]], bool]:
+    """
+    목록 한 페이지의 신규 공지를 수집해 배치 단위로 저장합니다.
+    반환: (저장 수, 재시도 대기열에 넣을 실패 목록, 목표 날짜 이전 공지 발견 여부)
+    """
+    result = await db.execute(
+        select(Notice.link).where(and_(Notice.category == category, Notice.link.in_(list(rows.keys()))))
+    )
+    existing = set(result.scalars().all())
+    # 상세 수집 동안 읽기 트랜잭션을 붙잡고 있지 않도록 바로 종료 (SQLite 쓰기 잠금 방지)
+    await db.commit()
+    new_urls = [url for url in rows if url not in existing]
+    if not new_urls:
+        return 0, [], False
+
+    async def scrape(url: str):
+        # 예외도 URL과 함께 돌려받아야 재시도 대기열에 기록할 수 있음
+        try:
+            return url, await knu_notice_service.scrape_detail(url)
+        except Exception as e:
+            return url, e
+
+    inserted, reached_date = 0, False
+    failures: List[Dict[str, Any]] = []
+    batch: List[Dict[str, Any]] = []
+    for next_done in asyncio.as_completed([scrape(url) for url in new_urls]):
+        url, scraped = await next_done
+        if isinstance(scraped, Exception) or not scraped:
+            failures.append(_failure(category, url, rows[url], scraped))
+            continue
+
+        notice_date = scraped.get("date")
+        if until and notice_date and notice_date < until:
+            reached_date = True
+            continue
+
+        meta = {"list_title": rows[url].get("title", ""), "is_pinned": rows[url].get("is_pinned", False),
+                "detail_url": url, "category": category}
+        batch.append(knu_notice_service.build_notice_row(scraped, meta))
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            # 중단 요청이 와도 진행 중인 배치 저장은 끝까지 마치도록 (잠금이 남지 않게)
+            inserted += await asyncio.shield(_flush(batch))
+            batch = []
+
+    if batch:
+        inserted += await asyncio.shield(_flush(batch))
+    return inserted, failures, reached_date
+
+
+def _failure(category: str, url: str, row: Dict[str, Any], result: Any) -> Dict[str, Any]:
+    """상세 수집 실패를 재시도 대기열 기록 형식으로 만듭니다. (재시도로 저장돼도 알림은 보내지 않음)"""
+    return {
+        "url": url,
+        "category": category,
+        "list_title": row.get("title"),
+        "is_pinned": bool(row.get("is_pinned", False)),
+        "notify": False,
+        "error": repr(result) if isinstance(result, Exception) else "상세 페이지 수집/파싱 실패",
+    }
+
+
+async def _flush(batch: List[Dict[str, Any]]) -> int:
+    """
+    배치를 별도 세션으로 저장합니다. (체크포인트 세션의 트랜잭션과 분리)
+    정기 크롤링이 먼저 넣은 공지는 ON CONFLICT로 건너뜁니다.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            saved = await bulk.insert_notices(db, batch)
+            await db.commit()
+            if saved:
+                notice_counts.invalidate(batch[0]["category"])
+                response_cache.invalidate(batch[0]["category"])
+            return len(saved)
+        except Exception:
+            await db.rollback()
+            raise
@@ -0,0 +1,137 @@
+# app/services/crawl_retry.py
+"""
+상세 수집 실패 재시도 대기열 (crawl_failures)
+
+상세 페이지 수집이 실패한 URL을 (url, category)별 한 행으로 기록하고 지수 백오프로 다시 시도합니다.
+  - 정기 크롤링은 백오프 중이거나 포기한 URL을 건너뜁니다.
+    (응답이 느린 학과 서버가 매 스윕마다 타임아웃만큼 시간을 잡아먹지 않도록)
+  - 재시도는 knu_notice_service.retry_failed_details가 CRAWL_RETRY_INTERVAL초마다 처리
+  - retry_count번 실패한 URL의 다음 시도는 CRAWL_RETRY_BASE × 2^retry_count초 후 (최대 CRAWL_RETRY_MAX_DELAY)
+  - CRAWL_RETRY_MAX_ATTEMPTS번 재시도해도 실패하면 next_retry_at을 비워 포기 (보존 기간이 지나 정리되면 다시 수집 대상)
+"""
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from sqlalchemy import and_, delete, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import get_logger
+from app.database import bulk
+from app.database.models import CrawlFailureLog
+
+logger = get_logger()
+
+CRAWL_RETRY_MAX_ATTEMPTS = max(0, int(os.getenv("CRAWL_RETRY_MAX_ATTEMPTS", "6")))
+CRAWL_RETRY_BASE = float(os.getenv("CRAWL_RETRY_BASE", "300"))
+CRAWL_RETRY_MAX_DELAY = float(os.getenv("CRAWL_RETRY_MAX_DELAY", "21600"))
+CRAWL_RETRY_INTERVAL = max(10, int(os.getenv("CRAWL_RETRY_INTERVAL", "60")))
+# 한 번에 재시도할 URL 수
+CRAWL_RETRY_BATCH_SIZE = 20
+
+_stats: Dict[str, int] = {"recorded": 0, "skipped": 0, "given_up": 0, "recovered": 0}
+
+
+def backoff(retry_count: int) -> float:
+    """retry_count번 재시도한 URL의 다음 시도까지 기다릴 시간 (초, ±20% 지터)"""
+    delay = min(CRAWL_RETRY_MAX_DELAY, CRAWL_RETRY_BASE * (2 ** retry_count))
+    return delay * random.uniform(0.8, 1.2)
+
+
+async def blocked_urls(db: AsyncSession, category: str, urls: Sequence[str]) -> Set[str]:
+    """urls 중 백오프 중이거나 포기한 URL (정기 크롤링에서 건너뜀)"""
+    if not urls:
+        return set()
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(CrawlFailureLog.url).where(and_(
+            CrawlFailureLog.category == category,
+            CrawlFailureLog.url.in_(list(urls)),
+            or_(CrawlFailureLog.next_retry_at.is_(None), CrawlFailureLog.next_retry_at > now),
+        ))
+    )
+    blocked = set(result.scalars().all())
+    _stats["skipped"] += len(blocked)
+    return blocked
+
+
+async def record_failures(db: AsyncSession, failures: Sequence[Dict[str, Any]]) -> None:
+    """
+    실패한 상세 수집을 기록합니다. failures: [{"url", "category", "list_title", "is_pinned", "error"[, "notify"]}]
+    처음 실패한 URL은 새 행, 이미 있는 URL은 retry_count를 올리고 다음 시도 시각을 늦춥니다. (커밋은 호출자가 합니다)
+    새 행은 INSERT ... ON CONFLICT DO NOTHING으로 넣으므로 크롤링/재시도/백필이 같은 URL을 동시에 기록해도 한 행만 남습니다.
+    """
+    if not failures:
+        return
+    now = datetime.now(timezone.utc)
+    # 같은 호출 안에서 겹친 URL은 한 번만 셈
+    by_key = {(f["url"], f["category"]): f for f in failures}
+
+    inserted = await bulk.insert_crawl_failures(db, [
+        {
+            "url": url,
+            "category": category,
+            "error_message": _error(failure),
+            "retry_count": 0,
+            "list_title": failure.get("list_title"),
+            "is_pinned": bool(failure.get("is_pinned", False)),
+            "notify": bool(failure.get("notify", True)),
+            "created_at": now,
+            "next_retry_at": now + timedelta(seconds=backoff(0)),
+        }
+        for (url, category), failure in by_key.items()
+    ])
+    _stats["recorded"] += len(inserted)
+
+    existing_keys = [key for key in by_key if key not in inserted]
+    if not existing_keys:
+        return
+    # PostgreSQL은 행 잠금으로 동시 갱신을 직렬화 (SQLite는 쓰기 잠금이 하나뿐)
+    result = await db.execute(
+        select(CrawlFailureLog)
+        .where(tuple_(CrawlFailureLog.url, CrawlFailureLog.category).in_(existing_keys))
+        .with_for_update()
+    )
+    for row in result.scalars().all():
+        row.retry_count = (row.retry_count or 0) + 1
+        row.last_retry_at = now
+        row.error_message = _error(by_key[(row.url, row.category)])
+        if row.retry_count >= CRAWL_RETRY_MAX_ATTEMPTS:
+            row.next_retry_at = None
+            _stats["given_up"] += 1
+            logger.warning(f"🚫 [{row.category}] 상세 수집 {row.retry_count}회 재시도 실패, 포기: {row.url}")
+        else:
+            row.next_retry_at = now + timedelta(seconds=backoff(row.retry_count))
+
+
+def _error(failure: Dict[str, Any]) -> str:
+    return str(failure.get("error") or "상세 수집 실패")[:1000]
+
+
+async def due(db: AsyncSession, limit: int = CRAWL_RETRY_BATCH_SIZE) -> List[CrawlFailureLog]:
+    """다시 시도할 때가 된 실패 기록 (오래 기다린 순)"""
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        select(CrawlFailureLog)
+        .where(CrawlFailureLog.next_retry_at <= now)
+        .order_by(CrawlFailureLog.next_retry_at)
+        .limit(limit)
+    )
+    return list(result.scalars().all())
+
+
+async def resolve(db: AsyncSession, keys: Sequence[Tuple[str, str]]) -> None:
+    """수집에 성공했거나 이미 저장된 (url, category)의 기록을 지웁니다. (커밋은 호출자가 합니다)"""
+    if not keys:
+        return
+    await db.execute(
+        delete(CrawlFailureLog)
+        .where(tuple_(CrawlFailureLog.url, CrawlFailureLog.category).in_(list(keys)))
+        .execution_options(synchronize_session=False)
+    )
+    _stats["recovered"] += len(keys)
+
+
+def get_stats() -> Dict[str, int]:
+    return dict(_stats)
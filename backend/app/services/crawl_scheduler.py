@@ -0,0 +1,191 @@
+# app/services/crawl_scheduler.py
+"""
+카테고리 단위 동시 크롤링 스케줄러
+
+- 서로 다른 학과 도메인의 게시판은 병렬로 수집합니다.
+- 같은 호스트(netloc)에 대해서는 동시 요청 수와 최소 간격(politeness budget)을 지킵니다.
+- 스윕마다 전체 소요 시간과 호스트별 대기열 깊이를 보고합니다.
+"""
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Any
+from urllib.parse import urlparse
+
+from app.core.config import NOTICE_CONFIGS
+from app.core.http import log_connection_stats
+from app.core.logger import get_logger
+from app.core.loop_monitor import loop_monitor
+from app.core.parse_pool import PARSE_POOL_MODE
+from app.database.database import AsyncSessionLocal
+from app.services import knu_notice_service
+
+logger = get_logger()
+
+# 호스트당 동시에 진행할 수 있는 카테고리 수 / 같은 호스트의 카테고리 시작 간 최소 간격(초)
+HOST_MAX_IN_FLIGHT = max(1, int(os.getenv("CRAWL_HOST_MAX_IN_FLIGHT", "1")))
+HOST_MIN_INTERVAL = max(0.0, float(os.getenv("CRAWL_HOST_MIN_INTERVAL", "2.0")))
+# 스윕 전체에서 동시에 진행할 수 있는 카테고리 수
+SWEEP_MAX_CONCURRENCY = max(1, int(os.getenv("CRAWL_MAX_CONCURRENCY", "8")))
+
+
+class HostBudget:
+    """호스트 하나에 대한 예의 예산 (동시 요청 수 + 최소 간격)"""
+
+    def __init__(self, netloc: str, max_in_flight: int, min_interval: float):
+        self.netloc = netloc
+        self.min_interval = min_interval
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._spacing_lock = asyncio.Lock()
+        self._last_start = 0.0
+
+        # 관측용 카운터
+        self.waiting = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+
+    def reset_stats(self):
+        self.max_queue_depth = self.waiting
+        self.total_wait = 0.0
+
+    @asynccontextmanager
+    async def slot(self):
+        queued_at = time.monotonic()
+        self.waiting += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.waiting)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+
+        try:
+            async with self._spacing_lock:
+                delay = self._last_start + self.min_interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self._last_start = time.monotonic()
+            self.total_wait += time.monotonic() - queued_at
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+        finally:
+            self._semaphore.release()
+
+
+# 스케줄러 잡과 /admin/crawl이 같은 예산을 공유하도록 모듈 단위로 유지
+_host_budgets: Dict[str, HostBudget] = {}
+
+
+def get_host_budget(netloc: str) -> HostBudget:
+    budget = _host_budgets.get(netloc)
+    if budget is None:
+        budget = HostBudget(netloc, HOST_MAX_IN_FLIGHT, HOST_MIN_INTERVAL)
+        _host_budgets[netloc] = budget
+    return budget
+
+
+def category_netloc(category: str) -> str:
+    conf = NOTICE_CONFIGS.get(category, {})
+    return urlparse(str(conf.get("domain", ""))).netloc or "unknown"
+
+
+async def _crawl_one(category: str, budget: HostBudget, sweep_slots: asyncio.Semaphore) -> Dict[str, Any]:
+    # 호스트 예산을 먼저 받음: 전역 슬롯을 먼저 잡으면 같은 호스트 차례를 기다리는 카테고리들이
+    # 슬롯을 차지해 (예: web.kangnam.ac.kr 6개가 8개 중 6개) 다른 호스트가 놀게 됨
+    async with budget.slot():
+        async with sweep_slots:
+            started = time.monotonic()
+            async with AsyncSessionLocal() as db:
+                try:
+                    await knu_notice_service.crawl_and_sync_notices(db, category)
+                    status = "success"
+                except asyncio.CancelledError:
+                    logger.warning(f"🛑 [{category}] 작업 취소됨")
+                    raise
+                except Exception as e:
+                    logger.error(f"❌ [{category}] 크롤링 실패: {e}")
+                    status = "failed"
+            return {"status": status, "elapsed": round(time.monotonic() - started, 3)}
+
+
+async def run_crawl_sweep(categories: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    카테고리들을 호스트별 예산 안에서 동시에 크롤링합니다.
+
+    반환값: 스윕 리포트 (전체 소요 시간, 카테고리별 결과, 호스트별 대기열 통계)
+    """
+    targets = categories if categories is not None else list(NOTICE_CONFIGS.keys())
+    sweep_started = time.monotonic()
+
+    by_host: Dict[str, List[str]] = {}
+    for cat in targets:
+        by_host.setdefault(category_netloc(cat), []).append(cat)
+
+    for netloc in by_host:
+        get_host_budget(netloc).reset_stats()
+
+    sweep_slots = asyncio.Semaphore(SWEEP_MAX_CONCURRENCY)
+    tasks = {
+        cat: asyncio.create_task(_crawl_one(cat, get_host_budget(netloc), sweep_slots))
+        for netloc, cats in by_host.items()
+        for cat in cats
+    }
+
+    try:
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+    except asyncio.CancelledError:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        raise
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for cat, task in tasks.items():
+        if task.cancelled():
+            results[cat] = {"status": "cancelled"}
+        elif task.exception() is not None:
+            results[cat] = {"status": "failed", "error": str(task.exception())}
+        else:
+            results[cat] = task.result()
+
+    hosts: Dict[str, Dict[str, Any]] = {}
+    for netloc, cats in by_host.items():
+        budget = get_host_budget(netloc)
+        hosts[netloc] = {
+            "categories": len(cats),
+            "max_queue_depth": budget.max_queue_depth,
+            "wait_seconds": round(budget.total_wait, 3),
+        }
+
+    wall_time = round(time.monotonic() - sweep_started, 3)
+    failed = sum(1 for r in results.values() if r.get("status") != "success")
+    logger.info(
+        f"⏱️ [스윕] {len(targets)}개 카테고리 / {len(by_host)}개 호스트, "
+        f"소요 {wall_time:.1f}초 (실패 {failed}개)"
+    )
+    for netloc, stats in sorted(hosts.items(), key=lambda kv: -kv[1]["max_queue_depth"]):
+        if stats["max_queue_depth"] > 1:
+            logger.info(
+                f"   ↳ {netloc}: 카테고리 {stats['categories']}개, "
+                f"최대 대기열 {stats['max_queue_depth']}, 누적 대기 {stats['wait_seconds']:.1f}초"
+            )
+
+    connections = log_connection_stats()
+
+    loop_lag = loop_monitor.stats_since(sweep_started)
+    logger.info(
+        f"⏳ [이벤트 루프] 파싱 모드 {PARSE_POOL_MODE}: 지연 p95 {loop_lag['p95_ms']:.0f}ms, "
+        f"최대 {loop_lag['max_ms']:.0f}ms, 누적 블로킹 {loop_lag['blocked_ms']:.0f}ms"
+    )
+
+    return {
+        "wall_time": wall_time,
+        "results": results,
+        "hosts": hosts,
+        "connections": connections,
+        "loop_lag": {"parse_mode": PARSE_POOL_MODE, **loop_lag},
+    }
@@ -0,0 +1,91 @@
+# app/services/crawl_watermark.py
+"""
+카테고리별 크롤링 워터마크
+
+목록 1페이지의 일반 게시글(필독 제외) encMenuBoardSeq 목록과 목록/필독 다이제스트를 DB에 저장해 두고,
+다음 스윕에서는
+  - 위에서부터 읽다가 이미 본 seq를 만나면 거기서 멈추고 (그 위의 행만 신규 후보)
+  - 1페이지가 전부 신규일 때만 2페이지 이후를 가져오며 (서버 중단 후 밀린 공지 복구)
+  - 필독 집합이 그대로면 필독 상태 재정리 쿼리를 생략합니다.
+
+워터마크는 목록 처리가 끝까지 성공했을 때만 저장합니다. (list_cache와 동일한 원칙)
+DB 조회는 카테고리당 프로세스 생애 동안 한 번이며, 이후에는 메모리 사본을 사용합니다.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import get_logger
+from app.database.models import CrawlWatermark
+from app.services import list_cache
+
+logger = get_logger()
+
+# 워터마크 판정에 사용할 1페이지 seq 개수 상한
+RECENT_SEQS_LIMIT = 30
+
+_cache: Dict[str, Optional[CrawlWatermark]] = {}
+
+
+async def load(db: AsyncSession, category: str) -> Optional[CrawlWatermark]:
+    if category not in _cache:
+        try:
+            _cache[category] = await db.get(CrawlWatermark, category)
+        except Exception as e:
+            logger.error(f"⚠️ [{category}] 워터마크 조회 실패: {e}")
+            return None
+    return _cache[category]
+
+
+def pinned_digest(rows: Dict[str, Dict[str, Any]]) -> str:
+    return list_cache.compute_digest(sorted(url for url, data in rows.items() if data.get("is_pinned")))
+
+
+def regular_seqs(rows: Dict[str, Dict[str, Any]]) -> List[str]:
+    """필독을 제외한 행의 seq (목록 순서 유지)"""
+    return [data["seq"] for data in rows.values() if not data.get("is_pinned") and data.get("seq")]
+
+
+def split_new(
+    rows: Dict[str, Dict[str, Any]], watermark: Optional[CrawlWatermark]
+) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+    """
+    일반 게시글을 위에서부터 읽어 이미 본 seq 직전까지를 신규로 돌려줍니다.
+    반환: (신규 행, 워터마크 도달 여부)
+    """
+    known = set(watermark.recent_seqs or []) if watermark else set()
+    if watermark and watermark.last_board_seq:
+        known.add(watermark.last_board_seq)
+
+    new_rows: Dict[str, Dict[str, Any]] = {}
+    for url, data in rows.items():
+        if data.get("is_pinned"):
+            continue
+        if data.get("seq") in known:
+            return new_rows, True
+        new_rows[url] = data
+    return new_rows, False
+
+
+async def save(
+    db: AsyncSession,
+    category: str,
+    first_page: Dict[str, Dict[str, Any]],
+    list_digest: Optional[str],
+) -> None:
+    seqs = regular_seqs(first_page)[:RECENT_SEQS_LIMIT]
+    try:
+        watermark = await db.get(CrawlWatermark, category)
+        if watermark is None:
+            watermark = CrawlWatermark(category=category)
+            db.add(watermark)
+        watermark.last_board_seq = seqs[0] if seqs else None
+        watermark.recent_seqs = seqs
+        watermark.pinned_digest = pinned_digest(first_page)
+        watermark.list_digest = list_digest
+        await db.commit()
+        _cache[category] = watermark
+    except Exception as e:
+        await db.rollback()
+        _cache.pop(category, None)
+        logger.error(f"⚠️ [{category}] 워터마크 저장 실패: {e}")
@@ -0,0 +1,143 @@
+# app/services/detail_fetcher.py
+"""
+상세 조회 API의 원문 수집
+
+상세 화면 요청 경로에서 학교 서버를 기다리지 않도록
+  - 같은 URL을 동시에 수집하려는 요청은 진행 중인 수집 하나를 함께 기다리고 (single-flight)
+  - 저장된 본문이 부실한 공지는 저장된 값을 바로 돌려주고 백그라운드에서 다시 수집해 갱신합니다.
+    (stale-while-revalidate, DETAIL_STALE_WHILE_REVALIDATE=false면 기존처럼 수집을 기다림)
+DB에 없는 공지는 보여줄 것이 없으므로 수집을 기다립니다. (이때도 single-flight)
+이미지뿐인 공지처럼 다시 수집해도 본문이 짧은 공지가 조회마다 재수집되지 않도록
+URL별 마지막 수집 시각을 기억해 DETAIL_REFRESH_INTERVAL 동안은 다시 수집하지 않습니다.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import update
+
+from app.core.logger import get_logger
+from app.database.database import AsyncSessionLocal
+from app.database.models import Notice
+from app.services import response_cache
+from app.services.scraper import scrape_notice_content
+
+logger = get_logger()
+
+DETAIL_STALE_WHILE_REVALIDATE = os.getenv("DETAIL_STALE_WHILE_REVALIDATE", "true").lower() == "true"
+DETAIL_REFRESH_INTERVAL = float(os.getenv("DETAIL_REFRESH_INTERVAL", "3600"))
+DETAIL_REFRESH_MEMORY = max(1, int(os.getenv("DETAIL_REFRESH_MEMORY", "10000")))
+
+# 이 길이 이하의 본문은 수집이 덜 된 것으로 보고 다시 수집
+MIN_CONTENT_LENGTH = 10
+
+_inflight: Dict[str, "asyncio.Task[Optional[Dict[str, Any]]]"] = {}
+_background: Set[asyncio.Task] = set()
+# url → 마지막 수집 완료 시각 (LRU, DETAIL_REFRESH_MEMORY개까지)
+_last_scraped: "OrderedDict[str, float]" = OrderedDict()
+_stats: Dict[str, int] = {"scrapes": 0, "joined": 0, "background_refreshes": 0, "skipped_recent": 0}
+
+
+def needs_rescrape(content: Optional[str]) -> bool:
+    return not content or len(content) <= MIN_CONTENT_LENGTH
+
+
+def recently_scraped(url: str) -> bool:
+    """DETAIL_REFRESH_INTERVAL 안에 이미 수집한 URL인지 (다시 수집해도 같은 결과일 가능성이 큼)"""
+    scraped_at = _last_scraped.get(url)
+    if scraped_at is None:
+        return False
+    if time.monotonic() - scraped_at >= DETAIL_REFRESH_INTERVAL:
+        _last_scraped.pop(url, None)
+        return False
+    return True
+
+
+def _mark_scraped(url: str):
+    _last_scraped[url] = time.monotonic()
+    _last_scraped.move_to_end(url)
+    if len(_last_scraped) > DETAIL_REFRESH_MEMORY:
+        _last_scraped.popitem(last=False)
+
+
+def _on_scrape_done(url: str, task: "asyncio.Task[Optional[Dict[str, Any]]]"):
+    _inflight.pop(url, None)
+    # 실패(None)도 기억: 응답하지 않는 원문을 조회마다 다시 두드리지 않음
+    if not task.cancelled():
+        _mark_scraped(url)
+
+
+async def scrape_once(url: str) -> Optional[Dict[str, Any]]:
+    """
+    같은 URL의 수집이 진행 중이면 새로 요청하지 않고 그 결과를 함께 기다립니다.
+    상세 조회에서 부르는 수집이므로 크롤링 속도 제한 대기열을 건너뛰는 우선 요청으로 보냅니다.
+    """
+    task = _inflight.get(url)
+    if task is None:
+        _stats["scrapes"] += 1
+        task = asyncio.create_task(scrape_notice_content(url, priority=True))
+        _inflight[url] = task
+        task.add_done_callback(lambda t, u=url: _on_scrape_done(u, t))
+    else:
+        _stats["joined"] += 1
+    # 기다리던 요청 하나가 끊겨도 다른 요청이 기다리는 수집은 취소되지 않도록
+    return await asyncio.shield(task)
+
+
+async def save_content(url: str, scraped: Dict[str, Any]) -> bool:
+    """다시 수집한 본문/이미지/첨부를 같은 link의 공지에 저장합니다. (별도 세션)"""
+    content = "\n\n".join(scraped.get("texts", []))
+    if needs_rescrape(content):
+        return False
+    async with AsyncSessionLocal() as db:
+        try:
+            result = await db.execute(
+                update(Notice)
+                .where(Notice.link == url)
+                .values(content=content, images=scraped.get("images", []), files=scraped.get("files", []))
+                .returning(Notice.category)
+                .execution_options(synchronize_session=False)
+            )
+            categories = set(result.scalars().all())
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"⚠️ [상세] 본문 저장 실패 ({url}): {e}")
+            return False
+    # 목록 응답에도 본문이 포함되므로 해당 카테고리 캐시를 비움
+    for category in categories:
+        response_cache.invalidate(category)
+    return bool(categories)
+
+
+def refresh_in_background(url: str):
+    """저장된 값을 먼저 응답하고, 원문은 백그라운드에서 다시 수집해 저장합니다."""
+    if url in _inflight:
+        return
+    if recently_scraped(url):
+        _stats["skipped_recent"] += 1
+        return
+    _stats["background_refreshes"] += 1
+    task = asyncio.create_task(_refresh(url))
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+async def _refresh(url: str):
+    try:
+        scraped = await scrape_once(url)
+        if scraped and await save_content(url, scraped):
+            logger.info(f"🔄 [상세] 백그라운드 본문 갱신 완료: {url}")
+    except Exception as e:
+        logger.error(f"⚠️ [상세] 백그라운드 갱신 실패 ({url}): {e}")
+
+
+def get_stats() -> Dict[str, Any]:
+    return {
+        **_stats,
+        "inflight": len(_inflight),
+        "background": len(_background),
+        "recently_scraped": len(_last_scraped),
+    }
@@ -0,0 +1,73 @@
+# app/services/device_cache.py
+"""
+토큰 → device_id 캐시
+
+기기 관련 API는 모두 select(Device).where(Device.token == token)으로 시작합니다.
+대부분은 id만 필요하므로 토큰별 device_id를 LRU(DEVICE_CACHE_SIZE) + TTL(DEVICE_CACHE_TTL)로 기억해
+요청마다의 Device 조회(ORM 객체 생성 포함)를 없앱니다.
+푸시 발송 실패로 기기가 삭제되면(remove_invalid_tokens) forget()으로 바로 지웁니다.
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import Device
+
+DEVICE_CACHE_SIZE = max(1, int(os.getenv("DEVICE_CACHE_SIZE", "10000")))
+DEVICE_CACHE_TTL = float(os.getenv("DEVICE_CACHE_TTL", "3600"))
+
+# token → (device_id, 저장 시각)
+_entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "forgotten": 0}
+
+
+def get(token: str) -> Optional[int]:
+    entry = _entries.get(token)
+    if entry is None:
+        return None
+    device_id, stored_at = entry
+    if time.monotonic() - stored_at >= DEVICE_CACHE_TTL:
+        _entries.pop(token, None)
+        return None
+    _entries.move_to_end(token)
+    return device_id
+
+
+def remember(token: str, device_id: int):
+    _entries[token] = (device_id, time.monotonic())
+    _entries.move_to_end(token)
+    if len(_entries) > DEVICE_CACHE_SIZE:
+        _entries.popitem(last=False)
+
+
+async def resolve(db: AsyncSession, token: str) -> Optional[int]:
+    """토큰의 device_id (등록되지 않은 토큰이면 None, 없는 토큰은 기억하지 않음)"""
+    device_id = get(token)
+    if device_id is not None:
+        _stats["hits"] += 1
+        return device_id
+
+    _stats["misses"] += 1
+    device_id = (await db.execute(select(Device.id).where(Device.token == token))).scalar()
+    if device_id is not None:
+        remember(token, device_id)
+    return device_id
+
+
+def forget(tokens: Iterable[str]) -> List[int]:
+    """토큰들을 지우고, 기억하고 있던 device_id 목록을 반환합니다."""
+    removed = []
+    for token in tokens:
+        entry = _entries.pop(token, None)
+        if entry is not None:
+            removed.append(entry[0])
+            _stats["forgotten"] += 1
+    return removed
+
+
+def get_stats() -> Dict[str, int]:
+    return {**_stats, "entries": len(_entries)}
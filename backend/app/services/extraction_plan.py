@@ -0,0 +1,412 @@
+# app/services/extraction_plan.py
+"""
+상세 페이지 단일 순회 추출기
+
+사이트 유형(CMS)별로 제목/날짜/첨부파일/본문 셀렉터를 미리 컴파일해 두고,
+트리를 한 번만 순회하면서 모든 필드(제목, 날짜, 조회수, 첨부파일, 이미지, 본문 텍스트)를 모읍니다.
+
+- 셀렉터 우선순위는 기존 select_one 체인과 같습니다. (앞선 셀렉터가 매칭되면 그것을 사용)
+- 도메인별로 실제 매칭된 셀렉터를 기억해 두었다가, 다음 페이지에서는 그 셀렉터로 먼저 순회합니다.
+  아직 학습하지 못한 필드(예: 첫 페이지에 날짜가 없던 도메인의 날짜)와 첨부파일은 후보 전체를 그대로 검사하고,
+  새로 찾은 필드는 학습에 더합니다. (학습한 필드를 못 찾으면 전체 계획으로 다시 순회하고 학습 내용을 갱신)
+- 본문 정리(script/style/iframe, CMS 부가 요소, display:none 요소 제거)는 노드를 지우지 않고
+  순회 중에 해당 서브트리의 텍스트를 건너뛰는 방식으로 처리합니다.
+- BeautifulSoup(lxml/html.parser) 트리용입니다. selectolax는 셀렉터가 네이티브로 돌아
+  select_one 체인이 더 빠르므로 scraper.extract_notice_fields가 그쪽을 사용합니다.
+"""
+import re
+from datetime import datetime
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlparse
+
+from app.core.html_parser import HtmlNode
+
+FIELD_TITLE = "title"
+FIELD_DATE = "date"
+FIELD_FILES = "files"
+FIELD_CONTENT = "content"
+
+LINE_TAGS = frozenset({"p", "div", "br", "li", "h4", "h5"})
+REMOVED_TAGS = frozenset({"script", "style", "iframe"})
+REMOVED_CLASSES = frozenset({"contents_add_one1", "contents_add_one2", "contents_add_one", "hide_txt"})
+
+_VIEW_RE = re.compile(r'(?:조회|View)(?:수)?\s*[:]?\s*(\d+)', re.IGNORECASE)
+_DATE_RE = re.compile(r'(\d{4})\s*[\.\-\/]\s*(\d{1,2})\s*[\.\-\/]\s*(\d{1,2})')
+
+
+def parse_date_and_views(full_text: str) -> Tuple[Optional[Any], Optional[int]]:
+    """'작성일 2025.10.20 조회수 45' 같은 정보 줄에서 (날짜, 조회수)를 추출합니다."""
+    views = None
+    view_match = _VIEW_RE.search(full_text)
+    if view_match:
+        views = int(view_match.group(1))
+
+    date_value = None
+    date_match = _DATE_RE.search(full_text)
+    if date_match:
+        y, m, d = date_match.groups()
+        date_value = datetime(int(y), int(m), int(d)).date()
+    return date_value, views
+
+
+# ============================================================
+# 셀렉터 컴파일 (태그 / .클래스 / [attr*="값"] 와 하위 선택자만 지원)
+# ============================================================
+_COMPOUND_TOKEN_RE = re.compile(r'([a-zA-Z][\w-]*)|\.([\w-]+)|\[([\w-]+)\*="([^"]*)"\]')
+
+
+class _Compound:
+    __slots__ = ("tag", "classes", "attr_contains")
+
+    def __init__(self, tag: Optional[str], classes: FrozenSet[str], attr_contains: Optional[Tuple[str, str]]):
+        self.tag = tag
+        self.classes = classes
+        self.attr_contains = attr_contains
+
+    def matches(self, node: HtmlNode, tag: str, classes: Set[str]) -> bool:
+        if self.tag and self.tag != tag:
+            return False
+        if self.classes and not self.classes <= classes:
+            return False
+        if self.attr_contains:
+            name, needle = self.attr_contains
+            value = node.attr(name)
+            if not value or needle not in value:
+                return False
+        return True
+
+
+def _compile_compound(text: str) -> _Compound:
+    tag = None
+    classes = set()
+    attr_contains = None
+    pos = 0
+    for m in _COMPOUND_TOKEN_RE.finditer(text):
+        if m.start() != pos:
+            raise ValueError(f"지원하지 않는 셀렉터: {text}")
+        pos = m.end()
+        if m.group(1):
+            tag = m.group(1).lower()
+        elif m.group(2):
+            classes.add(m.group(2))
+        else:
+            attr_contains = (m.group(3), m.group(4))
+    if pos != len(text):
+        raise ValueError(f"지원하지 않는 셀렉터: {text}")
+    return _Compound(tag, frozenset(classes), attr_contains)
+
+
+class CompiledSelector:
+    __slots__ = ("text", "steps")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.steps = tuple(_compile_compound(part) for part in text.split())
+
+
+# ============================================================
+# 사이트 유형별 추출 계획
+# ============================================================
+_GENERIC_SELECTORS = {
+    FIELD_TITLE: ['.sponge-page-guide h4', '.sponge-page-title-section h3', '.subject',
+                  'h3.title', 'h4.title', '.tblw_subj', '.bo_v_tit', '.view_title'],
+    FIELD_DATE: ['.sponge-page-guide .pull-right', '.sponge-board-view-info', '.tblw_date',
+                 '.date', '.writer_info', '.bo_v_info', '.view_info'],
+    FIELD_FILES: ['.sponge-page-guide a[href*="ownload"]', '.wri_area.file a.link_file',
+                  '.file_area a', '.bo_v_file a', '.view_file a'],
+    FIELD_CONTENT: ['.sponge-panel-white-remark', '.tbl_view', '.content_view', '.bo_v_con', '.view_content'],
+}
+
+_DAEPLE_SELECTORS = {
+    FIELD_TITLE: ['.board-view-title'],
+    FIELD_DATE: ['.board-view-info'],
+    FIELD_FILES: ['.board-view-file a'],
+    FIELD_CONTENT: ['.board-view-cont'],
+}
+
+
+class ExtractionPlan:
+    def __init__(self, name: str, selectors: Dict[str, List[str]]):
+        self.name = name
+        self.fields: Dict[str, List[CompiledSelector]] = {
+            field: [CompiledSelector(s) for s in texts] for field, texts in selectors.items()
+        }
+        # (selector_id -> (field, priority, selector))
+        self.index: List[Tuple[str, int, CompiledSelector]] = [
+            (field, priority, sel)
+            for field, sels in self.fields.items()
+            for priority, sel in enumerate(sels)
+        ]
+
+
+def _merge(*sources: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    merged: Dict[str, List[str]] = {}
+    for source in sources:
+        for field, texts in source.items():
+            merged.setdefault(field, []).extend(texts)
+    return merged
+
+
+# 대플 페이지에 다른 CMS 셀렉터가 우연히 섞이지 않도록 계획을 분리 (못 찾으면 전체 계획으로 재시도)
+FULL_PLAN = ExtractionPlan("full", _merge(_DAEPLE_SELECTORS, _GENERIC_SELECTORS))
+SITE_PLANS: Dict[str, ExtractionPlan] = {
+    "daeple": ExtractionPlan("daeple", _DAEPLE_SELECTORS),
+    "main_cms": ExtractionPlan("main_cms", _GENERIC_SELECTORS),
+    "library": FULL_PLAN,
+}
+
+# 도메인별로 학습한 셀렉터: {netloc: {field: selector_text}}
+_learned: Dict[str, Dict[str, str]] = {}
+_learned_plans: Dict[str, ExtractionPlan] = {}
+
+
+# ============================================================
+# 단일 순회
+# ============================================================
+class _ContentCollector:
+    __slots__ = ("images", "line_slots", "suppressed", "raw")
+
+    def __init__(self):
+        self.images: List[str] = []
+        self.line_slots: List[Optional[str]] = []
+        self.suppressed = 0
+        self.raw: List[str] = []
+
+
+class _Traversal:
+    def __init__(self, plan: ExtractionPlan, url: str):
+        self.plan = plan
+        self.url = url
+        self.all_ids = tuple(range(len(plan.index)))
+        # selector_id -> 첫 매칭 결과 (문서 순서상 처음 = select_one과 동일)
+        self.first_text: Dict[int, Any] = {}
+        self.file_slots: List[Optional[Tuple[str, str]]] = []
+        self.collectors: List[_ContentCollector] = []
+
+    def run(self, root: HtmlNode):
+        self._visit(root, frozenset())
+
+    def _visit(self, node: HtmlNode, partials: FrozenSet[Tuple[int, int]]) -> Tuple[List[str], List[str], bool]:
+        """노드 하나를 방문하고 (visible 텍스트, span 제외 텍스트, 정리 대상 여부)를 반환합니다."""
+        tag = node.tag
+        class_attr = node.attr("class")
+        classes = set(class_attr.split()) if class_attr else set()
+
+        # 1. 셀렉터 매칭 (조상에서 앞 단계가 맞은 부분 매칭 + 새로 시작하는 매칭)
+        matched: List[int] = []
+        next_partials = set(partials)
+        index = self.plan.index
+        for sid, step in list(partials) + [(sid, 0) for sid in self.all_ids]:
+            steps = index[sid][2].steps
+            if steps[step].matches(node, tag, classes):
+                if step == len(steps) - 1:
+                    matched.append(sid)
+                else:
+                    next_partials.add((sid, step + 1))
+        child_partials = frozenset(next_partials)
+
+        # 2. 본문 정리 대상 여부 (본문 영역 안에서만 의미가 있음)
+        removable = bool(self.collectors) and (
+            tag in REMOVED_TAGS
+            or bool(classes & REMOVED_CLASSES)
+            or _is_hidden(node.attr("style"))
+        )
+        active = list(self.collectors)
+        if removable:
+            for c in active:
+                c.suppressed += 1
+
+        if tag == "img":
+            src = node.attr("src")
+            if src:
+                full_src = urljoin(self.url, src)
+                for c in active:
+                    c.images.append(full_src)
+
+        line_refs: List[Tuple[_ContentCollector, int]] = []
+        if tag in LINE_TAGS:
+            for c in active:
+                if c.suppressed == 0:
+                    c.line_slots.append(None)
+                    line_refs.append((c, len(c.line_slots) - 1))
+
+        # 셀렉터별 첫 매칭은 진입 시점(문서 순서)에 선점
+        claimed = [sid for sid in matched if sid not in self.first_text]
+        for sid in claimed:
+            self.first_text[sid] = None
+
+        file_slot = None
+        new_collector = None
+        for sid in matched:
+            field = index[sid][0]
+            if field == FIELD_FILES and file_slot is None:
+                self.file_slots.append(None)
+                file_slot = len(self.file_slots) - 1
+            elif field == FIELD_CONTENT and new_collector is None and sid in claimed:
+                new_collector = _ContentCollector()
+                self.collectors.append(new_collector)
+
+        # 3. 자식 순회 (visible: 정리 대상 제외, nospan: 제목용 span 제외)
+        visible: List[str] = []
+        nospan: List[str] = []
+        for child in node.children():
+            if isinstance(child, str):
+                text = child.strip()
+                if text:
+                    visible.append(text)
+                    nospan.append(text)
+                continue
+            child_visible, child_nospan, child_removed = self._visit(child, child_partials)
+            if not child_removed:
+                visible.extend(child_visible)
+            if child.tag != "span":
+                nospan.extend(child_nospan)
+
+        # 4. 결과 기록
+        if removable:
+            for c in active:
+                c.suppressed -= 1
+
+        for c, slot in line_refs:
+            c.line_slots[slot] = "".join(visible)
+
+        for sid in claimed:
+            field = index[sid][0]
+            if field == FIELD_TITLE:
+                self.first_text[sid] = "".join(nospan)
+            elif field == FIELD_DATE:
+                self.first_text[sid] = " ".join(visible)
+            elif field == FIELD_CONTENT:
+                self.first_text[sid] = new_collector
+            else:
+                self.first_text[sid] = True
+
+        if file_slot is not None:
+            self.file_slots[file_slot] = (node.attr("href") or "", "".join(visible))
+
+        if new_collector is not None:
+            new_collector.raw = visible
+            self.collectors.remove(new_collector)
+
+        return visible, nospan, removable
+
+    def resolve(self, field: str) -> Tuple[Optional[int], Any]:
+        """우선순위가 가장 높은 매칭 셀렉터의 (selector_id, 결과)"""
+        best = None
+        for sid, (f, priority, _) in enumerate(self.plan.index):
+            if f != field or sid not in self.first_text:
+                continue
+            if best is None or priority < self.plan.index[best][1]:
+                best = sid
+        if best is None:
+            return None, None
+        return best, self.first_text[best]
+
+
+def _is_hidden(style_attr: Optional[str]) -> bool:
+    if not style_attr:
+        return False
+    style_lower = style_attr.lower().replace(' ', '')
+    return 'display:none' in style_lower or 'visibility:hidden' in style_lower
+
+
+def _build_result(traversal: _Traversal) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    data: Dict[str, Any] = {
+        "title": "", "date": None, "texts": [],
+        "images": [], "files": [], "univ_views": 0
+    }
+    index = traversal.plan.index
+    learned: Dict[str, str] = {}
+
+    sid, title = traversal.resolve(FIELD_TITLE)
+    if sid is not None:
+        data["title"] = title
+        learned[FIELD_TITLE] = index[sid][2].text
+
+    sid, date_text = traversal.resolve(FIELD_DATE)
+    if sid is not None:
+        learned[FIELD_DATE] = index[sid][2].text
+        date_value, views = parse_date_and_views(date_text)
+        if views is not None:
+            data["univ_views"] = views
+        if date_value is not None:
+            data["date"] = date_value
+
+    for slot in traversal.file_slots:
+        if not slot:
+            continue
+        f_link, f_text = slot
+        if f_link and not f_link.startswith("#") and "javascript" not in f_link:
+            full_file_url = urljoin(traversal.url, f_link)
+            if not any(f['url'] == full_file_url for f in data["files"]):
+                data["files"].append({"name": f_text or "첨부파일", "url": full_file_url})
+
+    sid, collector = traversal.resolve(FIELD_CONTENT)
+    if sid is not None:
+        learned[FIELD_CONTENT] = index[sid][2].text
+        data["images"] = collector.images
+        lines = [
+            text for text in collector.line_slots
+            if text and text != 'undefined' and len(text) > 1
+        ]
+        if lines:
+            data["texts"] = lines
+        else:
+            raw_text = "\n".join(collector.raw).replace('undefined', '').strip()
+            if raw_text and len(raw_text) > 1:
+                data["texts"].append(raw_text)
+
+    return data, learned
+
+
+def _learned_plan(netloc: str, base: ExtractionPlan) -> Optional[ExtractionPlan]:
+    if netloc not in _learned:
+        return None
+    plan = _learned_plans.get(netloc)
+    if plan is None:
+        learned = _learned[netloc]
+        # 학습하지 못한 필드는 사이트 유형 계획의 후보 전체를 그대로 검사
+        # (첨부파일은 글마다 있을 수도 없을 수도 있어 학습하지 않음)
+        selectors = {
+            field: [learned[field]] if field in learned and field != FIELD_FILES else [s.text for s in sels]
+            for field, sels in base.fields.items()
+        }
+        plan = ExtractionPlan(f"learned:{netloc}", selectors)
+        _learned_plans[netloc] = plan
+    return plan
+
+
+def _run(plan: ExtractionPlan, root: HtmlNode, url: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    traversal = _Traversal(plan, url)
+    traversal.run(root)
+    return _build_result(traversal)
+
+
+def extract_with_plan(root: HtmlNode, url: str, site_type: str = "main_cms") -> Dict[str, Any]:
+    """사이트 유형별 계획(및 도메인별 학습 결과)으로 상세 페이지 필드를 한 번의 순회로 추출합니다."""
+    netloc = urlparse(url).netloc
+    site_plan = SITE_PLANS.get(site_type, FULL_PLAN)
+
+    # 1. 지난번에 이 도메인에서 맞았던 셀렉터로 먼저 시도
+    plan = _learned_plan(netloc, site_plan)
+    if plan is not None:
+        data, learned = _run(plan, root, url)
+        if all(field in learned for field in _learned[netloc]):
+            if len(learned) > len(_learned[netloc]):
+                # 처음 학습할 때 없던 필드를 이번 페이지에서 찾음
+                _learned[netloc] = learned
+                _learned_plans.pop(netloc, None)
+            return data
+        _learned.pop(netloc, None)
+        _learned_plans.pop(netloc, None)
+
+    # 2. 사이트 유형 계획 → 필수 필드(제목/본문)를 못 찾으면 전체 계획
+    plan = site_plan
+    data, learned = _run(plan, root, url)
+    if plan is not FULL_PLAN and not (FIELD_TITLE in learned and FIELD_CONTENT in learned):
+        data, learned = _run(FULL_PLAN, root, url)
+
+    if FIELD_TITLE in learned and FIELD_CONTENT in learned:
+        _learned[netloc] = learned
+        _learned_plans.pop(netloc, None)
+    return data
@@ -2,61 +2,178 @@
 import json
 import html as html_lib
 import asyncio
+import os
 import re
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List, Dict, Any, Union, cast
+from typing import Optional, List, Dict, Any, Tuple, Union, cast
 from bs4 import BeautifulSoup, Tag
 from urllib.parse import urljoin, urlparse, parse_qsl, urlencode
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, tuple_
 
 from app.services.ai_service import generate_summary
 from app.core.config import get_urls, NOTICE_CONFIGS
-from app.core.http import fetch_html
-from app.database.models import Notice
+from app.core.http import fetch_html, fetch_html_conditional
+from app.core.html_parser import HtmlNode, parse_html
+from app.database import bulk
+from app.database.models import CrawlWatermark, Notice
+from app.database.database import AsyncSessionLocal
 from app.services.scraper import scrape_notice_content
 from app.core.logger import get_logger
-from app.services.notification_service import send_keyword_notifications
+from app.services import crawl_retry, crawl_watermark, list_cache, notice_counts, push_outbox, response_cache, search_index
 
 logger = get_logger()
-SCRAPE_SEMAPHORE = asyncio.Semaphore(3) 
 NOTIFICATION_TARGET_CATEGORIES = {"academic", "job", "scholar", "event_internal", "event_external"}
+LIST_REGION = ("div", "tbody")
+# 워터마크를 찾을 때까지 거슬러 올라갈 최대 목록 페이지 수 / 페이지 번호 쿼리 파라미터
+CRAWL_MAX_LIST_PAGES = max(1, int(os.getenv("CRAWL_MAX_LIST_PAGES", "5")))
+CRAWL_LIST_PAGE_PARAM = os.getenv("CRAWL_LIST_PAGE_PARAM", "pageIndex")
+# 이 기간보다 오래 전에 수집된 필독 공지는 목록에 남아 있어도 해제 (일)
+PIN_EXPIRY_DAYS = 30
 
 async def crawl_and_sync_notices(db: AsyncSession, category: str = "univ"):
     config = NOTICE_CONFIGS.get(category)
     if not config:
         return
 
+    # 오래된 필독 해제는 목록이 바뀌지 않은 스윕에서도 매번 실행 (필독 재정리는 필독 집합이 바뀔 때만 돌기 때문)
+    await _expire_old_pins(db, category)
+
     site_type = config.get("type", "main_cms") 
-    candidates_map: Dict[str, Dict[str, Any]] = {} # [수정] 구조 변경: {url: {"title": str, "is_pinned": bool}}
+    candidates_map: Dict[str, Dict[str, Any]] = {} # [수정] 구조 변경: {url: {"title": str, "is_pinned": bool, "seq": str}}
     
+    watermark = await crawl_watermark.load(db, category)
+
     # if site_type == "library":
     #     candidates_map = await _crawl_library_list(category, config)
     # elif site_type == "daeple":
     #     candidates_map = await _crawl_daeple_list(category, config)
     # else:
-    candidates_map = await _crawl_main_cms_list(category)
+    listing = await _crawl_main_cms_list(category, watermark)
+
+    if listing is None:
+        logger.info(f"💤 [{category}] 목록 변경 없음 (캐시 적중)")
+        return
 
-    if not candidates_map:
+    first_page, digest = listing
+    if not first_page:
+        list_cache.discard(category)
         logger.info(f"ℹ️ [{category}] 신규 공지사항 없음 (또는 목록 파싱 실패)")
         return
 
-    await _process_candidates(db, category, candidates_map)
+    # 워터마크가 있으면 이미 본 게시글 직전까지만 후보로 삼고, 필독 집합이 바뀐 경우에만 필독을 재정리
+    reconcile_pins = watermark is None or watermark.pinned_digest != crawl_watermark.pinned_digest(first_page)
+    older_complete = True
+    if watermark is None:
+        candidates_map = first_page
+    else:
+        candidates_map, reached = crawl_watermark.split_new(first_page, watermark)
+        if not reached:
+            older, older_complete = await _crawl_older_pages(category, watermark)
+            candidates_map.update(older)
+        if reconcile_pins:
+            pinned_rows = {url: data for url, data in first_page.items() if data.get("is_pinned")}
+            candidates_map = {**pinned_rows, **candidates_map}
+        logger.info(f"🔖 [{category}] 워터마크 기준 신규 후보 {len(candidates_map)}개 (필독 재정리: {reconcile_pins})")
+
+    completed = True
+    if candidates_map or reconcile_pins:
+        completed = await _process_candidates(db, category, candidates_map, reconcile_pins=reconcile_pins)
+    # 이어서 읽던 목록 페이지를 못 가져왔으면 그 사이 공지가 빠지지 않도록 워터마크를 올리지 않음
+    # (받아 둔 후보는 저장하고, 다음 스윕에서 같은 구간을 다시 읽음)
+    completed = completed and older_complete
+    if completed:
+        list_cache.commit(category)
+        await crawl_watermark.save(db, category, first_page, digest)
+    else:
+        list_cache.discard(category)
 
 
-async def _crawl_main_cms_list(category: str) -> Dict[str, Dict[str, Any]]:
+async def _crawl_main_cms_list(
+    category: str, watermark: Optional[CrawlWatermark] = None
+) -> Optional[Tuple[Dict[str, Dict[str, Any]], Optional[str]]]:
+    """CMS 목록 1페이지 수집. 목록이 지난 스윕과 같으면 None, 아니면 (행, 다이제스트)를 반환합니다."""
     list_url, info_url, default_seq = get_urls(category)
-    if not list_url: return {}
+    if not list_url: return {}, None
 
     logger.info(f"🔄 [{category}] CMS 목록 가져오는 중...")
+    cached = list_cache.get_state(category)
     try:
-        html_text = await fetch_html(list_url, params={"searchMenuSeq": default_seq})
-        soup = BeautifulSoup(html_text, "html.parser")
+        fetched = await fetch_html_conditional(
+            list_url,
+            params={"searchMenuSeq": default_seq},
+            etag=cached.etag if cached else None,
+            last_modified=cached.last_modified if cached else None,
+        )
+        if fetched.not_modified:
+            list_cache.record("not_modified")
+            return None
+        # 목록 영역(div.tbody)만 트리로 만들어 나머지 레이아웃 파싱 비용을 줄입니다.
+        doc = parse_html(fetched.text, site_type="main_cms", strain=LIST_REGION)
     except Exception as e:
         logger.error(f"❌ [{category}] 목록 접속 실패: {e}")
-        return {}
+        return {}, None
     # 공지사항 링크들을 먼저 찾습니다.
-    rows = soup.select("div.tbody > ul")
+    rows = doc.select("div.tbody > ul")
+
+    # 목록 영역 다이제스트 (조회수처럼 자주 바뀌는 칸은 제외하고 링크/제목/필독 표시만 반영)
+    digest = list_cache.compute_digest(
+        (link.html() if (link := ul.select_one("a.detailLink[data-params]")) else "")
+        + "|".join(span.text(strip=True) for span in ul.select("span.ali_a"))
+        for ul in rows
+    )
+    # 메모리 캐시가 비어 있으면(재시작 직후) DB 워터마크의 다이제스트와 비교
+    if rows and (list_cache.is_unchanged(category, digest) or (cached is None and watermark and watermark.list_digest == digest)):
+        list_cache.record("digest_match")
+        return None
+    list_cache.record("changed")
+    list_cache.stage(category, fetched.etag, fetched.last_modified, digest)
+
+    return extract_cms_list_rows(rows, info_url), digest
+
+
+async def _crawl_older_pages(
+    category: str, watermark: CrawlWatermark
+) -> Tuple[Dict[str, Dict[str, Any]], bool]:
+    """
+    1페이지가 전부 신규일 때 워터마크를 만날 때까지 2페이지부터 이어서 수집합니다.
+    반환: (수집한 행, 완료 여부). 페이지 접속에 실패하면 완료 여부가 False입니다.
+    """
+    collected: Dict[str, Dict[str, Any]] = {}
+
+    for page in range(2, CRAWL_MAX_LIST_PAGES + 1):
+        try:
+            rows = await fetch_cms_list_page(category, page)
+        except Exception as e:
+            logger.error(f"❌ [{category}] 목록 {page}페이지 접속 실패 (워터마크 유지): {e}")
+            return collected, False
+
+        new_rows, reached = crawl_watermark.split_new(rows, watermark)
+        # 페이지 파라미터가 무시되면 1페이지가 반복되므로 새 행이 없으면 중단
+        new_rows = {url: data for url, data in new_rows.items() if url not in collected}
+        collected.update(new_rows)
+        if reached or not new_rows:
+            logger.info(f"📚 [{category}] {page}페이지까지 확인, 밀린 공지 {len(collected)}개")
+            return collected, True
+
+    logger.warning(
+        f"⚠️ [{category}] {CRAWL_MAX_LIST_PAGES}페이지까지 워터마크를 찾지 못했습니다 "
+        f"(그 이전 공지는 누락될 수 있습니다)"
+    )
+    return collected, True
+
+
+async def fetch_cms_list_page(category: str, page: int) -> Dict[str, Dict[str, Any]]:
+    """CMS 목록의 page번째 페이지를 가져와 행을 추출합니다. (접속 실패 시 예외)"""
+    list_url, info_url, default_seq = get_urls(category)
+    if not list_url: return {}
+    markup = await fetch_html(list_url, params={"searchMenuSeq": default_seq, CRAWL_LIST_PAGE_PARAM: page})
+    doc = parse_html(markup, site_type="main_cms", strain=LIST_REGION)
+    return extract_cms_list_rows(doc.select("div.tbody > ul"), info_url)
+
+
+def extract_cms_list_rows(rows: List[HtmlNode], info_url: str) -> Dict[str, Dict[str, Any]]:
+    """CMS 목록 행(div.tbody > ul)에서 {상세 URL: {title, is_pinned}}를 추출합니다."""
     candidates: Dict[str, Dict[str, Any]] = {}
 
     for ul in rows:
@@ -67,9 +184,9 @@ async def _crawl_main_cms_list(category: str) -> Dict[str, Dict[str, Any]]:
                 continue
 
             # 2. 제목 추출 (a 태그의 텍스트 또는 title 속성) - 필독 감지 전에 먼저 추출
-            text_title = a.get_text(" ", strip=True)
-            attr_title = a.get("title", "")
-            final_title = text_title or (attr_title if isinstance(attr_title, str) else "")
+            text_title = a.text(" ", strip=True)
+            attr_title = a.attr("title") or ""
+            final_title = text_title or attr_title
 
             # 3. [필독 감지] 해당 행(ul) 내부의 모든 li 요소를 확인하여 span.ali_a 태그 찾기
             is_pinned = False
@@ -77,7 +194,7 @@ async def _crawl_main_cms_list(category: str) -> Dict[str, Dict[str, Any]]:
             # 방법 1: ul 내부의 모든 span.ali_a 검색 (가장 정확한 방법)
             pin_elements = ul.select("span.ali_a")
             for pin_elem in pin_elements:
-                pin_text = pin_elem.get_text(strip=True)
+                pin_text = pin_elem.text(strip=True)
                 if "필독" in pin_text:
                     is_pinned = True
                     break
@@ -89,30 +206,26 @@ async def _crawl_main_cms_list(category: str) -> Dict[str, Dict[str, Any]]:
                     # 첫 번째 li 내부의 span.ali_a 확인 (가장 정확)
                     ali_a = first_li.select_one("span.ali_a")
                     if ali_a:
-                        ali_a_text = ali_a.get_text(strip=True)
+                        ali_a_text = ali_a.text(strip=True)
                         if "필독" in ali_a_text:
                             is_pinned = True
                     # span.ali_a가 없으면 첫 번째 li 전체 텍스트 확인
                     if not is_pinned:
-                        first_li_text = first_li.get_text(strip=True)
+                        first_li_text = first_li.text(strip=True)
                         if "필독" in first_li_text:
                             is_pinned = True
             
             # 방법 3: ul 전체에서 "필독" 검색 (최후의 수단)
             if not is_pinned:
-                ul_text = ul.get_text(strip=True)
+                ul_text = ul.text(strip=True)
                 if "필독" in ul_text:
                     # 첫 번째 li에 "필독"이 있는지 확인
                     first_li = ul.select_one("li:first-child")
-                    if first_li and "필독" in first_li.get_text(strip=True):
+                    if first_li and "필독" in first_li.text(strip=True):
                         is_pinned = True
             
             # 4. 데이터 파라미터 파싱
-            raw_params = a.get("data-params", "")
-            if not raw_params: continue
-            
-            # 타입 안전성을 위해 문자열로 변환 (BeautifulSoup의 _AttributeValue 타입 처리)
-            raw_params_str: str = str(raw_params)
+            raw_params_str = a.attr("data-params") or ""
             if not raw_params_str: continue
             
             # JSON 파싱 (홑따옴표 처리 포함)
@@ -137,7 +250,11 @@ async def _crawl_main_cms_list(category: str) -> Dict[str, Dict[str, Any]]:
                 existing_is_pinned = candidates[detail_url].get("is_pinned", False)
                 is_pinned = existing_is_pinned or is_pinned
             
-            candidates[detail_url] = {"title": final_title.strip(), "is_pinned": is_pinned}
+            candidates[detail_url] = {
+                "title": final_title.strip(),
+                "is_pinned": is_pinned,
+                "seq": str(params.get("encMenuBoardSeq")),
+            }
             
         except Exception as e:
             logger.debug(f"Row parsing error: {e}")
@@ -236,158 +353,308 @@ async def _crawl_main_cms_list(category: str) -> Dict[str, Dict[str, Any]]:
 #     return candidates
 
 
-async def _process_candidates(db: AsyncSession, category: str, candidates_map: Dict[str, Dict[str, Any]]):
+async def _expire_old_pins(db: AsyncSession, category: str):
+    """PIN_EXPIRY_DAYS일보다 오래 전에 수집된 필독 공지를 해제합니다. (UPDATE ... RETURNING 한 번, 보통 0행)"""
+    try:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=PIN_EXPIRY_DAYS)
+        expired = await bulk.expire_pins(db, category, cutoff)
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"⚠️ [{category}] 오래된 필독 해제 실패: {e}")
+        return
+    if expired:
+        response_cache.invalidate(category)
+        for _, title in expired:
+            logger.info(f"📌→📄 [{category}] 필독 기간 만료: {title[:50]}...")
+
+
+async def _process_candidates(
+    db: AsyncSession, category: str, candidates_map: Dict[str, Dict[str, Any]], reconcile_pins: bool = True
+) -> bool:
+    """
+    목록 후보를 DB와 동기화합니다. 모든 신규 공지가 저장되고 필독 재정리가 성공하면 True를 반환합니다.
+    reconcile_pins=False면 필독 상태 갱신/해제를 건너뜁니다. (필독 집합이 지난 스윕과 같을 때)
+    """
     candidate_urls = list(candidates_map.keys())
-    if not candidate_urls: return
+    if not candidate_urls and not reconcile_pins: return True
 
     try:
-        # 기존 공지사항 조회 (링크와 is_pinned 정보 포함)
-        stmt = select(Notice).where(and_(Notice.category == category, Notice.link.in_(candidate_urls)))
+        # 기존 공지사항 링크만 조회 (필독 상태는 아래에서 UPDATE 문으로 처리)
+        stmt = select(Notice.link).where(and_(Notice.category == category, Notice.link.in_(candidate_urls)))
         result = await db.execute(stmt)
-        existing_notices = {notice.link: notice for notice in result.scalars().all()}
-        existing_links = set(existing_notices.keys())
+        existing_links = set(result.scalars().all())
     except Exception as e:
         logger.error(f"🔥 [{category}] DB 조회 실패: {e}")
-        return
+        return False
+
+    # 상세 수집이 실패해 백오프 중인 URL은 재시도 워커에 맡기고 건너뜀
+    try:
+        blocked = await crawl_retry.blocked_urls(db, category, [url for url in candidate_urls if url not in existing_links])
+    except Exception as e:
+        logger.warning(f"⚠️ [{category}] 재시도 대기열 조회 실패 (계속 진행): {e}")
+        blocked = set()
+    if blocked:
+        logger.info(f"⏳ [{category}] 재시도 대기 중인 {len(blocked)}개 건너뜀")
 
     tasks = []      
     meta_info = []  
     processed_in_this_run = set()
-    pinned_count = 0  # 필독 공지 카운트
-
-    # 기존 공지사항의 필독 상태 업데이트
-    updated_count = 0
-    for url, data in candidates_map.items():
-        if url in existing_notices:
-            existing_notice = existing_notices[url]
-            new_is_pinned = data["is_pinned"]
-            old_is_pinned = existing_notice.is_pinned
-            if old_is_pinned != new_is_pinned:
-                existing_notice.is_pinned = new_is_pinned
-                updated_count += 1
-        if data["is_pinned"]:
-            pinned_count += 1
 
     # 신규 공지사항 처리
     for url, data in candidates_map.items():
-        if url in existing_links or url in processed_in_this_run: continue
+        if url in existing_links or url in blocked or url in processed_in_this_run: continue
         processed_in_this_run.add(url)
         is_pinned_flag = data.get("is_pinned", False)
-        tasks.append(safe_scrape_with_semaphore(url))
+        tasks.append(scrape_detail(url))
         meta_info.append({"list_title": data.get("title", ""), "is_pinned": bool(is_pinned_flag), "detail_url": url, "category": category})
-    
-    if updated_count > 0:
+
+    # 필독 상태 재정리: 목록의 필독 집합과 DB를 UPDATE 두 번으로 맞추고 바뀐 행만 로그
+    # (필독 집합이 지난 스윕과 같으면 바뀔 것이 없으므로 생략)
+    pins_ok = True
+    if reconcile_pins:
+        pinned_urls = [url for url, data in candidates_map.items() if data["is_pinned"]]
+        if pinned_urls:
+            logger.info(f"📌 [{category}] 총 {len(pinned_urls)}개 필독 공지 감지됨")
         try:
-            await db.commit()
-            logger.info(f"✅ [{category}] 기존 공지 {updated_count}개 필독 상태 업데이트 완료")
+            # 안전장치 - PIN_EXPIRY_DAYS일 이상 된 필독 공지는 목록에 남아 있어도 해제
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=PIN_EXPIRY_DAYS)
+            pinned, unpinned = await bulk.reconcile_pins(db, category, pinned_urls, cutoff_date)
+            if pinned or unpinned:
+                await db.commit()
+                response_cache.invalidate(category)
+            for _, title in pinned:
+                logger.info(f"📄→📌 [{category}] 필독 지정: {title[:50]}...")
+            for _, title in unpinned:
+                logger.info(f"📌→📄 [{category}] 필독 해제: {title[:50]}...")
+            if pinned or unpinned:
+                logger.info(f"✅ [{category}] 필독 상태 정리 완료 (지정 {len(pinned)}개, 해제 {len(unpinned)}개)")
         except Exception as e:
             await db.rollback()
-            logger.error(f"🔥 [{category}] 필독 상태 업데이트 실패: {e}")
-    
-    if pinned_count > 0:
-        logger.info(f"📌 [{category}] 총 {pinned_count}개 필독 공지 감지됨")
+            logger.error(f"⚠️ [{category}] 필독 상태 정리 실패: {e}")
+            # 신규 공지 저장은 계속 진행하되, 완료로 보지 않아 필독 다이제스트(워터마크)를 올리지 않음
+            # (올리면 다음 스윕이 필독 집합이 같다고 보고 재정리를 건너뜀)
+            pins_ok = False
 
-    # [추가] 크롤링 목록에 없는 필독 공지 자동 해제 (시간이 지나 목록에서 사라진 필독 공지 처리)
-    try:
-        crawled_urls = set(candidates_map.keys())
-        
-        # 방법 1: 크롤링 목록에 없는 필독 공지 해제
-        stmt_old_pinned = select(Notice).where(
-            Notice.category == category,
-            Notice.is_pinned == True,
-            Notice.link.not_in(crawled_urls) if crawled_urls else Notice.link != ""
-        )
-        result_old_pinned = await db.execute(stmt_old_pinned)
-        old_pinned_notices = result_old_pinned.scalars().all()
-        
-        unpinned_count = 0
-        for notice in old_pinned_notices:
-            notice.is_pinned = False
-            unpinned_count += 1
-            logger.info(f"📌→📄 [{category}] 필독 해제: {notice.title[:50]}...")
-        
-        # 방법 2: 안전장치 - 30일 이상 된 필독 공지 자동 해제
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=30)
-        stmt_expired = select(Notice).where(
-            Notice.category == category,
-            Notice.is_pinned == True,
-            Notice.crawled_at < cutoff_date
-        )
-        result_expired = await db.execute(stmt_expired)
-        expired_notices = result_expired.scalars().all()
-        
-        expired_count = 0
-        for notice in expired_notices:
-            if notice not in old_pinned_notices:  # 중복 방지
-                notice.is_pinned = False
-                expired_count += 1
-                logger.info(f"⏰ [{category}] 오래된 필독 자동 해제 (30일+): {notice.title[:50]}...")
-        
-        total_unpinned = unpinned_count + expired_count
-        if total_unpinned > 0:
-            await db.commit()
-            logger.info(f"✅ [{category}] {total_unpinned}개 필독 공지 자동 해제 완료 (목록 밖: {unpinned_count}, 기한 만료: {expired_count})")
-    except Exception as e:
-        logger.error(f"⚠️ [{category}] 필독 자동 해제 실패: {e}")
-        # 실패해도 크롤링은 계속 진행
-
-    if not tasks: return
+    if not tasks: return pins_ok
 
     logger.info(f"🚀 [{category}] {len(tasks)}개 신규 상세 수집 시작")
     results = await asyncio.gather(*tasks, return_exceptions=True)
-    new_notices_buffer = [] 
+    new_rows: List[Dict[str, Any]] = []
+    failures: List[Dict[str, Any]] = []
     
     for i, result in enumerate(results):
-        if isinstance(result, Exception) or not result: 
-            continue
-        
         if i >= len(meta_info):
             logger.error(f"🔥 [{category}] 인덱스 불일치: result 인덱스 {i} >= meta_info 길이 {len(meta_info)}")
             continue
+
+        if isinstance(result, Exception) or not result: 
+            failures.append(_failure(meta_info[i], result))
+            continue
             
         scraped_data = cast(Dict[str, Any], result)
-        meta = meta_info[i]
-        
-        final_title = str(scraped_data.get("title") or meta["list_title"])
-        content_lines = scraped_data.get("texts", [])
-        final_content = "\n\n".join(content_lines) if isinstance(content_lines, list) else ""
-        is_pinned_value = meta.get("is_pinned", False)
-        
-        new_notice = Notice(
-            title=final_title,
-            link=meta["detail_url"],
-            date=scraped_data.get("date"),
-            content=final_content,
-            images=scraped_data.get("images", []),
-            files=scraped_data.get("files", []),
-            category=meta["category"],
-            univ_views=scraped_data.get("univ_views", 0),
-            app_views=0,
-            is_pinned=is_pinned_value # [추가] 필독 여부 저장
-        )
+        row = build_notice_row(scraped_data, meta_info[i])
         
-        if is_pinned_value:
-            logger.info(f"📌 [{category}] 필독 공지 저장: {final_title[:60]}...")
+        if row["is_pinned"]:
+            logger.info(f"📌 [{category}] 필독 공지 저장: {row['title'][:60]}...")
         
-        db.add(new_notice)
-        new_notices_buffer.append(new_notice)
+        new_rows.append(row)
 
-    if new_notices_buffer:
+    if new_rows and await _save_rows(db, category, new_rows) is None:
+        return False
+
+    # 실패한 상세 수집은 재시도 대기열에 넘김 (기록되면 이번 스윕은 완료로 보고 워터마크를 올림)
+    if failures:
         try:
+            await crawl_retry.record_failures(db, failures)
             await db.commit()
-            logger.info(f"✅ [{category}] {len(new_notices_buffer)}개 저장 완료")
-            
-            if category in NOTIFICATION_TARGET_CATEGORIES:
-                await send_keyword_notifications(db, new_notices_buffer)
+            logger.warning(f"⏳ [{category}] 상세 수집 실패 {len(failures)}개 재시도 대기열에 등록")
         except Exception as e:
             await db.rollback()
-            logger.error(f"🔥 DB 커밋 실패: {e}")
+            logger.error(f"🔥 [{category}] 재시도 대기열 등록 실패: {e}")
+            return False
+
+    return pins_ok
+
+
+def _failure(meta: Dict[str, Any], result: Any) -> Dict[str, Any]:
+    """상세 수집 실패를 재시도 대기열 기록 형식으로 만듭니다."""
+    return {
+        "url": meta["detail_url"],
+        "category": meta["category"],
+        "list_title": meta.get("list_title"),
+        "is_pinned": bool(meta.get("is_pinned", False)),
+        "error": repr(result) if isinstance(result, Exception) else "상세 페이지 수집/파싱 실패",
+    }
+
+
+async def _save_rows(
+    db: AsyncSession, category: str, rows: List[Dict[str, Any]], notify: bool = True
+) -> Optional[List[Tuple[int, str]]]:
+    """
+    새 공지를 저장(+ 알림 대기열 등록)하고 커밋합니다. 새로 저장된 (id, link) 목록, 실패하면 None을 반환합니다.
+    notify=False(백필로 찾은 과거 공지)는 알림 대기열에 넣지 않습니다.
+    """
+    notify = notify and category in NOTIFICATION_TARGET_CATEGORIES
+    try:
+        # 상세 조회 API 등 다른 경로가 먼저 저장한 공지는 건너뛰고 나머지만 저장
+        saved = await bulk.insert_notices(db, rows)
+        if saved and notify:
+            # 알림은 같은 트랜잭션에서 대기열에만 넣고, 발송은 push_outbox 워커가 처리
+            await bulk.enqueue_notifications(db, [notice_id for notice_id, _ in saved])
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.error(f"🔥 DB 커밋 실패: {e}")
+        return None
+
+    if saved:
+        notice_counts.invalidate(category)
+        response_cache.invalidate(category)
+        if notify:
+            push_outbox.notify()
+    skipped = len(rows) - len(saved)
+    logger.info(f"✅ [{category}] {len(saved)}개 저장 완료" + (f" (이미 저장된 {skipped}개 건너뜀)" if skipped else ""))
+    return saved
+
+
+async def retry_failed_details() -> int:
+    """
+    [스케줄러] 재시도할 때가 된 상세 수집 실패를 다시 수집해 저장합니다. 저장에 성공한 공지 수를 반환합니다.
+    성공/이미 저장된 URL은 대기열에서 지우고, 다시 실패하면 백오프를 늘립니다.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            entries = await crawl_retry.due(db)
+            if not entries:
+                return 0
+
+            # 그사이 다른 경로(상세 조회 API 등)로 저장된 공지는 재시도하지 않고 정리
+            keys = [(entry.url, entry.category) for entry in entries]
+            result = await db.execute(
+                select(Notice.link, Notice.category).where(tuple_(Notice.link, Notice.category).in_(keys))
+            )
+            stored = {(row[0], row[1]) for row in result.all()}
+            pending = [entry for entry in entries if (entry.url, entry.category) not in stored]
+            await db.commit()  # 수집을 기다리는 동안 읽기 트랜잭션을 잡고 있지 않음
 
+            logger.info(f"🔁 상세 수집 재시도 {len(pending)}개")
+            results = await asyncio.gather(
+                *(scrape_detail(entry.url) for entry in pending), return_exceptions=True
+            )
 
-async def safe_scrape_with_semaphore(url: str):
-    async with SCRAPE_SEMAPHORE:
-        await asyncio.sleep(0.5) 
-        return await scrape_notice_content(url)
+            rows_by_target: Dict[Tuple[str, bool], List[Dict[str, Any]]] = {}
+            failures: List[Dict[str, Any]] = []
+            for entry, result in zip(pending, results):
+                meta = {
+                    "list_title": entry.list_title or "",
+                    "is_pinned": bool(entry.is_pinned),
+                    "detail_url": entry.url,
+                    "category": entry.category,
+                }
+                if isinstance(result, Exception) or not result:
+                    failures.append(_failure(meta, result))
+                    continue
+                rows_by_target.setdefault((entry.category, entry.notify is not False), []).append(
+                    build_notice_row(cast(Dict[str, Any], result), meta)
+                )
+
+            saved_count = 0
+            recovered = set(stored)
+            for (category, notify), rows in rows_by_target.items():
+                saved = await _save_rows(db, category, rows, notify=notify)
+                if saved is None:
+                    continue  # 저장 실패: 기록을 그대로 두어 다음 주기에 다시 시도
+                saved_count += len(saved)
+                recovered.update((row["link"], category) for row in rows)
+
+            await crawl_retry.resolve(db, list(recovered))
+            await crawl_retry.record_failures(db, failures)
+            await db.commit()
+            if pending:
+                logger.info(f"🔁 상세 수집 재시도 결과: 복구 {len(recovered) - len(stored)}개, 실패 {len(failures)}개")
+            return saved_count
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"⚠️ 상세 수집 재시도 실패: {e}")
+            return 0
+
+
+def build_notice_row(scraped_data: Dict[str, Any], meta: Dict[str, Any]) -> Dict[str, Any]:
+    """상세 수집 결과와 목록 메타 정보(list_title, is_pinned, detail_url, category)로 notices 행을 만듭니다."""
+    content_lines = scraped_data.get("texts", [])
+    return {
+        "title": str(scraped_data.get("title") or meta["list_title"]),
+        "link": meta["detail_url"],
+        "date": scraped_data.get("date"),
+        "content": "\n\n".join(content_lines) if isinstance(content_lines, list) else "",
+        "images": scraped_data.get("images", []),
+        "files": scraped_data.get("files", []),
+        "category": meta["category"],
+        "univ_views": scraped_data.get("univ_views", 0),
+        "app_views": 0,
+        "is_pinned": bool(meta.get("is_pinned", False)), # [추가] 필독 여부 저장
+        "is_notified": False,
+        "crawled_at": datetime.now(timezone.utc),
+    }
+
+
+async def scrape_detail(url: str):
+    """
+    상세 페이지 수집. 동시 요청 수와 간격은 request_get의 호스트별 제한(동시 요청 수 + AIMD 속도)이 맞춥니다.
+    (전역 세마포어를 두면 느린 호스트를 기다리는 요청이 자리를 차지해 다른 호스트까지 막힘)
+    """
+    return await scrape_notice_content(url)
+
+
+def order_notice_feed(stmt, sort_by: str = "date"):
+    """목록 정렬(필독 우선)을 적용합니다. 정렬: is_pinned DESC, (date DESC NULLS LAST | univ_views DESC), id DESC"""
+    if sort_by == "views":
+        return stmt.order_by(Notice.is_pinned.desc(), Notice.univ_views.desc(), Notice.id.desc())
+    return stmt.order_by(Notice.is_pinned.desc(), Notice.date.desc().nulls_last(), Notice.id.desc())
+
+
+def _feed_segments(sort_by: str, cursor: Dict[str, Any]) -> List[Any]:
+    """
+    cursor 다음 행들을 정렬 순서대로 나눈 구간별 조건.
+    목록은 (필독, 키 있음) → (필독, 키 NULL) → (일반, 키 있음) → (일반, 키 NULL) 네 구간으로 이어지고
+    각 구간은 피드 인덱스의 연속 범위이므로 조건마다 범위 검색 한 번으로 읽힙니다.
+    (행 값 비교와 NULL 조건을 OR로 묶으면 SQLite/PostgreSQL 모두 범위 검색을 못 씀)
+    """
+    key_col = Notice.univ_views if sort_by == "views" else Notice.date
+    key, last_id, pinned = cursor["key"], cursor["id"], bool(cursor["is_pinned"])
+
+    segments = []
+    for group in ((True, False) if pinned else (False,)):
+        same = group == pinned
+        if not (same and key is None):
+            # 키가 있는 행: 행 값 비교는 키가 NULL인 행을 자연히 제외함
+            position = tuple_(key_col, Notice.id) < tuple_(key, last_id) if same else key_col.is_not(None)
+            segments.append(and_(Notice.is_pinned == group, position))
+        null_rows = and_(Notice.is_pinned == group, key_col.is_(None))
+        segments.append(and_(null_rows, Notice.id < last_id) if same and key is None else null_rows)
+    return segments
+
+
+async def fetch_notice_feed(
+    db: AsyncSession, stmt, sort_by: str = "date", cursor: Optional[Dict[str, Any]] = None,
+    limit: int = 20, skip: int = 0,
+) -> List[Notice]:
+    """
+    stmt(조건만 붙은 select(Notice))에 목록 정렬을 적용해 한 페이지를 읽습니다.
+    cursor가 있으면 skip 대신 그 행 다음부터, 구간별로 페이지가 찰 때까지 이어 읽습니다. (보통 쿼리 한 번)
+    """
+    if cursor is None:
+        result = await db.execute(order_notice_feed(stmt, sort_by).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    rows: List[Notice] = []
+    for segment in _feed_segments(sort_by, cursor):
+        result = await db.execute(order_notice_feed(stmt.where(segment), sort_by).limit(limit - len(rows)))
+        rows.extend(result.scalars().all())
+        if len(rows) >= limit:
+            break
+    return rows
 
 
 async def search_notices(
@@ -396,24 +663,18 @@ async def search_notices(
     query: Optional[str] = None, 
     skip: int = 0, 
     limit: int = 20, 
-    sort_by: str = "date"
+    sort_by: str = "date",
+    cursor: Optional[Dict[str, Any]] = None,
 ):
-    """공지사항 검색 및 조회 (API용) - 필독 우선 정렬 적용"""
+    """공지사항 검색 및 조회 (API용) - 필독 우선 정렬 적용. cursor가 있으면 skip 대신 키셋으로 이어 읽습니다."""
     stmt = select(Notice)
     if category != "all":
         stmt = stmt.where(Notice.category == category)
     if query:
-        stmt = stmt.where(Notice.title.like(f"%{query}%"))
+        stmt = stmt.where(search_index.match_clause(query, title_only=True))
     
     # [수정] 1순위: 필독(is_pinned), 2순위: 날짜(date), 3순위: ID
-    if sort_by == "views":
-        stmt = stmt.order_by(Notice.is_pinned.desc(), Notice.univ_views.desc())
-    else:
-        stmt = stmt.order_by(Notice.is_pinned.desc(), Notice.date.desc().nulls_last(), Notice.id.desc())
-        
-    stmt = stmt.offset(skip).limit(limit)
-    result = await db.execute(stmt)
-    return result.scalars().all()
+    return await fetch_notice_feed(db, stmt, sort_by, cursor, limit=limit, skip=skip)
 
 # ... (기존 get_or_create_summary 함수 유지)
 
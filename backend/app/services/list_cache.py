@@ -0,0 +1,71 @@
+# app/services/list_cache.py
+"""
+게시판 목록 페이지 캐시
+
+카테고리별로 ETag / Last-Modified와 목록 영역(div.tbody > ul) 다이제스트를 기억해
+- 서버가 조건부 요청을 지원하면 304로,
+- 지원하지 않으면 다이제스트 비교로
+변경 없는 목록의 파싱과 DB 조회를 건너뜁니다.
+
+새 상태는 stage()로 올려두었다가 목록 처리가 끝까지 성공했을 때만 commit()으로 확정합니다.
+(상세 수집이 일부 실패했는데 다이제스트를 저장하면 다음 스윕에서 영영 건너뛰게 되므로)
+"""
+import hashlib
+import time
+from typing import Dict, Iterable, Optional, Any
+
+from app.core.logger import get_logger
+
+logger = get_logger()
+
+
+class ListPageState:
+    def __init__(self, etag: Optional[str] = None, last_modified: Optional[str] = None, digest: Optional[str] = None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.digest = digest
+        self.updated_at = time.time()
+
+
+_committed: Dict[str, ListPageState] = {}
+_staged: Dict[str, ListPageState] = {}
+_stats: Dict[str, int] = {"not_modified": 0, "digest_match": 0, "changed": 0}
+
+
+def get_state(category: str) -> Optional[ListPageState]:
+    return _committed.get(category)
+
+
+def compute_digest(parts: Iterable[str]) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8", "ignore"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def is_unchanged(category: str, digest: str) -> bool:
+    state = _committed.get(category)
+    return bool(state and state.digest and state.digest == digest)
+
+
+def stage(category: str, etag: Optional[str], last_modified: Optional[str], digest: Optional[str]):
+    _staged[category] = ListPageState(etag, last_modified, digest)
+
+
+def commit(category: str):
+    state = _staged.pop(category, None)
+    if state is not None:
+        _committed[category] = state
+
+
+def discard(category: str):
+    _staged.pop(category, None)
+
+
+def record(outcome: str):
+    _stats[outcome] = _stats.get(outcome, 0) + 1
+
+
+def get_stats() -> Dict[str, Any]:
+    return {**_stats, "categories": len(_committed)}
@@ -0,0 +1,42 @@
+# app/services/notice_counts.py
+"""
+카테고리별 공지 개수 캐시
+
+목록 API가 페이지마다 같은 조건으로 count(*)를 다시 세지 않도록
+카테고리("all" 포함)별 개수를 TTL 동안 메모리에 보관합니다.
+공지가 새로 저장되거나 삭제되면 invalidate()로 해당 카테고리와 "all"을 비웁니다.
+"""
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import Notice
+
+NOTICE_COUNT_CACHE_TTL = float(os.getenv("NOTICE_COUNT_CACHE_TTL", "300"))
+
+_counts: Dict[str, Tuple[int, float]] = {}
+
+
+async def get_count(db: AsyncSession, category: str = "all") -> int:
+    cached = _counts.get(category)
+    if cached and time.monotonic() - cached[1] < NOTICE_COUNT_CACHE_TTL:
+        return cached[0]
+
+    stmt = select(func.count(Notice.id))
+    if category != "all":
+        stmt = stmt.where(Notice.category == category)
+    total = int((await db.execute(stmt)).scalar() or 0)
+    _counts[category] = (total, time.monotonic())
+    return total
+
+
+def invalidate(category: Optional[str] = None):
+    """category가 없으면 전부 비웁니다."""
+    if category is None:
+        _counts.clear()
+        return
+    _counts.pop(category, None)
+    _counts.pop("all", None)
@@ -1,16 +1,20 @@
 # app/services/notification_service.py
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
-from sqlalchemy.orm import selectinload
-from app.database.models import Device, Keyword, Notice, NotificationHistory
+from sqlalchemy import select, delete, tuple_
+from app.database import bulk
+from app.database.models import Device, Keyword, Notice, NotificationHistory, device_keywords
 from app.core.logger import get_logger
+from app.services import device_cache, push_dispatcher, scrap_membership
 from collections import defaultdict
+from typing import Any, AsyncIterator, Dict, List, Tuple
 import os
 import asyncio
-import httpx # [추가] HTTP 요청용 (Expo API 호출)
 
 logger = get_logger()
-EXPO_PUSH_API_URL = "https://exp.host/--/api/v2/push/send"
+# 배치 재시도가 모두 실패해 나중에 다시 보내야 하는 티켓 오류
+RETRYABLE_TICKET_ERRORS = {"DispatchFailed", "MessageRateExceeded"}
+# 구독자를 한 번에 읽어 올 행 수 (메모리 사용량 상한)
+FANOUT_CHUNK_SIZE = max(1, int(os.getenv("FANOUT_CHUNK_SIZE", "2000")))
 
 # ---------------------------------------------------------
 # [헬퍼 함수] 유효하지 않은 토큰 DB 삭제
@@ -23,25 +27,30 @@ async def remove_invalid_tokens(db: AsyncSession, tokens_to_remove: list):
         stmt = delete(Device).where(Device.token.in_(tokens_to_remove))
         await db.execute(stmt)
         await db.commit()
+        scrap_membership.forget_devices(device_cache.forget(tokens_to_remove))
         logger.info(f"🗑️ 유효하지 않은 토큰 {len(tokens_to_remove)}개 삭제 완료")
     except Exception as e:
         logger.error(f"❌ 토큰 삭제 중 오류 발생: {e}")
         await db.rollback()
 
+def _empty_report() -> Dict[str, Any]:
+    return {"messages": 0, "sent": 0, "failed": 0, "retryable": 0, "invalid_tokens": 0}
+
 # ---------------------------------------------------------
 # [핵심 로직] 키워드 기반 알림 발송
 # ---------------------------------------------------------
-async def send_keyword_notifications(db: AsyncSession, new_notices: list):
+async def send_keyword_notifications(db: AsyncSession, new_notices: list) -> Dict[str, Any]:
     """
     [개선된 알림 로직]
     1. is_notified 플래그 활용 (중복 방지)
     2. NotificationHistory 테이블로 발송 이력 추적
-    3. 배치 처리 최적화
-    4. 에러 핸들링 강화
+    3. 구독자는 device_keywords에서 청크 단위로 읽고 메시지는 전송 직전에 생성 (메모리 일정)
+    4. 배치는 push_dispatcher로 동시 전송 (재시도/백오프 포함)
+    반환: 발송 요약 (retryable > 0 이면 is_notified를 표시하지 않았으므로 나중에 다시 호출해야 함)
     """
     if not new_notices:
         logger.info("⏭️ 알림 건너뛰기: 공지 없음")
-        return
+        return _empty_report()
 
     # ============================================================
     # 1단계: 알림이 아직 발송되지 않은 공지만 필터링
@@ -50,174 +59,113 @@ async def send_keyword_notifications(db: AsyncSession, new_notices: list):
     
     if not unnotified_items:
         logger.info("✅ 모든 공지가 이미 알림 발송됨")
-        return
+        return _empty_report()
     
     logger.info(f"📬 알림 대상 공지: {len(unnotified_items)}개")
 
     # ============================================================
-    # 2단계: 카테고리별 구독자 조회
+    # 2단계: 알림 대상 카테고리별 공지 묶기
     # ============================================================
-    target_categories = {n.category for n in unnotified_items if n.category}
+    notices_by_category: Dict[str, list] = defaultdict(list)
+    for notice in unnotified_items:
+        # ID가 없는 공지는 건너뛰기
+        if not getattr(notice, 'id', None):
+            logger.warning(f"⚠️ 공지 ID 없음, 알림 스킵: {notice.title[:30]}")
+            continue
+        if notice.category:
+            notices_by_category[notice.category].append(notice)
     
-    if not target_categories:
+    if not notices_by_category:
         logger.warning("⚠️ 알림 대상 카테고리 없음")
-        return
-    
-    try:
-        stmt = (
-            select(Keyword)
-            .where(Keyword.word.in_(target_categories))
-            .options(selectinload(Keyword.subscribed_devices))
-        )
-        result = await db.execute(stmt)
-        active_keywords = result.scalars().all()
-    except Exception as e:
-        logger.error(f"❌ 구독 조회 실패: {e}")
-        return
-
-    # 카테고리별 구독자 토큰 매핑
-    category_subscribers = defaultdict(list)
-    for kw_obj in active_keywords:
-        for device in kw_obj.subscribed_devices:
-            category_subscribers[kw_obj.word].append({
-                "token": device.token,
-                "device_id": device.id
-            })
+        return _empty_report()
 
     # ============================================================
     # 3단계: 발송 이력 조회 (중복 방지 강화)
     # ============================================================
-    notice_ids = [n.id for n in unnotified_items if hasattr(n, 'id') and n.id]
+    notice_ids = [n.id for notices in notices_by_category.values() for n in notices]
     already_sent = set()
     
-    if notice_ids:
-        try:
-            history_stmt = select(
-                NotificationHistory.device_id,
-                NotificationHistory.notice_id
-            ).where(NotificationHistory.notice_id.in_(notice_ids))
-            
-            history_result = await db.execute(history_stmt)
-            already_sent = {
-                (row.device_id, row.notice_id) 
-                for row in history_result.all()
-            }
-            
-            if already_sent:
-                logger.info(f"🔄 이미 발송된 알림 {len(already_sent)}건 스킵")
-        except Exception as e:
-            logger.warning(f"⚠️ 발송 이력 조회 실패 (계속 진행): {e}")
-
-    # ============================================================
-    # 4단계: 메시지 생성 (중복 제거 강화)
-    # ============================================================
-    messages_to_send = []
-    notification_records = []  # DB 저장용
-    
-    for notice in unnotified_items:
-        # ID가 없는 공지는 건너뛰기
-        if not hasattr(notice, 'id') or not notice.id:
-            logger.warning(f"⚠️ 공지 ID 없음, 알림 스킵: {notice.title[:30]}")
-            continue
-            
-        subscribers = category_subscribers.get(notice.category, [])
-        
-        if not subscribers:
-            logger.info(f"ℹ️ [{notice.category}] 구독자 없음: {notice.title[:30]}")
-            continue
+    try:
+        history_stmt = select(
+            NotificationHistory.device_id,
+            NotificationHistory.notice_id
+        ).where(NotificationHistory.notice_id.in_(notice_ids))
         
-        for sub in subscribers:
-            device_id = sub["device_id"]
-            token = sub["token"]
-            
-            # 중복 체크: 이미 발송된 조합은 건너뛰기
-            if (device_id, notice.id) in already_sent:
-                continue
-            
-            # [수정] Expo Push API 포맷으로 메시지 생성
-            messages_to_send.append({
-                "to": token,
-                "title": f"🔔 [{notice.category}] 새 공지",
-                "body": notice.title[:100],
-                "data": {
-                    "url": str(notice.link),
-                    "id": str(notice.id),
-                    "category": str(notice.category)
-                },
-                "sound": "default",
-                "badge": 1
-            })
-            
-            # 발송 이력 기록 준비
-            notification_records.append({
-                "device_id": device_id,
-                "notice_id": notice.id
-            })
-            
-            # 중복 방지를 위해 이번 배치에서도 추가
-            already_sent.add((device_id, notice.id))
+        history_result = await db.execute(history_stmt)
+        already_sent = {
+            (row.device_id, row.notice_id) 
+            for row in history_result.all()
+        }
         
-        # is_notified 플래그 업데이트
-        notice.is_notified = True
+        if already_sent:
+            logger.info(f"🔄 이미 발송된 알림 {len(already_sent)}건 스킵")
+    except Exception as e:
+        logger.warning(f"⚠️ 발송 이력 조회 실패 (계속 진행): {e}")
 
     # ============================================================
-    # 5단계: 메시지 일괄 전송
+    # 4단계: 구독자를 청크 단위로 읽으며 메시지를 만들어 바로 전송
+    # (구독자 전체나 메시지 전체를 메모리에 올리지 않음)
     # ============================================================
-    if not messages_to_send:
-        logger.info("ℹ️ 발송할 메시지 없음 (모두 중복 또는 구독자 없음)")
+    messages = _iter_messages(
+        _iter_subscribers(db, list(notices_by_category.keys())), notices_by_category, already_sent
+    )
+
+    totals = {"sent": 0, "failed": 0, "retryable": 0}
+    invalid_tokens: List[str] = []
+    history: List[Dict[str, int]] = []
+
+    async def flush_history():
+        """
+        배치 하나의 발송 이력을 저장하고 커밋.
+        여러 배치를 모았다가 저장하면 그사이 프로세스가 죽었을 때 이미 보낸 알림이 이력에 없어 다시 발송됨
+        """
+        if not history:
+            return
+        records = list(history)
+        history.clear()
         try:
-            await db.commit()  # is_notified 플래그는 저장
-        except:
+            await bulk.insert_notification_history(db, records)
+            await db.commit()
+        except Exception as e:
             await db.rollback()
-        return
+            logger.error(f"❌ 발송 이력 저장 실패 ({len(records)}건): {e}")
 
-    batch_size = 500
-    loop = asyncio.get_running_loop()
-    total_sent = 0
-    total_failed = 0
-    invalid_tokens = []
-    
-    logger.info(f"🚀 알림 전송 시작: {len(messages_to_send)}건")
+    async def on_result(batch: List[Tuple[Dict[str, Any], Dict[str, int]]], tickets: List[Dict[str, Any]]):
+        """배치 하나의 티켓 처리: 성공한 발송 이력 수집, 등록 해제 토큰 수집"""
+        for (message, record), ticket in zip(batch, tickets):
+            if ticket.get("status") == "ok":
+                totals["sent"] += 1
+                history.append(record)
+                continue
+            totals["failed"] += 1
+            error = (ticket.get("details") or {}).get("error")
+            if error == "DeviceNotRegistered":
+                # 유효하지 않은 토큰 (앱 삭제 등)
+                invalid_tokens.append(message["to"])
+            elif error in RETRYABLE_TICKET_ERRORS:
+                totals["retryable"] += 1
+        await flush_history()
+
+    try:
+        report = await push_dispatcher.dispatch(messages, on_result)
+    finally:
+        # 전송 도중 실패해도 이미 보낸 이력은 남김 (다시 보낼 때 중복 방지)
+        await flush_history()
 
-    async with httpx.AsyncClient() as client:
-        for i in range(0, len(messages_to_send), batch_size):
-            batch = messages_to_send[i:i + batch_size]
-            batch_records = notification_records[i:i + batch_size]
-            
-            try:
-                # [수정] Expo Push API 호출
-                response = await client.post(EXPO_PUSH_API_URL, json=batch)
-                resp_data = response.json()
-                
-                data_list = resp_data.get("data", [])
-                
-                successful_records = []
-                
-                for idx, item in enumerate(data_list):
-                    status = item.get("status")
-                    if status == "ok":
-                        total_sent += 1
-                        if idx < len(batch_records):
-                            successful_records.append(NotificationHistory(**batch_records[idx]))
-                    else:
-                        total_failed += 1
-                        details = item.get("details", {})
-                        if details.get("error") == "DeviceNotRegistered":
-                            # 유효하지 않은 토큰 (앱 삭제 등)
-                            invalid_token = batch[idx]["to"]
-                            invalid_tokens.append(invalid_token)
-                
-                if successful_records:
-                    db.add_all(successful_records)
-                    
-            except Exception as e:
-                logger.error(f"❌ 배치 전송 중 에러: {e}")
-                total_failed += len(batch)
-    
     # ============================================================
-    # 6단계: 정리 작업
+    # 5단계: 정리 작업
     # ============================================================
     
+    # 일시적인 실패가 남아 있으면 is_notified를 두고 다시 시도할 수 있게 함
+    # (다시 보낼 때 이미 보낸 기기는 발송 이력으로 건너뜀)
+    if totals["retryable"] == 0:
+        for notices in notices_by_category.values():
+            for notice in notices:
+                notice.is_notified = True
+
+    if report["messages"] == 0:
+        logger.info("ℹ️ 발송할 메시지 없음 (모두 중복 또는 구독자 없음)")
+    
     # 유효하지 않은 토큰 삭제
     if invalid_tokens:
         await remove_invalid_tokens(db, invalid_tokens)
@@ -225,15 +173,72 @@ async def send_keyword_notifications(db: AsyncSession, new_notices: list):
     # 최종 커밋
     try:
         await db.commit()
-        logger.info(
-            f"✅ 알림 발송 완료: "
-            f"성공 {total_sent}건, 실패 {total_failed}건, "
-            f"유효하지 않은 토큰 {len(invalid_tokens)}개 삭제"
-        )
+        if report["messages"]:
+            logger.info(
+                f"✅ 알림 발송 완료: "
+                f"성공 {totals['sent']}건, 실패 {totals['failed']}건 (재시도 대상 {totals['retryable']}건), "
+                f"유효하지 않은 토큰 {len(invalid_tokens)}개 삭제, {report['messages_per_sec']}건/초"
+            )
     except Exception as e:
         await db.rollback()
         logger.error(f"❌ 최종 커밋 실패: {e}")
         raise
+    return {**report, **totals, "invalid_tokens": len(invalid_tokens)}
+
+
+async def _iter_subscribers(db: AsyncSession, categories: List[str]) -> AsyncIterator[Tuple[str, int, str]]:
+    """
+    (카테고리, device_id, token)을 device_keywords에서 FANOUT_CHUNK_SIZE개씩 키셋 순서로 읽어 넘깁니다.
+    청크마다 짧은 조회로 끝나므로 전송 중에 읽기 트랜잭션/커서를 붙잡고 있지 않습니다.
+    """
+    last: Tuple[int, int] = (0, 0)
+    while True:
+        stmt = (
+            select(Keyword.word, device_keywords.c.device_id, Device.token, device_keywords.c.keyword_id)
+            .join(Keyword, Keyword.id == device_keywords.c.keyword_id)
+            .join(Device, Device.id == device_keywords.c.device_id)
+            .where(Keyword.word.in_(categories))
+            .where(tuple_(device_keywords.c.device_id, device_keywords.c.keyword_id) > tuple_(*last))
+            .order_by(device_keywords.c.device_id, device_keywords.c.keyword_id)
+            .limit(FANOUT_CHUNK_SIZE)
+        )
+        try:
+            rows = (await db.execute(stmt)).all()
+        except Exception as e:
+            logger.error(f"❌ 구독 조회 실패: {e}")
+            return
+        for word, device_id, token, _ in rows:
+            yield word, device_id, token
+        if len(rows) < FANOUT_CHUNK_SIZE:
+            return
+        last = (rows[-1][1], rows[-1][3])
+
+
+async def _iter_messages(
+    subscribers: AsyncIterator[Tuple[str, int, str]],
+    notices_by_category: Dict[str, list],
+    already_sent: set,
+) -> AsyncIterator[Tuple[Dict[str, Any], Dict[str, int]]]:
+    """구독자 한 명씩 받아 (Expo 메시지, 발송 이력 행)을 필요할 때 만들어 넘깁니다."""
+    async for category, device_id, token in subscribers:
+        for notice in notices_by_category.get(category, []):
+            # 중복 체크: 이미 발송된 조합은 건너뛰기
+            if (device_id, notice.id) in already_sent:
+                continue
+            # [수정] Expo Push API 포맷으로 메시지 생성
+            yield {
+                "to": token,
+                "title": f"🔔 [{notice.category}] 새 공지",
+                "body": notice.title[:100],
+                "data": {
+                    "url": str(notice.link),
+                    "id": str(notice.id),
+                    "category": str(notice.category)
+                },
+                "sound": "default",
+                "badge": 1
+            }, {"device_id": device_id, "notice_id": notice.id}
+
 
 # ---------------------------------------------------------
 # [유틸리티] 특정 기기에 테스트 알림 발송
@@ -248,10 +253,9 @@ async def send_test_notification(token: str, title: str, body: str):
             "sound": "default"
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(EXPO_PUSH_API_URL, json=[message])
-            logger.info(f"✅ 테스트 알림 발송 결과: {response.status_code}")
-            return response.status_code == 200
+        tickets = await push_dispatcher.send_batch([message])
+        logger.info(f"✅ 테스트 알림 발송 결과: {tickets[0]}")
+        return tickets[0].get("status") == "ok"
         
     except Exception as e:
         logger.error(f"❌ 테스트 알림 발송 실패: {e}")
@@ -0,0 +1,267 @@
+# app/services/push_dispatcher.py
+"""
+Expo 푸시 전송기
+
+  - 프로세스에서 공유하는 httpx 클라이언트 하나로 전송 (커넥션 재사용, h2 설치 시 HTTP/2)
+  - 100건 단위 배치를 PUSH_MAX_CONCURRENCY개까지 동시에 전송
+  - 요청 본문은 gzip으로 압축 (Expo가 Content-Encoding: gzip 지원)
+  - 429 / 5xx / 네트워크 오류는 지수 백오프 + 지터로 재시도 (Retry-After가 있으면 우선)
+  - 성공 티켓의 id는 기억해 두었다가 PUSH_RECEIPT_DELAY초 뒤 /push/getReceipts로 영수증을 확인하고,
+    DeviceNotRegistered인 토큰은 기기에서 삭제
+EXPO_API_BASE를 바꾸면 로컬 모의 서버(scripts/mock_expo_server.py)로 보낼 수 있습니다.
+"""
+import asyncio
+import gzip
+import json
+import os
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.http import HTTP2_ENABLED
+from app.core.logger import get_logger
+
+logger = get_logger()
+
+EXPO_API_BASE = os.getenv("EXPO_API_BASE", "https://exp.host/--/api/v2").rstrip("/")
+EXPO_ACCESS_TOKEN = os.getenv("EXPO_ACCESS_TOKEN", "")
+# Expo 권장 최대 배치 크기는 100건
+PUSH_BATCH_SIZE = min(100, max(1, int(os.getenv("PUSH_BATCH_SIZE", "100"))))
+PUSH_MAX_CONCURRENCY = max(1, int(os.getenv("PUSH_MAX_CONCURRENCY", "6")))
+PUSH_MAX_RETRIES = max(0, int(os.getenv("PUSH_MAX_RETRIES", "5")))
+PUSH_TIMEOUT = float(os.getenv("PUSH_TIMEOUT", "15"))
+# 영수증은 발송 후 한참 뒤에 준비되므로 이만큼 지난 티켓만 확인 (Expo 권장: 15분 정도)
+PUSH_RECEIPT_DELAY = float(os.getenv("PUSH_RECEIPT_DELAY", "900"))
+PUSH_RECEIPT_INTERVAL = float(os.getenv("PUSH_RECEIPT_INTERVAL", "60"))
+
+# 재시도 백오프 (초)
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+# 한 번에 조회할 영수증 수 (Expo 상한 1000) / 기억해 둘 티켓 수 상한
+RECEIPT_CHUNK_SIZE = 1000
+MAX_PENDING_RECEIPTS = 200_000
+
+# ([(메시지, 호출자 메타데이터)], 각 메시지의 티켓) → 호출자가 결과를 처리
+ResultHandler = Callable[[List[Tuple[Dict[str, Any], Any]], List[Dict[str, Any]]], Awaitable[None]]
+
+_client: Optional[httpx.AsyncClient] = None
+_receipts: Deque[Tuple[float, str, str]] = deque()  # (발송 시각, 티켓 id, 토큰)
+_receipt_task: Optional[asyncio.Task] = None
+_stats: Dict[str, Any] = {
+    "messages": 0, "ok": 0, "errors": 0, "requests": 0, "retries": 0, "throttled": 0,
+    "receipts_checked": 0, "receipt_errors": 0, "unregistered": 0, "send_seconds": 0.0,
+}
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        headers = {"Accept": "application/json", "Accept-Encoding": "gzip, deflate"}
+        if EXPO_ACCESS_TOKEN:
+            headers["Authorization"] = f"Bearer {EXPO_ACCESS_TOKEN}"
+        _client = httpx.AsyncClient(
+            http2=HTTP2_ENABLED,
+            timeout=PUSH_TIMEOUT,
+            headers=headers,
+            limits=httpx.Limits(max_connections=PUSH_MAX_CONCURRENCY, max_keepalive_connections=PUSH_MAX_CONCURRENCY),
+        )
+    return _client
+
+
+def _backoff(attempt: int, retry_after: Optional[str]) -> float:
+    if retry_after:
+        try:
+            return min(BACKOFF_MAX, float(retry_after))
+        except ValueError:
+            pass
+    # full jitter: 0 ~ base * 2^attempt
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+async def _post(path: str, payload: Any) -> Dict[str, Any]:
+    """gzip 본문으로 POST하고, 429/5xx/네트워크 오류는 백오프 후 재시도합니다. 끝내 실패하면 예외."""
+    body = gzip.compress(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    headers = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    client = _get_client()
+
+    error: Exception = RuntimeError("no attempt")
+    for attempt in range(PUSH_MAX_RETRIES + 1):
+        retry_after = None
+        try:
+            _stats["requests"] += 1
+            response = await client.post(f"{EXPO_API_BASE}{path}", content=body, headers=headers)
+        except httpx.TransportError as e:
+            error = e
+        else:
+            if response.status_code != 429 and response.status_code < 500:
+                # 그 외 4xx는 재시도해도 같으므로 바로 실패
+                response.raise_for_status()
+                return response.json()
+            if response.status_code == 429:
+                _stats["throttled"] += 1
+            retry_after = response.headers.get("retry-after")
+            error = httpx.HTTPStatusError(f"HTTP {response.status_code}", request=response.request, response=response)
+
+        if attempt < PUSH_MAX_RETRIES:
+            _stats["retries"] += 1
+            await asyncio.sleep(_backoff(attempt, retry_after))
+    raise error
+
+
+async def send_batch(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    메시지 배치를 보내고 메시지와 같은 순서의 티켓 목록을 반환합니다.
+    배치 전체가 실패하면 각 메시지에 {"status": "error", "details": {"error": "DispatchFailed"}} 티켓을 채웁니다.
+    """
+    try:
+        result = await _post("/push/send", messages)
+        tickets = list(result.get("data") or [])
+    except Exception as e:
+        logger.error(f"❌ 푸시 배치 전송 실패 ({len(messages)}건): {e}")
+        tickets = []
+
+    # 응답 개수가 모자라면 실패로 채움
+    while len(tickets) < len(messages):
+        tickets.append({"status": "error", "details": {"error": "DispatchFailed"}})
+
+    now = time.monotonic()
+    for message, ticket in zip(messages, tickets):
+        if ticket.get("status") == "ok":
+            _stats["ok"] += 1
+            if ticket.get("id") and len(_receipts) < MAX_PENDING_RECEIPTS:
+                _receipts.append((now, ticket["id"], message["to"]))
+        else:
+            _stats["errors"] += 1
+    _stats["messages"] += len(messages)
+    return tickets
+
+
+async def dispatch(items: AsyncIterator[Tuple[Dict[str, Any], Any]], on_result: ResultHandler) -> Dict[str, Any]:
+    """
+    (메시지, 메타데이터) 스트림을 PUSH_BATCH_SIZE 단위로 묶어 최대 PUSH_MAX_CONCURRENCY개 배치를 동시에 보냅니다.
+    items 순회와 on_result 호출은 모두 이 코루틴 안에서만 일어나므로
+    호출자는 같은 DB 세션을 양쪽에서 사용할 수 있습니다. (동시에 쓰이지 않음)
+    """
+    started = time.perf_counter()
+    pending: set = set()
+    sent = 0
+
+    async def run(batch: List[Tuple[Dict[str, Any], Any]]):
+        return batch, await send_batch([message for message, _ in batch])
+
+    async def drain(return_when: str):
+        nonlocal pending
+        done, pending = await asyncio.wait(pending, return_when=return_when)
+        for task in done:
+            batch, tickets = task.result()
+            await on_result(batch, tickets)
+
+    try:
+        batch: List[Tuple[Dict[str, Any], Any]] = []
+        async for item in items:
+            batch.append(item)
+            if len(batch) < PUSH_BATCH_SIZE:
+                continue
+            if len(pending) >= PUSH_MAX_CONCURRENCY:
+                await drain(asyncio.FIRST_COMPLETED)
+            pending.add(asyncio.create_task(run(batch)))
+            sent += len(batch)
+            batch = []
+        if batch:
+            pending.add(asyncio.create_task(run(batch)))
+            sent += len(batch)
+        while pending:
+            await drain(asyncio.ALL_COMPLETED)
+    finally:
+        for task in pending:
+            task.cancel()
+
+    elapsed = time.perf_counter() - started
+    _stats["send_seconds"] += elapsed
+    return {"messages": sent, "seconds": round(elapsed, 3), "messages_per_sec": round(sent / elapsed, 1) if elapsed > 0 else 0.0}
+
+
+# ============================================================
+# 영수증 확인
+# ============================================================
+def start_receipt_poller():
+    global _receipt_task
+    if _receipt_task is None or _receipt_task.done():
+        _receipt_task = asyncio.create_task(_receipt_loop())
+
+
+async def stop():
+    global _receipt_task, _client
+    if _receipt_task is not None:
+        _receipt_task.cancel()
+        try:
+            await _receipt_task
+        except asyncio.CancelledError:
+            pass
+        _receipt_task = None
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _receipt_loop():
+    while True:
+        await asyncio.sleep(PUSH_RECEIPT_INTERVAL)
+        try:
+            await check_receipts()
+        except Exception as e:
+            logger.error(f"⚠️ [푸시] 영수증 확인 실패: {e}")
+
+
+async def check_receipts(older_than: Optional[float] = None) -> List[str]:
+    """발송 후 older_than초(기본 PUSH_RECEIPT_DELAY)가 지난 티켓의 영수증을 확인하고, 등록 해제된 토큰을 삭제합니다."""
+    delay = PUSH_RECEIPT_DELAY if older_than is None else older_than
+    cutoff = time.monotonic() - delay
+    due: Dict[str, str] = {}
+    while _receipts and _receipts[0][0] <= cutoff:
+        _, ticket_id, token = _receipts.popleft()
+        due[ticket_id] = token
+    if not due:
+        return []
+
+    unregistered: List[str] = []
+    ids = list(due.keys())
+    for i in range(0, len(ids), RECEIPT_CHUNK_SIZE):
+        chunk = ids[i:i + RECEIPT_CHUNK_SIZE]
+        try:
+            result = await _post("/push/getReceipts", {"ids": chunk})
+        except Exception as e:
+            logger.error(f"⚠️ [푸시] 영수증 조회 실패 ({len(chunk)}건): {e}")
+            continue
+        receipts = result.get("data") or {}
+        _stats["receipts_checked"] += len(chunk)
+        for ticket_id, receipt in receipts.items():
+            if receipt.get("status") == "ok":
+                continue
+            _stats["receipt_errors"] += 1
+            if (receipt.get("details") or {}).get("error") == "DeviceNotRegistered" and ticket_id in due:
+                unregistered.append(due[ticket_id])
+
+    if unregistered:
+        _stats["unregistered"] += len(unregistered)
+        # notification_service가 이 모듈을 쓰므로 순환 import를 피해 여기서 불러옴
+        from app.database.database import AsyncSessionLocal
+        from app.services.notification_service import remove_invalid_tokens
+        async with AsyncSessionLocal() as db:
+            await remove_invalid_tokens(db, sorted(set(unregistered)))
+    return unregistered
+
+
+def get_stats() -> Dict[str, Any]:
+    seconds = _stats["send_seconds"]
+    return {
+        **_stats,
+        "send_seconds": round(seconds, 3),
+        "messages_per_sec": round(_stats["messages"] / seconds, 1) if seconds > 0 else 0.0,
+        "pending_receipts": len(_receipts),
+        "api_base": EXPO_API_BASE,
+        "http2": HTTP2_ENABLED,
+    }
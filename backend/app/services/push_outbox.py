@@ -0,0 +1,208 @@
+# app/services/push_outbox.py
+"""
+알림 발송 대기열(outbox) 워커
+
+크롤러는 새 공지를 저장하는 트랜잭션 안에서 notification_outbox에 공지 id만 기록하고 바로 다음 일을 합니다.
+발송은 이 모듈의 워커 PUSH_OUTBOX_WORKERS개가 대기열을 비우며 처리합니다.
+
+  - 최소 1회 발송(at-least-once): 워커가 가져간 행(processing)이 임대 시간(PUSH_OUTBOX_LEASE) 안에
+    끝나지 않으면(서버 재시작 등) 다른 워커가 다시 가져갑니다.
+  - 중복 방지: 다시 처리할 때 이미 보낸 (기기, 공지)는 NotificationHistory로 건너뜁니다.
+  - 일시적 실패(전송 재시도 소진 등)는 attempts에 따라 늦춰서 다시 시도하고,
+    PUSH_OUTBOX_MAX_ATTEMPTS번 실패하면 failed로 남깁니다.
+"""
+import asyncio
+import os
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import load_only
+
+from app.core.logger import get_logger
+from app.database.database import AsyncSessionLocal
+from app.database.models import Notice, NotificationOutbox
+from app.services.notification_service import send_keyword_notifications
+
+logger = get_logger()
+
+PUSH_OUTBOX_WORKERS = max(1, int(os.getenv("PUSH_OUTBOX_WORKERS", "2")))
+PUSH_OUTBOX_POLL_INTERVAL = float(os.getenv("PUSH_OUTBOX_POLL_INTERVAL", "10"))
+PUSH_OUTBOX_LEASE = float(os.getenv("PUSH_OUTBOX_LEASE", "600"))
+PUSH_OUTBOX_MAX_ATTEMPTS = max(1, int(os.getenv("PUSH_OUTBOX_MAX_ATTEMPTS", "8")))
+# 재시도 지연 (초): 30초 × 2^(attempts-1), 최대 1시간
+RETRY_BASE = 30.0
+RETRY_MAX = 3600.0
+
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+_workers: List[asyncio.Task] = []
+_wakeup: Optional[asyncio.Event] = None
+_stats: Dict[str, int] = {"processed": 0, "retried": 0, "failed": 0, "reclaimed": 0}
+
+
+def _event() -> asyncio.Event:
+    global _wakeup
+    if _wakeup is None:
+        _wakeup = asyncio.Event()
+    return _wakeup
+
+
+def notify():
+    """새 항목이 들어왔음을 워커에 알립니다. (폴링 주기를 기다리지 않음)"""
+    _event().set()
+
+
+def start():
+    if any(not task.done() for task in _workers):
+        return
+    _workers.clear()
+    for n in range(PUSH_OUTBOX_WORKERS):
+        _workers.append(asyncio.create_task(_worker(n)))
+    logger.info(f"📮 알림 대기열 워커 {PUSH_OUTBOX_WORKERS}개 시작")
+
+
+async def stop(timeout: float = 10.0):
+    """워커를 멈춥니다. 처리 중이던 항목은 processing으로 남아 임대 시간이 지나면 다시 처리됩니다."""
+    for task in _workers:
+        task.cancel()
+    if _workers:
+        await asyncio.wait(_workers, timeout=timeout)
+    _workers.clear()
+
+
+async def _worker(n: int):
+    while True:
+        try:
+            job = await _claim()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"⚠️ [알림 대기열] 가져오기 실패: {e}")
+            job = None
+
+        if job is None:
+            wakeup = _event()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=PUSH_OUTBOX_POLL_INTERVAL + random.uniform(0, 1))
+            except asyncio.TimeoutError:
+                pass
+            wakeup.clear()
+            continue
+
+        await _process(*job)
+
+
+async def _claim() -> Optional[Tuple[int, int, int]]:
+    """처리할 항목 하나를 processing으로 바꾸며 가져옵니다. 반환: (outbox id, notice_id, attempts)"""
+    now = datetime.now(timezone.utc)
+    ready = or_(
+        and_(NotificationOutbox.status == STATUS_PENDING, NotificationOutbox.available_at <= now),
+        # 임대 시간이 지난 processing: 처리하던 워커/서버가 사라진 것
+        and_(NotificationOutbox.status == STATUS_PROCESSING,
+             NotificationOutbox.locked_at < now - timedelta(seconds=PUSH_OUTBOX_LEASE)),
+    )
+    async with AsyncSessionLocal() as db:
+        # PostgreSQL은 SKIP LOCKED로 워커끼리 같은 행을 기다리지 않음 (SQLite는 무시되는 절)
+        candidate = (
+            select(NotificationOutbox.id, NotificationOutbox.status)
+            .where(ready)
+            .order_by(NotificationOutbox.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        picked = (await db.execute(candidate)).first()
+        if picked is None:
+            await db.commit()
+            return None
+
+        # 조건을 다시 걸어 두 워커가 같은 행을 동시에 가져가지 못하게 함
+        result = await db.execute(
+            update(NotificationOutbox)
+            .where(and_(NotificationOutbox.id == picked[0], ready))
+            .values(status=STATUS_PROCESSING, locked_at=now, attempts=NotificationOutbox.attempts + 1)
+            .returning(NotificationOutbox.id, NotificationOutbox.notice_id, NotificationOutbox.attempts)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        await db.commit()
+        if row is None:
+            return None
+        if picked[1] == STATUS_PROCESSING:
+            _stats["reclaimed"] += 1
+            logger.warning(f"♻️ [알림 대기열] 임대 만료 항목 재처리: notice {row[1]}")
+        return int(row[0]), int(row[1]), int(row[2])
+
+
+async def _process(outbox_id: int, notice_id: int, attempts: int):
+    error: Optional[str] = None
+    async with AsyncSessionLocal() as db:
+        try:
+            stmt = (
+                select(Notice)
+                .options(load_only(Notice.id, Notice.title, Notice.link, Notice.category, Notice.is_notified))
+                .where(Notice.id == notice_id)
+            )
+            notice = (await db.execute(stmt)).scalars().first()
+            if notice is not None:
+                report = await send_keyword_notifications(db, [notice])
+                if report["retryable"]:
+                    error = f"일시적 전송 실패 {report['retryable']}건"
+        except asyncio.CancelledError:
+            # 종료 중: processing으로 남겨 두면 임대 만료 후 다시 처리됨
+            raise
+        except Exception as e:
+            await db.rollback()
+            error = str(e) or type(e).__name__
+
+    await asyncio.shield(_finish(outbox_id, notice_id, attempts, error))
+
+
+async def _finish(outbox_id: int, notice_id: int, attempts: int, error: Optional[str]):
+    if error is None:
+        values: Dict[str, Any] = {"status": STATUS_DONE, "locked_at": None, "last_error": None}
+        _stats["processed"] += 1
+    elif attempts >= PUSH_OUTBOX_MAX_ATTEMPTS:
+        values = {"status": STATUS_FAILED, "locked_at": None, "last_error": error}
+        _stats["failed"] += 1
+        logger.error(f"❌ [알림 대기열] notice {notice_id} 발송 포기 ({attempts}회 실패): {error}")
+    else:
+        delay = min(RETRY_MAX, RETRY_BASE * (2 ** (attempts - 1)))
+        values = {
+            "status": STATUS_PENDING,
+            "locked_at": None,
+            "last_error": error,
+            "available_at": datetime.now(timezone.utc) + timedelta(seconds=delay),
+        }
+        _stats["retried"] += 1
+        logger.warning(f"🔁 [알림 대기열] notice {notice_id} {delay:.0f}초 후 재시도 ({attempts}회차): {error}")
+
+    async with AsyncSessionLocal() as db:
+        try:
+            await db.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id == outbox_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            logger.error(f"⚠️ [알림 대기열] 상태 저장 실패 (notice {notice_id}): {e}")
+
+
+async def get_status() -> Dict[str, Any]:
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(NotificationOutbox.status, func.count(NotificationOutbox.id)).group_by(NotificationOutbox.status)
+        )
+        counts = {str(row[0]): int(row[1]) for row in result.all()}
+    return {
+        **_stats,
+        "workers": sum(1 for task in _workers if not task.done()),
+        "queue": counts,
+    }
@@ -0,0 +1,133 @@
+# app/services/response_cache.py
+"""
+목록 API 응답 캐시
+
+앱을 열 때마다 /notices?category=...&page=1 이 호출되지만 결과는 크롤러가 새 공지를 커밋할 때만 바뀝니다.
+(category, q, page, size, sort_by, cursor, include_total) 조합별로 직렬화된 응답 본문을 메모리에 보관합니다.
+
+  - TTL(RESPONSE_CACHE_TTL)이 지나면 다시 조회 (조회수 등 크롤링 외 변경분 반영)
+  - 항목 수(RESPONSE_CACHE_MAX_ENTRIES)와 대략적인 크기 합(RESPONSE_CACHE_MAX_BYTES)을 넘으면
+    가장 오래 쓰이지 않은 항목부터 제거 (LRU)
+  - 크롤러가 새 공지를 저장하거나 필독 상태가 바뀌면 invalidate(category)로 해당 카테고리와 "all"을 비움
+캐시된 본문은 기기와 무관하게 공유되므로, 기기별 is_scraped 표시는 꺼낸 뒤 복사본에 덧씌웁니다.
+"""
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.core.logger import get_logger
+from app.utils import http_cache
+
+logger = get_logger()
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "120"))
+RESPONSE_CACHE_MAX_ENTRIES = max(1, int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512")))
+RESPONSE_CACHE_MAX_BYTES = max(1, int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024))))
+
+CacheKey = Tuple[Any, ...]
+
+
+class _Entry:
+    __slots__ = ("body", "size", "stored_at")
+
+    def __init__(self, body: Dict[str, Any], size: int):
+        self.body = body
+        self.size = size
+        self.stored_at = time.monotonic()
+
+
+_entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+_bytes = 0
+_stats: Dict[str, int] = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "invalidations": 0, "too_large": 0}
+
+
+def make_key(category: str, q: Optional[str], page: int, size: int, sort_by: str,
+             cursor: Optional[str], include_total: bool) -> CacheKey:
+    # 첫 칸은 항상 카테고리 (invalidate에서 사용)
+    return (category, (q or "").strip(), page, size, sort_by, cursor or "", include_total)
+
+
+def get(key: CacheKey) -> Optional[Dict[str, Any]]:
+    entry = _entries.get(key)
+    if entry is None:
+        _stats["misses"] += 1
+        return None
+    if time.monotonic() - entry.stored_at >= RESPONSE_CACHE_TTL:
+        _drop(key)
+        _stats["expired"] += 1
+        _stats["misses"] += 1
+        return None
+    _entries.move_to_end(key)
+    _stats["hits"] += 1
+    return entry.body
+
+
+def put(key: CacheKey, body: Dict[str, Any]):
+    """body는 JSON 직렬화 가능한 값이어야 합니다. (jsonable_encoder 결과)"""
+    global _bytes
+    size = len(json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    if size > RESPONSE_CACHE_MAX_BYTES:
+        _stats["too_large"] += 1
+        return
+
+    _drop(key)
+    _entries[key] = _Entry(body, size)
+    _bytes += size
+    while len(_entries) > RESPONSE_CACHE_MAX_ENTRIES or _bytes > RESPONSE_CACHE_MAX_BYTES:
+        oldest = next(iter(_entries))
+        _drop(oldest)
+        _stats["evictions"] += 1
+
+
+def _drop(key: CacheKey):
+    global _bytes
+    entry = _entries.pop(key, None)
+    if entry is not None:
+        _bytes -= entry.size
+
+
+def invalidate(category: Optional[str] = None):
+    """category와 "all" 응답을 비우고 ETag 버전을 올립니다. category가 없으면 전부 비웁니다."""
+    global _bytes
+    _stats["invalidations"] += 1
+    http_cache.bump_version(category)
+    if category is None:
+        _entries.clear()
+        _bytes = 0
+        return
+    targets: Set[str] = {category, "all"}
+    for key in [key for key in _entries if key[0] in targets]:
+        _drop(key)
+
+
+def apply_view_deltas(deltas: Dict[int, int], stored_before: float):
+    """
+    조회수 버퍼가 DB에 반영된 뒤 호출: 캐시된 목록 항목의 app_views에 반영된 증가분을 더합니다.
+    (그대로 두면 버퍼가 비워진 만큼 TTL이 지날 때까지 조회수가 줄어든 것처럼 보임)
+    stored_before 이후에 저장된 본문은 반영 전/후 어느 쪽을 읽었는지 알 수 없으므로 해당 공지가 있으면 버립니다.
+    """
+    for key in list(_entries):
+        entry = _entries[key]
+        items = [item for item in entry.body.get("items") or [] if item.get("id") in deltas]
+        if not items:
+            continue
+        if entry.stored_at >= stored_before:
+            _drop(key)
+            continue
+        for item in items:
+            item["app_views"] = (item.get("app_views") or 0) + deltas[item["id"]]
+
+
+def get_stats() -> Dict[str, Any]:
+    lookups = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_ratio": round(_stats["hits"] / lookups, 4) if lookups else 0.0,
+        "entries": len(_entries),
+        "bytes": _bytes,
+        "max_entries": RESPONSE_CACHE_MAX_ENTRIES,
+        "max_bytes": RESPONSE_CACHE_MAX_BYTES,
+        "ttl": RESPONSE_CACHE_TTL,
+    }
@@ -0,0 +1,121 @@
+# app/services/retention.py
+"""
+오래된 기록 정리 (보존 기간)
+
+계속 쌓이기만 하는 테이블을 보존 기간이 지난 행부터 지웁니다.
+  - notification_history : sent_at 기준 HISTORY_RETENTION_DAYS (발송 중복 확인은 최근 공지에만 필요)
+  - crawl_failures       : created_at 기준 CRAWL_FAILURE_RETENTION_DAYS
+  - notification_outbox  : 끝난(done/failed) 항목, created_at 기준 OUTBOX_RETENTION_DAYS
+
+한 번에 RETENTION_BATCH_SIZE행씩 지우고 배치마다 커밋하므로
+긴 잠금/트랜잭션 없이 크롤링·알림 발송과 함께 돌 수 있습니다. (SQLite는 쓰기 잠금이 하나뿐)
+APScheduler가 RETENTION_INTERVAL_HOURS마다 run()을 실행합니다.
+"""
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import and_, delete, select
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.core.logger import get_logger
+from app.database.database import AsyncSessionLocal
+from app.database.models import CrawlFailureLog, NotificationHistory, NotificationOutbox
+
+logger = get_logger()
+
+# 보존 기간 (일). 0이면 해당 테이블은 정리하지 않음
+HISTORY_RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", "90"))
+CRAWL_FAILURE_RETENTION_DAYS = int(os.getenv("CRAWL_FAILURE_RETENTION_DAYS", "30"))
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+RETENTION_INTERVAL_HOURS = max(1, int(os.getenv("RETENTION_INTERVAL_HOURS", "6")))
+RETENTION_BATCH_SIZE = max(1, int(os.getenv("RETENTION_BATCH_SIZE", "5000")))
+# 배치 사이 쉬는 시간 (초): 다른 쓰기 작업이 끼어들 틈
+RETENTION_BATCH_PAUSE = 0.05
+
+_lock = asyncio.Lock()
+_last_report: Optional[Dict[str, Any]] = None
+
+
+async def _delete_batched(model, condition: ColumnElement) -> int:
+    """condition에 맞는 행을 RETENTION_BATCH_SIZE개씩 지우고 지운 행 수를 반환합니다."""
+    total = 0
+    while True:
+        ids = select(model.id).where(condition).limit(RETENTION_BATCH_SIZE).scalar_subquery()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        deleted = result.rowcount or 0
+        total += deleted
+        if deleted < RETENTION_BATCH_SIZE:
+            return total
+        await asyncio.sleep(RETENTION_BATCH_PAUSE)
+
+
+async def run() -> Dict[str, Any]:
+    """보존 기간이 지난 행을 정리하고 테이블별 삭제 행 수 / 소요 시간을 반환합니다."""
+    global _last_report
+    if _lock.locked():
+        logger.info("⏭️ [정리] 이전 정리 작업이 진행 중이라 건너뜁니다.")
+        return _last_report or {}
+
+    async with _lock:
+        now = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        deleted: Dict[str, int] = {}
+        errors: Dict[str, str] = {}
+
+        targets = []
+        if HISTORY_RETENTION_DAYS > 0:
+            targets.append((
+                "notification_history", NotificationHistory,
+                NotificationHistory.sent_at < now - timedelta(days=HISTORY_RETENTION_DAYS),
+            ))
+        if CRAWL_FAILURE_RETENTION_DAYS > 0:
+            targets.append((
+                "crawl_failures", CrawlFailureLog,
+                CrawlFailureLog.created_at < now - timedelta(days=CRAWL_FAILURE_RETENTION_DAYS),
+            ))
+        if OUTBOX_RETENTION_DAYS > 0:
+            targets.append((
+                "notification_outbox", NotificationOutbox,
+                and_(
+                    NotificationOutbox.status.in_(["done", "failed"]),
+                    NotificationOutbox.created_at < now - timedelta(days=OUTBOX_RETENTION_DAYS),
+                ),
+            ))
+
+        for name, model, condition in targets:
+            try:
+                deleted[name] = await _delete_batched(model, condition)
+            except Exception as e:
+                errors[name] = str(e)
+                logger.error(f"⚠️ [정리] {name} 정리 실패: {e}")
+
+        elapsed = time.perf_counter() - started
+        _last_report = {
+            "finished_at": now.isoformat(),
+            "deleted": deleted,
+            "errors": errors,
+            "seconds": round(elapsed, 3),
+        }
+
+    if any(deleted.values()):
+        summary = ", ".join(f"{name} {count}건" for name, count in deleted.items() if count)
+        logger.info(f"🧹 [정리] 보존 기간 지난 기록 삭제: {summary} ({elapsed:.2f}초)")
+    return _last_report
+
+
+def get_stats() -> Dict[str, Any]:
+    return {
+        "retention_days": {
+            "notification_history": HISTORY_RETENTION_DAYS,
+            "crawl_failures": CRAWL_FAILURE_RETENTION_DAYS,
+            "notification_outbox": OUTBOX_RETENTION_DAYS,
+        },
+        "last_run": _last_report,
+    }
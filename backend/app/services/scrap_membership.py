@@ -0,0 +1,97 @@
+# app/services/scrap_membership.py
+"""
+목록/상세 응답의 스크랩 여부(is_scraped) 조회
+
+페이지마다 Device를 조회하고 기기의 스크랩 전체를 불러오는 대신
+  - 토큰 → device_id 는 device_cache로 찾고
+  - 기기별로 "이 공지를 스크랩했는지"를 아는 만큼 메모리에 기억해 두었다가
+  - 모르는 공지만 notice_id IN (페이지 id들) 로 조회합니다.
+    (scraps의 uix_device_notice (device_id, notice_id) 유니크 인덱스만으로 처리되는 조회)
+스크랩 토글 시 record_toggle()로 해당 칸만 바로 갱신합니다.
+조회가 도는 동안 커밋된 토글이 조회 결과(토글 전 값)로 덮이지 않도록, 토글마다 기기별 세대 번호를 올리고
+세대가 바뀐 조회 결과는 기억하지 않습니다. (다음 요청에서 다시 조회)
+"""
+import os
+from collections import OrderedDict
+from typing import Dict, Iterable, Set
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import Scrap
+
+SCRAP_CACHE_DEVICES = max(1, int(os.getenv("SCRAP_CACHE_DEVICES", "2000")))
+# 기기 하나당 기억할 공지 수 (넘으면 통째로 비우고 다시 채움)
+SCRAP_CACHE_PER_DEVICE = 2000
+
+
+class _DeviceScraps:
+    __slots__ = ("known", "generation")
+
+    def __init__(self):
+        # notice_id → 스크랩 여부
+        self.known: Dict[int, bool] = {}
+        # record_toggle마다 증가
+        self.generation = 0
+
+
+_membership: "OrderedDict[int, _DeviceScraps]" = OrderedDict()
+_stats: Dict[str, int] = {"membership_hits": 0, "membership_queries": 0, "stale_results_dropped": 0}
+
+
+def _device(device_id: int) -> _DeviceScraps:
+    entry = _membership.get(device_id)
+    if entry is None:
+        entry = _DeviceScraps()
+        _membership[device_id] = entry
+        if len(_membership) > SCRAP_CACHE_DEVICES:
+            _membership.popitem(last=False)
+    else:
+        _membership.move_to_end(device_id)
+    return entry
+
+
+async def scraped_ids(db: AsyncSession, device_id: int, notice_ids: Iterable[int]) -> Set[int]:
+    """notice_ids 중 기기가 스크랩한 id 집합"""
+    ids = set(notice_ids)
+    entry = _device(device_id)
+    known = entry.known
+    unknown = [notice_id for notice_id in ids if notice_id not in known]
+    if not unknown:
+        _stats["membership_hits"] += 1
+        return {notice_id for notice_id in ids if known[notice_id]}
+
+    _stats["membership_queries"] += 1
+    generation = entry.generation
+    result = await db.execute(
+        select(Scrap.notice_id).where(and_(Scrap.device_id == device_id, Scrap.notice_id.in_(unknown)))
+    )
+    found = set(result.scalars().all())
+    if entry.generation != generation:
+        # 조회 중에 토글이 커밋됨: 그 값은 record_toggle이 이미 기억했으므로 조회 결과로 덮지 않음
+        _stats["stale_results_dropped"] += 1
+    else:
+        if len(known) + len(unknown) > SCRAP_CACHE_PER_DEVICE:
+            known.clear()
+        for notice_id in unknown:
+            known[notice_id] = notice_id in found
+
+    return {notice_id for notice_id in ids if known.get(notice_id, notice_id in found)}
+
+
+def record_toggle(device_id: int, notice_id: int, scraped: bool):
+    """스크랩 추가/취소가 커밋된 뒤 호출: 기억해 둔 값을 바로 맞춤"""
+    entry = _membership.get(device_id)
+    if entry is not None:
+        entry.generation += 1
+        entry.known[notice_id] = scraped
+
+
+def forget_devices(device_ids: Iterable[int]):
+    """삭제된 기기의 기억을 지웁니다."""
+    for device_id in device_ids:
+        _membership.pop(device_id, None)
+
+
+def get_stats() -> Dict[str, int]:
+    return {**_stats, "membership_devices": len(_membership)}
@@ -1,160 +1,187 @@
 # app/services/scraper.py
-from bs4 import BeautifulSoup
-import httpx
-import os
 from urllib.parse import urljoin
-import re
-from datetime import datetime
 from typing import Dict, Any, Optional
+from app.core.config import get_site_type_for_url
+from app.core.html_parser import HtmlNode, parse_html, remove_nodes
+from app.core.http import CircuitOpenError, request_get
+from app.core.parse_pool import run_parse
+from app.services.extraction_plan import extract_with_plan, parse_date_and_views
 from app.core.logger import get_logger
 
 logger = get_logger()
+SCRAPE_TIMEOUT = 15.0
 
-async def scrape_notice_content(url: str) -> Optional[Dict[str, Any]]:
-    # SSL 검증 설정 (환경 변수로 제어)
-    ssl_verify = os.getenv("SSL_VERIFY", "False").lower() == "true"
-    
+async def scrape_notice_content(url: str, priority: bool = False) -> Optional[Dict[str, Any]]:
+    # 1. 수집: 공유 커넥션 풀 사용 (keep-alive / HTTP/2, 호스트별 동시 요청 제한)
+    #    priority=True는 사용자가 기다리는 상세 조회: 크롤링 속도 제한 대기열을 건너뜀
     try:
-        async with httpx.AsyncClient(verify=ssl_verify, timeout=15.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
+        response = await request_get(url, timeout=SCRAPE_TIMEOUT, priority=priority)
+        response.raise_for_status()
+    except CircuitOpenError:
+        # 호스트가 응답하지 않는 중: 타임아웃을 기다리지 않고 바로 실패 (재시도 대기열로 넘어감)
+        logger.warning(f"⛔ 회로 열림, 수집 생략 ({url})")
+        return None
     except Exception as e:
         logger.error(f"❌ 접속 실패 ({url}): {e}")
         return None
     
+    # 2. 파싱: 이벤트 루프를 막지 않도록 파싱 실행기(프로세스 풀)에서 수행
     try:
-        soup = BeautifulSoup(response.text, 'html.parser')
-        data = {
-            "title": "", "date": None, "texts": [], 
-            "images": [], "files": [], "univ_views": 0
-        }
+        return await run_parse(parse_notice_page, response.content, response.encoding, url)
+    except Exception as e:
+        logger.error(f"❌ 파싱 로직 에러 ({url}): {e}")
+        return None
+
 
-        # -----------------------------------------------------------
-        # 1. 제목 추출
-        # -----------------------------------------------------------
-        title_tag = (
-            soup.select_one('.board-view-title') or # [New] 대플
-            soup.select_one('.sponge-page-guide h4') or 
-            soup.select_one('.sponge-page-title-section h3') or
-            soup.select_one('.subject') or 
-            soup.select_one('h3.title') or 
-            soup.select_one('h4.title') or
-            soup.select_one('.tblw_subj') or 
-            soup.select_one('.bo_v_tit') or
-            soup.select_one('.view_title')
-        )
+def parse_notice_page(content: bytes, encoding: Optional[str], url: str) -> Dict[str, Any]:
+    """수집한 바이트를 파싱해 일반 dict로 반환합니다. (워커 프로세스에서 실행 가능)"""
+    markup = content.decode(encoding or "utf-8", errors="replace")
+    site_type = get_site_type_for_url(url)
+    doc = parse_html(markup, site_type=site_type)
+    return extract_notice_fields(doc, url, site_type)
 
-        if title_tag:
-            for span in title_tag.select("span"):
-                span.decompose()
-            data["title"] = title_tag.get_text(strip=True)
 
-        # -----------------------------------------------------------
-        # 2. 날짜 및 조회수 추출
-        # -----------------------------------------------------------
-        date_tag = (
-            soup.select_one('.board-view-info') or       # [New] 대플
-            soup.select_one('.sponge-page-guide .pull-right') or 
-            soup.select_one('.sponge-board-view-info') or        
-            soup.select_one('.tblw_date') or 
-            soup.select_one('.date') or 
-            soup.select_one('.writer_info') or
-            soup.select_one('.bo_v_info') or
-            soup.select_one('.view_info')
-        )
+def extract_notice_fields(doc: HtmlNode, url: str, site_type: Optional[str] = None) -> Dict[str, Any]:
+    """파싱된 상세 페이지에서 제목/날짜/조회수/첨부파일/이미지/본문을 추출합니다."""
+    if doc.native_css:
+        # selectolax는 CSS 셀렉터가 C(lexbor)에서 돌아 select_one 체인이 파이썬 단일 순회보다 빠름
+        # (노드마다 파이썬 래퍼를 만드는 순회 비용이 셀렉터 여러 번보다 큼)
+        return _extract_by_selectors(doc, url)
+    try:
+        # 사이트 유형별 컴파일된 계획으로 트리를 한 번만 순회
+        return extract_with_plan(doc, url, site_type or get_site_type_for_url(url))
+    except RecursionError:
+        # 닫히지 않은 태그로 트리가 비정상적으로 깊은 경우 셀렉터 방식으로 대체
+        logger.warning(f"⚠️ 트리가 너무 깊어 셀렉터 방식으로 추출합니다 ({url})")
+        return _extract_by_selectors(doc, url)
+
+
+def _extract_by_selectors(doc: HtmlNode, url: str) -> Dict[str, Any]:
+    """select_one 체인 기반 추출 (단일 순회 추출기의 대체 경로)"""
+    data = {
+        "title": "", "date": None, "texts": [], 
+        "images": [], "files": [], "univ_views": 0
+    }
+
+    # -----------------------------------------------------------
+    # 1. 제목 추출
+    # -----------------------------------------------------------
+    title_tag = (
+        doc.select_one('.board-view-title') or # [New] 대플
+        doc.select_one('.sponge-page-guide h4') or 
+        doc.select_one('.sponge-page-title-section h3') or
+        doc.select_one('.subject') or 
+        doc.select_one('h3.title') or 
+        doc.select_one('h4.title') or
+        doc.select_one('.tblw_subj') or 
+        doc.select_one('.bo_v_tit') or
+        doc.select_one('.view_title')
+    )
+
+    if title_tag:
+        remove_nodes(title_tag.select("span"))
+        data["title"] = title_tag.text(strip=True)
+
+    # -----------------------------------------------------------
+    # 2. 날짜 및 조회수 추출
+    # -----------------------------------------------------------
+    date_tag = (
+        doc.select_one('.board-view-info') or       # [New] 대플
+        doc.select_one('.sponge-page-guide .pull-right') or 
+        doc.select_one('.sponge-board-view-info') or        
+        doc.select_one('.tblw_date') or 
+        doc.select_one('.date') or 
+        doc.select_one('.writer_info') or
+        doc.select_one('.bo_v_info') or
+        doc.select_one('.view_info')
+    )
+    
+    if date_tag:
+        full_text = date_tag.text(" ", strip=True)
         
-        if date_tag:
-            full_text = date_tag.get_text(" ", strip=True)
-            
-            view_match = re.search(r'(?:조회|View)(?:수)?\s*[:]?\s*(\d+)', full_text, re.IGNORECASE)
-            if view_match:
-                data["univ_views"] = int(view_match.group(1))
-            
-            # 날짜 (Regex: 2025.10.20 등)
-            date_match = re.search(r'(\d{4})\s*[\.\-\/]\s*(\d{1,2})\s*[\.\-\/]\s*(\d{1,2})', full_text)
-            if date_match:
-                y, m, d = date_match.groups()
-                data["date"] = datetime(int(y), int(m), int(d)).date()
+        # 조회수 / 날짜 (Regex: 2025.10.20 등)
+        date_value, views = parse_date_and_views(full_text)
+        if views is not None:
+            data["univ_views"] = views
+        if date_value is not None:
+            data["date"] = date_value
 
-        # -----------------------------------------------------------
-        # 3. 첨부파일 추출
-        # -----------------------------------------------------------
-        file_selectors = (
-            '.board-view-file a, '          # [New] 대플
-            '.sponge-page-guide a[href*="ownload"], '  
-            '.wri_area.file a.link_file, '
-            '.file_area a, '
-            '.bo_v_file a, '
-            '.view_file a'
-        )
-        for a in soup.select(file_selectors):
-            f_link = a.get('href')
+    # -----------------------------------------------------------
+    # 3. 첨부파일 추출
+    # -----------------------------------------------------------
+    file_selectors = (
+        '.board-view-file a, '          # [New] 대플
+        '.sponge-page-guide a[href*="ownload"], '  
+        '.wri_area.file a.link_file, '
+        '.file_area a, '
+        '.bo_v_file a, '
+        '.view_file a'
+    )
+    for a in doc.select(file_selectors):
+        f_link = a.attr('href')
+        
+        if f_link and not f_link.startswith("#") and "javascript" not in f_link:
+            f_name = a.text(strip=True) or "첨부파일"
+            full_file_url = urljoin(url, f_link)
             
-            if isinstance(f_link, str) and not f_link.startswith("#") and "javascript" not in f_link:
-                f_name = a.get_text(strip=True) or "첨부파일"
-                full_file_url = urljoin(url, f_link)
-                
-                if not any(f['url'] == full_file_url for f in data["files"]):
-                    data["files"].append({
-                        "name": f_name,
-                        "url": full_file_url
-                    })
+            if not any(f['url'] == full_file_url for f in data["files"]):
+                data["files"].append({
+                    "name": f_name,
+                    "url": full_file_url
+                })
 
-        # -----------------------------------------------------------
-        # 4. 본문 내용 추출
-        # -----------------------------------------------------------
-        content_div = (
-            soup.select_one('.board-view-cont') or     # [New] 대플
-            soup.select_one('.sponge-panel-white-remark') or 
-            soup.select_one('.tbl_view') or 
-            soup.select_one('.content_view') or 
-            soup.select_one('.bo_v_con') or
-            soup.select_one('.view_content')
-        )
+    # -----------------------------------------------------------
+    # 4. 본문 내용 추출
+    # -----------------------------------------------------------
+    content_div = (
+        doc.select_one('.board-view-cont') or     # [New] 대플
+        doc.select_one('.sponge-panel-white-remark') or 
+        doc.select_one('.tbl_view') or 
+        doc.select_one('.content_view') or 
+        doc.select_one('.bo_v_con') or
+        doc.select_one('.view_content')
+    )
+    
+    if content_div:
+        # 이미지
+        for img in content_div.find_all('img'):
+            src = img.attr('src')
+            if src:
+                data["images"].append(urljoin(url, src))
         
-        if content_div:
-            # 이미지
-            for img in content_div.find_all('img'):
-                src = img.get('src')
-                if isinstance(src, str):
-                    data["images"].append(urljoin(url, src))
-            
-            # 불필요한 요소 제거 (스크립트, 스타일, 숨겨진 요소 등)
-            for script in content_div(["script", "style", "iframe"]):
-                script.decompose()
-            
-            # 특정 클래스 요소 제거 (CMS 시스템의 불필요한 요소)
-            for unwanted_class in ['contents_add_one1', 'contents_add_one2', 'contents_add_one', 'hide_txt']:
-                for elem in content_div.find_all(class_=unwanted_class):
-                    elem.decompose()
-            
-            # display:none 또는 visibility:hidden 요소 제거
-            for elem in content_div.find_all(True):  # 모든 태그 검색
-                style_attr = elem.get('style')
-                if style_attr and isinstance(style_attr, str):
-                    style_lower = style_attr.lower().replace(' ', '')
-                    if 'display:none' in style_lower or 'visibility:hidden' in style_lower:
-                        elem.decompose()
-            
-            # 텍스트
-            lines = []
-            for element in content_div.find_all(['p', 'div', 'br', 'li', 'h4', 'h5']):
-                text = element.get_text(strip=True)
-                # undefined 텍스트 필터링 및 의미있는 텍스트만 추출
-                if text and text != 'undefined' and len(text) > 1:
-                    lines.append(text)
-            
-            if not lines:
-                 raw_text = content_div.get_text("\n", strip=True)
-                 # undefined 제거
-                 raw_text = raw_text.replace('undefined', '').strip()
-                 if raw_text and len(raw_text) > 1:
-                    data["texts"].append(raw_text)
-            else:
-                 data["texts"] = lines
+        # 불필요한 요소 제거 (스크립트, 스타일, 숨겨진 요소 등)
+        remove_nodes(content_div.find_all("script", "style", "iframe"))
         
-        return data
-
-    except Exception as e:
-        logger.error(f"❌ 파싱 로직 에러 ({url}): {e}")
-        return None
\ No newline at end of file
+        # 특정 클래스 요소 제거 (CMS 시스템의 불필요한 요소)
+        remove_nodes(content_div.select(
+            '.contents_add_one1, .contents_add_one2, .contents_add_one, .hide_txt'
+        ))
+        
+        # display:none 또는 visibility:hidden 요소 제거
+        hidden = []
+        for elem in content_div.find_all():  # 모든 태그 검색
+            style_attr = elem.attr('style')
+            if style_attr:
+                style_lower = style_attr.lower().replace(' ', '')
+                if 'display:none' in style_lower or 'visibility:hidden' in style_lower:
+                    hidden.append(elem)
+        remove_nodes(hidden)
+        
+        # 텍스트
+        lines = []
+        for element in content_div.find_all('p', 'div', 'br', 'li', 'h4', 'h5'):
+            text = element.text(strip=True)
+            # undefined 텍스트 필터링 및 의미있는 텍스트만 추출
+            if text and text != 'undefined' and len(text) > 1:
+                lines.append(text)
+        
+        if not lines:
+             raw_text = content_div.text("\n", strip=True)
+             # undefined 제거
+             raw_text = raw_text.replace('undefined', '').strip()
+             if raw_text and len(raw_text) > 1:
+                data["texts"].append(raw_text)
+        else:
+             data["texts"] = lines
+    
+    return data
@@ -0,0 +1,332 @@
+# app/services/search_index.py
+"""
+공지 제목/본문 검색 인덱스
+
+LIKE '%q%'는 content 전체를 매번 훑기 때문에 보관 공지가 늘수록 느려집니다.
+DB 종류에 따라 n-gram 기반 인덱스를 사용합니다. (한국어는 띄어쓰기 단위 토큰화로는 부분 일치가 안 되므로)
+
+  - SQLite     : FTS5 trigram 외부 콘텐츠 테이블(notices_fts) + 트리거로 notices와 자동 동기화
+  - PostgreSQL : pg_trgm GIN 인덱스(title, content) → ILIKE가 인덱스를 사용
+                 (한글 trigram은 DB의 LC_CTYPE이 UTF-8 로케일일 때 생성됩니다)
+  - 그 외 / 설정 실패 : 기존 LIKE 검색
+
+trigram은 3글자 미만 검색어를 인덱스로 찾을 수 없는데 한국어 검색어는 대부분 두 글자입니다. ("장학", "휴학")
+그래서 두 글자 검색어는 bigram 인덱스로 후보를 좁힌 뒤 ILIKE로 확인합니다.
+  - SQLite     : 제목/본문의 모든 두 글자를 공백으로 이어 넣은 contentless FTS5(unicode61) 테이블(notices_bigram)
+                 트리거가 notices_ngram_pos(1..BIGRAM_MAX_CHARS) 위치 표로 두 글자씩 잘라 동기화합니다.
+  - PostgreSQL : 두 글자 배열을 돌려주는 IMMUTABLE 함수 notice_bigrams()의 GIN 식 인덱스 (@> 검색)
+한 글자이거나 글자·숫자가 아닌 문자가 섞인 짧은 검색어는 그대로 LIKE로 거릅니다.
+새 공지는 트리거/GIN 인덱스가 INSERT 시점에 반영하므로 크롤러 쪽에서 따로 할 일은 없습니다.
+"""
+import re
+from datetime import date as DateType
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, case, column, func, literal_column, or_, select, table, text, true
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import get_logger
+from app.database.models import Notice
+
+logger = get_logger()
+
+BACKEND_FTS5 = "fts5"
+BACKEND_PG_TRGM = "pg_trgm"
+BACKEND_LIKE = "like"
+
+# trigram 인덱스로 찾을 수 있는 최소 검색어 길이
+MIN_NGRAM_LENGTH = 3
+# bigram 인덱스로 찾는 검색어 길이
+BIGRAM_LENGTH = 2
+# SQLite bigram 인덱스에 넣는 제목/본문 앞부분 길이 (글자 수, 위치 표 크기)
+BIGRAM_MAX_CHARS = 100_000
+# 스니펫 앞뒤 문맥 길이 (글자 수)
+SNIPPET_CONTEXT = 40
+
+_backend = BACKEND_LIKE
+_bigram = False
+
+# FTS5 가상 테이블 (ORM 모델 없이 조인/서브쿼리용으로만 사용)
+notices_fts = table("notices_fts", column("rowid"))
+notices_bigram = table("notices_bigram", column("rowid"))
+
+_SQLITE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE notices_fts USING fts5(
+        title, content, content='notices', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notices_fts_ai AFTER INSERT ON notices BEGIN
+        INSERT INTO notices_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notices_fts_ad AFTER DELETE ON notices BEGIN
+        INSERT INTO notices_fts(notices_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    # 조회수 갱신 등에는 반응하지 않도록 title/content 변경에만 동기화
+    """
+    CREATE TRIGGER IF NOT EXISTS notices_fts_au AFTER UPDATE OF title, content ON notices BEGIN
+        INSERT INTO notices_fts(notices_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO notices_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+]
+
+
+def _bigrams_sql(col: str) -> str:
+    """col의 모든 두 글자를 공백으로 이은 문자열 (unicode61이 공백/기호에서 끊으므로 두 글자 토큰만 의미 있음)"""
+    return f"(SELECT group_concat(substr({col}, n, 2), ' ') FROM notices_ngram_pos WHERE n < length({col}))"
+
+
+_SQLITE_BIGRAM_SETUP = [
+    """
+    CREATE VIRTUAL TABLE notices_bigram USING fts5(
+        title, content, content='', tokenize='unicode61'
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS notices_ngram_pos (n INTEGER PRIMARY KEY)",
+    f"""
+    CREATE TRIGGER IF NOT EXISTS notices_bigram_ai AFTER INSERT ON notices BEGIN
+        INSERT INTO notices_bigram(rowid, title, content)
+        VALUES (new.id, {_bigrams_sql('new.title')}, {_bigrams_sql('new.content')});
+    END
+    """,
+    # contentless 테이블은 색인했던 값을 그대로 다시 넘겨야 지울 수 있음
+    f"""
+    CREATE TRIGGER IF NOT EXISTS notices_bigram_ad AFTER DELETE ON notices BEGIN
+        INSERT INTO notices_bigram(notices_bigram, rowid, title, content)
+        VALUES ('delete', old.id, {_bigrams_sql('old.title')}, {_bigrams_sql('old.content')});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS notices_bigram_au AFTER UPDATE OF title, content ON notices BEGIN
+        INSERT INTO notices_bigram(notices_bigram, rowid, title, content)
+        VALUES ('delete', old.id, {_bigrams_sql('old.title')}, {_bigrams_sql('old.content')});
+        INSERT INTO notices_bigram(rowid, title, content)
+        VALUES (new.id, {_bigrams_sql('new.title')}, {_bigrams_sql('new.content')});
+    END
+    """,
+]
+
+_PG_SETUP = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_notices_title_trgm ON notices USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_notices_content_trgm ON notices USING gin (content gin_trgm_ops)",
+    # pg_trgm은 두 글자 패턴에서 trigram을 뽑지 못해 인덱스 전체를 훑으므로 두 글자 배열 인덱스를 따로 둠
+    """
+    CREATE OR REPLACE FUNCTION notice_bigrams(t text) RETURNS text[]
+    LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+        SELECT coalesce(array_agg(DISTINCT lower(substr(t, i, 2))), '{}')
+        FROM generate_series(1, length(t) - 1) AS i
+    $$
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_notices_title_bigram ON notices USING gin (notice_bigrams(title))",
+    "CREATE INDEX IF NOT EXISTS idx_notices_content_bigram ON notices USING gin (notice_bigrams(content))",
+]
+
+
+def get_backend() -> str:
+    return _backend
+
+
+def _sqlite_table_exists(sync_conn, name: str) -> bool:
+    return sync_conn.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)
+    ).first() is not None
+
+
+def _setup_sqlite_bigram(sync_conn):
+    exists = _sqlite_table_exists(sync_conn, "notices_bigram")
+    for ddl in _SQLITE_BIGRAM_SETUP[0 if not exists else 1:]:
+        sync_conn.exec_driver_sql(ddl)
+    if not exists:
+        sync_conn.exec_driver_sql(
+            "INSERT INTO notices_ngram_pos(n) VALUES (?)", [(n,) for n in range(1, BIGRAM_MAX_CHARS + 1)]
+        )
+        # 기존 공지를 인덱스에 채워 넣음 (최초 1회)
+        sync_conn.exec_driver_sql(
+            "INSERT INTO notices_bigram(rowid, title, content) "
+            f"SELECT id, {_bigrams_sql('title')}, {_bigrams_sql('content')} FROM notices"
+        )
+        logger.info("🔎 검색 인덱스(FTS5 bigram) 생성 완료")
+
+
+def setup_search_index(sync_conn):
+    """init_db에서 호출: DB 종류에 맞는 검색 인덱스를 준비하고 사용할 백엔드를 정합니다."""
+    global _backend, _bigram
+    dialect = sync_conn.dialect.name
+    try:
+        if dialect == "sqlite":
+            exists = _sqlite_table_exists(sync_conn, "notices_fts")
+            for ddl in _SQLITE_SETUP[0 if not exists else 1:]:
+                sync_conn.exec_driver_sql(ddl)
+            if not exists:
+                # 기존 공지를 인덱스에 채워 넣음 (최초 1회)
+                sync_conn.exec_driver_sql("INSERT INTO notices_fts(notices_fts) VALUES ('rebuild')")
+                logger.info("🔎 검색 인덱스(FTS5 trigram) 생성 완료")
+            _setup_sqlite_bigram(sync_conn)
+            _backend = BACKEND_FTS5
+        elif dialect == "postgresql":
+            for ddl in _PG_SETUP:
+                sync_conn.exec_driver_sql(ddl)
+            _backend = BACKEND_PG_TRGM
+        else:
+            _backend = BACKEND_LIKE
+        _bigram = _backend != BACKEND_LIKE
+    except Exception as e:
+        _backend = BACKEND_LIKE
+        _bigram = False
+        raise RuntimeError(f"검색 인덱스 준비 실패 (LIKE 검색으로 동작): {e}") from e
+
+
+def _terms(q: str) -> List[str]:
+    return [t for t in re.split(r"\s+", q.strip()) if t]
+
+
+def _split_terms(terms: List[str]):
+    """(FTS5 trigram 인덱스로 찾을 검색어, 나머지 검색어). FTS5가 아니면 전부 나머지 (pg_trgm은 ILIKE를 바로 가속)."""
+    if _backend != BACKEND_FTS5:
+        return [], terms
+    indexed = [t for t in terms if len(t) >= MIN_NGRAM_LENGTH]
+    return indexed, [t for t in terms if len(t) < MIN_NGRAM_LENGTH]
+
+
+def _is_bigram_term(term: str) -> bool:
+    # 기호가 섞이면 unicode61 토큰과 맞지 않으므로 글자·숫자 두 개일 때만
+    return _bigram and len(term) == BIGRAM_LENGTH and term.isalnum()
+
+
+def _fts_query(terms: List[str], title_only: bool) -> str:
+    # 각 검색어를 따옴표로 감싼 구(phrase)로 만들어 FTS5 문법 문자와 섞이지 않게 함 (AND 결합)
+    phrases = " AND ".join('"' + t.replace('"', '""') + '"' for t in terms)
+    return f"title : ({phrases})" if title_only else phrases
+
+
+def _fts_match(terms: List[str], title_only: bool):
+    return text("notices_fts MATCH :fts_q").bindparams(fts_q=_fts_query(terms, title_only))
+
+
+def _bigram_clause(terms: List[str], title_only: bool):
+    """두 글자 검색어들의 후보 조건 (bigram 인덱스). 정확한 확인은 함께 거는 ILIKE가 합니다."""
+    if _backend == BACKEND_PG_TRGM:
+        clauses = []
+        for t in terms:
+            wanted = postgresql.array([t.lower()])
+            title_hit = func.notice_bigrams(Notice.title).op("@>")(wanted)
+            clauses.append(title_hit if title_only else or_(title_hit, func.notice_bigrams(Notice.content).op("@>")(wanted)))
+        return and_(*clauses)
+    matched = select(notices_bigram.c.rowid).where(
+        text("notices_bigram MATCH :bigram_q").bindparams(bigram_q=_fts_query(terms, title_only))
+    )
+    return Notice.id.in_(matched)
+
+
+def _short_clause(terms: List[str], title_only: bool):
+    """trigram 인덱스를 못 쓰는 검색어 조건: 두 글자는 bigram 인덱스로 후보를 좁히고 모두 ILIKE로 확인"""
+    bigram = [t for t in terms if _is_bigram_term(t)]
+    if not bigram:
+        return _like_clause(terms, title_only)
+    return and_(_bigram_clause(bigram, title_only), _like_clause(terms, title_only))
+
+
+def _like_clause(terms: List[str], title_only: bool):
+    clauses = []
+    for t in terms:
+        pattern = f"%{t}%"
+        if title_only:
+            clauses.append(Notice.title.ilike(pattern))
+        else:
+            clauses.append(or_(Notice.title.ilike(pattern), Notice.content.ilike(pattern)))
+    return and_(*clauses)
+
+
+def match_clause(q: str, title_only: bool = False):
+    """
+    검색어 조건을 WHERE 절 표현식으로 돌려줍니다. (다른 정렬/페이지네이션과 조합 가능)
+    여러 단어는 모두 포함(AND)해야 일치합니다.
+    """
+    terms = _terms(q)
+    if not terms:
+        return true()
+    indexed, short = _split_terms(terms)
+    if indexed:
+        # 긴 검색어로 후보를 인덱스에서 좁히고, 짧은 검색어는 그 후보에만 적용
+        matched = select(notices_fts.c.rowid).where(_fts_match(indexed, title_only))
+        return and_(Notice.id.in_(matched), *([_short_clause(short, title_only)] if short else []))
+    # pg_trgm GIN 인덱스는 ILIKE를 그대로 가속하므로 PostgreSQL은 같은 표현식을 사용 (두 글자는 bigram 인덱스로)
+    return _short_clause(short, title_only)
+
+
+def _snippet_expr(dialect: str, term: str):
+    """본문에서 첫 일치 위치 주변을 잘라내는 SQL 표현식"""
+    if dialect == "postgresql":
+        pos = func.strpos(func.lower(Notice.content), term.lower())
+        return func.substr(Notice.content, func.greatest(pos - SNIPPET_CONTEXT, 1), SNIPPET_CONTEXT * 3)
+    pos = func.instr(func.lower(Notice.content), term.lower())
+    return func.substr(Notice.content, func.max(pos - SNIPPET_CONTEXT, 1), SNIPPET_CONTEXT * 3)
+
+
+async def ranked_search(
+    db: AsyncSession,
+    q: str,
+    category: Optional[str] = None,
+    date_from: Optional[DateType] = None,
+    date_to: Optional[DateType] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> List[Dict[str, Any]]:
+    """
+    관련도 순 검색. 목록 응답 칼럼(본문 제외) + score + snippet 을 담은 dict 목록을 반환합니다.
+      - FTS5: bm25 (제목 가중치 10, 본문 1) + snippet()
+      - 그 외: 제목 일치 우선 → 최신순, 본문 일치 위치 주변을 스니펫으로
+    """
+    terms = _terms(q)
+    if not terms:
+        return []
+
+    filters = []
+    if category and category != "all":
+        filters.append(Notice.category == category)
+    if date_from:
+        filters.append(Notice.date >= date_from)
+    if date_to:
+        filters.append(Notice.date <= date_to)
+
+    columns = [Notice.id, Notice.title, Notice.link, Notice.date, Notice.category, Notice.author,
+               Notice.univ_views, Notice.app_views, Notice.is_pinned]
+
+    indexed, short = _split_terms(terms)
+    if indexed:
+        # bm25는 값이 작을수록 관련도가 높음
+        rank = literal_column("bm25(notices_fts, 10.0, 1.0)")
+        # trigram 토큰은 대략 한 글자이므로 토큰 수 = 글자 수 (FTS5 상한 64)
+        snippet = literal_column(f"snippet(notices_fts, 1, '', '', '…', {min(SNIPPET_CONTEXT, 64)})")
+        stmt = (
+            select(*columns, (-rank).label("score"), snippet.label("snippet"))
+            .select_from(notices_fts.join(Notice, Notice.id == notices_fts.c.rowid))
+            .where(_fts_match(indexed, False), *filters)
+            .order_by(rank, Notice.id.desc())
+        )
+        if short:
+            stmt = stmt.where(_short_clause(short, False))
+    else:
+        dialect = db.get_bind().dialect.name
+        title_hit = case((Notice.title.ilike(f"%{terms[0]}%"), 1.0), else_=0.0)
+        stmt = (
+            select(*columns, title_hit.label("score"), _snippet_expr(dialect, terms[0]).label("snippet"))
+            .where(_short_clause(terms, False), *filters)
+            .order_by(title_hit.desc(), Notice.date.desc().nulls_last(), Notice.id.desc())
+        )
+
+    result = await db.execute(stmt.offset(offset).limit(limit))
+    items = []
+    for row in result.all():
+        item = dict(row._mapping)
+        item["score"] = round(float(item["score"] or 0.0), 4)
+        item["snippet"] = (item["snippet"] or "").strip()
+        items.append(item)
+    return items
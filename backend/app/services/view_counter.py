@@ -0,0 +1,107 @@
+# app/services/view_counter.py
+"""
+앱 조회수 버퍼
+
+조회수 증가 요청마다 행을 읽고 +1 해서 커밋하면 요청당 왕복 3번 + 행 잠금이 생기고,
+동시에 들어온 증가분이 서로 덮어써 사라집니다.
+증가분은 메모리(notice_id → delta)에 모아 두었다가 VIEW_FLUSH_INTERVAL초마다
+UPDATE notices SET app_views = app_views + CASE id WHEN .. THEN .. END 한 번으로 반영합니다.
+아직 반영되지 않은 증가분은 pending()으로 조회해 응답에 더해 줄 수 있습니다.
+반영이 끝나면 목록 응답 캐시(response_cache)의 항목에도 같은 증가분을 더해 조회수가 줄어 보이지 않게 합니다.
+서버 종료 시(lifespan)에도 남은 증가분을 반영합니다.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import case, func, update
+
+from app.core.logger import get_logger
+from app.database.database import AsyncSessionLocal
+from app.database.models import Notice
+from app.services import response_cache
+
+logger = get_logger()
+
+VIEW_FLUSH_INTERVAL = max(1, int(os.getenv("VIEW_FLUSH_INTERVAL", "10")))
+# 버퍼에 쌓인 공지 수가 이 값을 넘으면 주기를 기다리지 않고 바로 반영
+VIEW_BUFFER_MAX_KEYS = max(1, int(os.getenv("VIEW_BUFFER_MAX_KEYS", "5000")))
+# UPDATE 한 번에 넣을 공지 수
+FLUSH_CHUNK_SIZE = 500
+
+_pending: Dict[int, int] = {}
+# 반영 중인 증가분 (커밋 후 응답 캐시에 더할 때까지 pending()에 계속 포함)
+_flushing: Dict[int, int] = {}
+_flush_lock = asyncio.Lock()
+_flush_task: Optional[asyncio.Task] = None
+_stats: Dict[str, int] = {"increments": 0, "flushes": 0, "flushed_rows": 0, "flush_errors": 0}
+
+
+def increment(notice_id: int, delta: int = 1):
+    global _flush_task
+    _pending[notice_id] = _pending.get(notice_id, 0) + delta
+    _stats["increments"] += 1
+    if len(_pending) >= VIEW_BUFFER_MAX_KEYS and (_flush_task is None or _flush_task.done()):
+        _flush_task = asyncio.create_task(flush())
+
+
+def pending(notice_id: int) -> int:
+    """아직 DB/응답 캐시에 반영되지 않은 증가분"""
+    return _pending.get(notice_id, 0) + _flushing.get(notice_id, 0)
+
+
+def merge_items(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """목록 응답 항목(dict)의 app_views에 반영 전 증가분을 더합니다. 바뀔 것이 없으면 원본을 그대로 반환."""
+    if not (_pending or _flushing) or not any(pending(item.get("id")) for item in items):
+        return items
+    return [
+        {**item, "app_views": (item.get("app_views") or 0) + pending(item["id"])} if pending(item.get("id")) else item
+        for item in items
+    ]
+
+
+def _chunks(ids: List[int], size: int) -> Iterable[List[int]]:
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+async def flush() -> int:
+    """버퍼의 증가분을 DB에 반영하고 반영한 공지 수를 반환합니다. 실패하면 증가분을 버퍼로 되돌립니다."""
+    global _pending, _flushing
+    async with _flush_lock:
+        if not _pending:
+            return 0
+        batch, _pending = _pending, {}
+        _flushing = batch
+        started = time.monotonic()
+
+        try:
+            async with AsyncSessionLocal() as db:
+                for ids in _chunks(list(batch.keys()), FLUSH_CHUNK_SIZE):
+                    delta = case({notice_id: batch[notice_id] for notice_id in ids}, value=Notice.id, else_=0)
+                    await db.execute(
+                        update(Notice)
+                        .where(Notice.id.in_(ids))
+                        .values(app_views=func.coalesce(Notice.app_views, 0) + delta)
+                        .execution_options(synchronize_session=False)
+                    )
+                await db.commit()
+        except Exception as e:
+            for notice_id, delta in batch.items():
+                _pending[notice_id] = _pending.get(notice_id, 0) + delta
+            _flushing = {}
+            _stats["flush_errors"] += 1
+            logger.error(f"⚠️ [조회수] 반영 실패 ({len(batch)}개, 다음 주기에 재시도): {e}")
+            return 0
+
+        # 캐시 반영과 _flushing 비우기 사이에 await가 없어야 응답에 증가분이 두 번/0번 더해지지 않음
+        response_cache.apply_view_deltas(batch, stored_before=started)
+        _flushing = {}
+        _stats["flushes"] += 1
+        _stats["flushed_rows"] += len(batch)
+        return len(batch)
+
+
+def get_stats() -> Dict[str, Any]:
+    return {**_stats, "pending_notices": len(_pending), "pending_views": sum(_pending.values())}
@@ -0,0 +1,117 @@
+# app/utils/http_cache.py
+"""
+읽기 API HTTP 캐시 헤더 (ETag / Cache-Control / 304)
+
+ETag는 응답 본문을 만들지 않고 계산할 수 있는 값들로만 만듭니다.
+  - BOOT_ID      : 프로세스 시작 시 정해지는 값 (재시작하면 카운터가 0부터 다시 시작하므로)
+  - 카테고리 버전 : 크롤러가 공지를 저장하거나 필독 상태를 바꿀 때마다 증가 (bump_version)
+  - 스크랩 버전   : 토큰별 스크랩 토글 시 증가 (is_scraped 표시가 바뀌므로)
+                   HTTP_CACHE_SCRAP_TOKENS개 토큰까지만 기억(LRU)하고, 밀려난 토큰은
+                   그때까지의 가장 큰 버전보다 큰 값을 쓰므로 예전 ETag와 다시 일치하지 않음
+  - 시간 구간     : HTTP_CACHE_WINDOW초마다 바뀜 (조회수처럼 크롤링 외에 바뀌는 값의 지연 상한)
+  - 요청 파라미터
+그래서 If-None-Match가 일치하면 DB 조회 없이 바로 304를 돌려줄 수 있습니다.
+"""
+import hashlib
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+HTTP_CACHE_WINDOW = max(1.0, float(os.getenv("HTTP_CACHE_WINDOW", "60")))
+NOTICE_LIST_MAX_AGE = max(0, int(os.getenv("NOTICE_LIST_MAX_AGE", "30")))
+CATEGORIES_MAX_AGE = max(0, int(os.getenv("CATEGORIES_MAX_AGE", "86400")))
+HTTP_CACHE_SCRAP_TOKENS = max(1, int(os.getenv("HTTP_CACHE_SCRAP_TOKENS", "10000")))
+
+BOOT_ID = secrets.token_hex(4)
+
+# 기기별(토큰) 응답은 공유 캐시(CDN/프록시)에 저장되지 않도록, 매번 재검증
+PRIVATE_REVALIDATE = "private, max-age=0, must-revalidate"
+
+_versions: Dict[str, int] = {}
+_generation = 0
+# token → 마지막 토글 때의 _scrap_clock 값 (LRU)
+_scrap_versions: "OrderedDict[str, int]" = OrderedDict()
+_scrap_clock = 0
+# 기억하지 않는 토큰의 버전: 밀려난 토큰 버전의 최댓값 (단조 증가)
+_scrap_floor = 0
+_stats: Dict[str, int] = {"not_modified": 0}
+
+
+def bump_version(category: Optional[str] = None):
+    """category와 "all"의 버전을 올립니다. category가 없으면 전체를 무효화합니다."""
+    global _generation
+    if category is None:
+        _generation += 1
+        return
+    _versions[category] = _versions.get(category, 0) + 1
+    _versions["all"] = _versions.get("all", 0) + 1
+
+
+def version(category: str) -> str:
+    return f"{_generation}.{_versions.get(category, 0)}"
+
+
+def bump_scrap_version(token: str):
+    global _scrap_clock, _scrap_floor
+    _scrap_clock += 1
+    _scrap_versions[token] = _scrap_clock
+    _scrap_versions.move_to_end(token)
+    if len(_scrap_versions) > HTTP_CACHE_SCRAP_TOKENS:
+        _, evicted = _scrap_versions.popitem(last=False)
+        _scrap_floor = max(_scrap_floor, evicted)
+
+
+def scrap_version(token: Optional[str]) -> int:
+    if not token:
+        return 0
+    return _scrap_versions.get(token, _scrap_floor)
+
+
+def current_window() -> int:
+    return int(time.time() // HTTP_CACHE_WINDOW)
+
+
+def make_etag(*parts: Any) -> str:
+    h = hashlib.sha1(BOOT_ID.encode("ascii"))
+    for part in parts:
+        h.update(b"\x00")
+        h.update(str(part).encode("utf-8"))
+    return f'"{h.hexdigest()[:20]}"'
+
+
+def matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        # If-None-Match는 약한 비교 (W/ 접두사 무시)
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+def set_headers(response: Response, etag: str, cache_control: str):
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    _stats["not_modified"] += 1
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def get_stats() -> Dict[str, Any]:
+    return {
+        **_stats,
+        "boot_id": BOOT_ID,
+        "versions": dict(_versions),
+        "generation": _generation,
+        "scrap_tokens": len(_scrap_versions),
+    }
@@ -0,0 +1,47 @@
+# app/utils/pagination.py
+"""
+목록 API 커서(keyset) 페이지네이션
+
+커서는 마지막으로 내려준 행의 정렬 키 (is_pinned, date 또는 univ_views, id)를
+base64url(JSON)로 감싼 불투명 문자열입니다. 클라이언트는 값을 해석하지 않고 그대로 돌려보냅니다.
+"""
+import base64
+import json
+from datetime import date as DateType
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+
+def encode_cursor(sort_by: str, is_pinned: bool, key: Any, notice_id: int) -> str:
+    if isinstance(key, DateType):
+        key = key.isoformat()
+    payload = {"s": sort_by, "p": 1 if is_pinned else 0, "k": key, "i": notice_id}
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], sort_by: str) -> Optional[Dict[str, Any]]:
+    """커서를 정렬 키 dict(is_pinned, key, id)로 되돌립니다. 형식이 틀리면 400."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if payload["s"] != sort_by:
+            raise ValueError("sort mismatch")
+        key = payload["k"]
+        if key is not None:
+            key = DateType.fromisoformat(key) if sort_by == "date" else int(key)
+        return {"is_pinned": bool(payload["p"]), "key": key, "id": int(payload["i"])}
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+def next_cursor_for(items: list, size: int, sort_by: str) -> Optional[str]:
+    """가져온 행이 size개로 꽉 찼으면 마지막 행 기준 다음 커서, 아니면 None (마지막 페이지)"""
+    if len(items) < size or not items:
+        return None
+    last = items[-1]
+    key = last.date if sort_by == "date" else last.univ_views
+    return encode_cursor(sort_by, bool(last.is_pinned), key, last.id)
@@ -0,0 +1,143 @@
+# scripts/bench_bulk_insert.py
+"""
+공지 저장 경로 벤치마크 (ORM add 반복 vs INSERT ... ON CONFLICT)
+
+빈 DB에 합성 공지 N건을 저장하는 처리량(rows/sec)을 비교하고,
+절반이 이미 저장된 상태(충돌 50%)에서 대량 저장이 배치를 잃지 않는지도 확인합니다.
+
+사용법 (backend 디렉토리에서):
+    python -m scripts.bench_bulk_insert                       # 임시 SQLite 파일
+    python -m scripts.bench_bulk_insert --sizes 1000 10000
+    python -m scripts.bench_bulk_insert --db-url postgresql+asyncpg://user:pw@localhost/bench_db
+
+주의: --db-url 로 준 DB의 notices 테이블은 매 측정마다 비워집니다. 운영 DB에 실행하지 마세요.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import bulk
+from app.database.database import Base
+from app.database.models import Notice
+
+
+def _rows(n: int, offset: int = 0) -> List[Dict[str, Any]]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "title": f"벤치마크 공지 {i}",
+            "link": f"https://bench.local/info.do?encMenuBoardSeq={i}",
+            "date": date(2025, 1, 1),
+            "content": "본문 " * 200,
+            "images": [f"https://bench.local/img/{i}.png"],
+            "files": [{"name": f"첨부{i}.pdf", "url": f"https://bench.local/download?id={i}"}],
+            "category": "bench",
+            "univ_views": i % 500,
+            "app_views": 0,
+            "is_pinned": False,
+            "is_notified": False,
+            "crawled_at": now,
+        }
+        for i in range(offset, offset + n)
+    ]
+
+
+async def _reset(sessionmaker: async_sessionmaker):
+    async with sessionmaker() as db:
+        await db.execute(delete(Notice).where(Notice.category == "bench"))
+        await db.commit()
+
+
+async def _count(db: AsyncSession) -> int:
+    return int((await db.execute(select(func.count(Notice.id)).where(Notice.category == "bench"))).scalar() or 0)
+
+
+async def _orm_insert(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    for row in rows:
+        db.add(Notice(**row))
+    await db.commit()
+    return len(rows)
+
+
+async def _bulk_insert(db: AsyncSession, rows: List[Dict[str, Any]]) -> int:
+    saved = await bulk.insert_notices(db, rows)
+    await db.commit()
+    return len(saved)
+
+
+async def _bulk_insert_prefill(sessionmaker: async_sessionmaker, rows: List[Dict[str, Any]]):
+    async with sessionmaker() as db:
+        await _bulk_insert(db, rows)
+
+
+async def _measure(sessionmaker: async_sessionmaker, label: str, job, rows: List[Dict[str, Any]]):
+    async with sessionmaker() as db:
+        started = time.perf_counter()
+        try:
+            saved = await job(db, rows)
+            error = ""
+        except Exception as e:
+            await db.rollback()
+            saved, error = 0, type(e).__name__
+        elapsed = time.perf_counter() - started
+        total = await _count(db)
+    rate = saved / elapsed if elapsed > 0 else 0.0
+    print(f"  {label:<28} {len(rows):>7} rows  {elapsed * 1000:>9.1f} ms  {rate:>10.0f} rows/s  "
+          f"saved {saved:>6}  table {total:>6} {error}")
+
+
+async def run(db_url: str, sizes: List[int]):
+    engine = create_async_engine(db_url)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    print(f"DB: {engine.dialect.name}")
+
+    try:
+        for n in sizes:
+            print(f"\n[{n} rows]")
+            rows = _rows(n)
+
+            await _reset(sessionmaker)
+            await _measure(sessionmaker, "ORM add + commit", _orm_insert, rows)
+
+            await _reset(sessionmaker)
+            await _measure(sessionmaker, "INSERT ON CONFLICT", _bulk_insert, rows)
+
+            # 절반은 이미 있고 절반은 새 행: ORM은 배치 전체가 롤백, 대량 저장은 새 행만 저장
+            half = _rows(n // 2, offset=n)
+            await _reset(sessionmaker)
+            await _bulk_insert_prefill(sessionmaker, rows[: n // 2])
+            await _measure(sessionmaker, "ORM add (50% conflict)", _orm_insert, rows[: n // 2] + half)
+
+            await _reset(sessionmaker)
+            await _bulk_insert_prefill(sessionmaker, rows[: n // 2])
+            await _measure(sessionmaker, "ON CONFLICT (50% conflict)", _bulk_insert, rows[: n // 2] + half)
+        await _reset(sessionmaker)
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공지 대량 저장 벤치마크")
+    parser.add_argument("--db-url", default=None, help="기본: 임시 SQLite 파일")
+    parser.add_argument("--sizes", nargs="*", type=int, default=[1000, 10000])
+    args = parser.parse_args()
+
+    if args.db_url:
+        asyncio.run(run(args.db_url, args.sizes))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}", args.sizes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# scripts/bench_history_insert.py
+"""
+알림 발송 이력 저장 벤치마크 (ORM add_all vs bulk.insert_notification_history)
+
+합성 기기 × 공지 조합 N건(기본 50,000)의 발송 이력을 저장하는 시간을 비교합니다.
+  - ORM add_all        : 행마다 NotificationHistory 객체 생성 후 flush (기존 방식)
+  - bulk per 100 rows  : 배치(100건)마다 ON CONFLICT 저장 (이력을 모으기 전 방식)
+  - bulk once          : 모아 둔 이력을 한 번에 저장 (PostgreSQL+asyncpg는 COPY, SQLite는 executemany)
+  - bulk once (50% conflict) : 절반이 이미 저장된 상태에서 다시 저장 (재발송 시 상황)
+
+사용법 (backend 디렉토리에서):
+    python -m scripts.bench_history_insert                    # 임시 SQLite 파일
+    python -m scripts.bench_history_insert --rows 100000
+    python -m scripts.bench_history_insert --db-url postgresql+asyncpg://user:pw@localhost/bench_db
+
+주의: --db-url 로 준 DB의 bench 카테고리 공지/벤치마크 기기와 그 발송 이력은 시작/종료 시 삭제됩니다. 운영 DB에 실행하지 마세요.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Dict, List
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import bulk
+from app.database.database import Base
+from app.database.models import Device, Notice, NotificationHistory
+
+CATEGORY = "bench"
+TOKEN_PREFIX = "ExponentPushToken[bench-history-"
+NOTICES = 50
+
+
+async def _reset(sessionmaker: async_sessionmaker, everything: bool = False):
+    async with sessionmaker() as db:
+        device_ids = select(Device.id).where(Device.token.startswith(TOKEN_PREFIX))
+        await db.execute(delete(NotificationHistory).where(NotificationHistory.device_id.in_(device_ids)))
+        if everything:
+            await db.execute(delete(Device).where(Device.token.startswith(TOKEN_PREFIX)))
+            await db.execute(delete(Notice).where(Notice.category == CATEGORY))
+        await db.commit()
+
+
+async def _setup(sessionmaker: async_sessionmaker, rows: int) -> List[Dict[str, int]]:
+    """공지 NOTICES개 × 기기 rows/NOTICES개를 만들고 발송 이력 행 목록을 반환합니다."""
+    devices = max(1, rows // NOTICES)
+    now = datetime.now(timezone.utc)
+    async with sessionmaker() as db:
+        saved = await bulk.insert_notices(db, [
+            {"title": f"이력 벤치마크 {i}", "link": f"https://bench.local/history/{i}", "category": CATEGORY,
+             "content": "", "images": [], "files": [], "crawled_at": now}
+            for i in range(NOTICES)
+        ])
+        db.add_all([Device(token=f"{TOKEN_PREFIX}{i}]") for i in range(devices)])
+        await db.commit()
+        device_ids = (await db.execute(select(Device.id).where(Device.token.startswith(TOKEN_PREFIX)))).scalars().all()
+    notice_ids = [notice_id for notice_id, _ in saved]
+    return [{"device_id": d, "notice_id": n} for d in device_ids for n in notice_ids][:rows]
+
+
+async def _orm(db: AsyncSession, rows: List[Dict[str, int]]):
+    db.add_all([NotificationHistory(**row) for row in rows])
+    await db.commit()
+
+
+async def _bulk_per_batch(db: AsyncSession, rows: List[Dict[str, int]]):
+    for i in range(0, len(rows), 100):
+        await bulk.insert_notification_history(db, rows[i:i + 100])
+        await db.commit()
+
+
+async def _bulk_once(db: AsyncSession, rows: List[Dict[str, int]]):
+    await bulk.insert_notification_history(db, rows)
+    await db.commit()
+
+
+async def _count(db: AsyncSession) -> int:
+    device_ids = select(Device.id).where(Device.token.startswith(TOKEN_PREFIX))
+    stmt = select(func.count(NotificationHistory.id)).where(NotificationHistory.device_id.in_(device_ids))
+    return int((await db.execute(stmt)).scalar() or 0)
+
+
+async def _measure(sessionmaker: async_sessionmaker, label: str, job, rows: List[Dict[str, int]]):
+    async with sessionmaker() as db:
+        started = time.perf_counter()
+        await job(db, rows)
+        elapsed = time.perf_counter() - started
+        total = await _count(db)
+    print(f"  {label:<26} {len(rows):>7} rows  {elapsed * 1000:>9.1f} ms  {len(rows) / elapsed:>10.0f} rows/s  table {total:>7}")
+
+
+async def run(db_url: str, rows: int):
+    engine = create_async_engine(db_url)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "asyncpg"
+    print(f"DB: {engine.dialect.name} ({'COPY' if copy else 'executemany'} 경로)")
+
+    try:
+        await _reset(sessionmaker, everything=True)
+        history = await _setup(sessionmaker, rows)
+        print(f"\n[{len(history)} rows]")
+
+        await _measure(sessionmaker, "ORM add_all", _orm, history)
+        await _reset(sessionmaker)
+        await _measure(sessionmaker, "bulk per 100 rows", _bulk_per_batch, history)
+        await _reset(sessionmaker)
+        await _measure(sessionmaker, "bulk once", _bulk_once, history)
+
+        await _reset(sessionmaker)
+        async with sessionmaker() as db:
+            await _bulk_once(db, history[: len(history) // 2])
+        await _measure(sessionmaker, "bulk once (50% conflict)", _bulk_once, history)
+    finally:
+        await _reset(sessionmaker, everything=True)
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="알림 발송 이력 저장 벤치마크")
+    parser.add_argument("--db-url", default=None, help="기본: 임시 SQLite 파일")
+    parser.add_argument("--rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    if args.db_url:
+        asyncio.run(run(args.db_url, args.rows))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}", args.rows))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# scripts/bench_html_parsers.py
+"""
+HTML 파서 백엔드 마이크로 벤치마크
+
+저장해 둔 게시판 HTML에 대해 백엔드별 (파싱 + 추출) 시간과 메모리를 비교합니다.
+  - list_*.html   : CMS 목록 페이지 → extract_cms_list_rows
+  - detail_*.html : 상세 페이지     → extract_notice_fields
+
+사용법 (backend 디렉토리에서):
+    # 1) 현재 게시판 HTML 저장 (목록 전체 + 카테고리당 상세 2개)
+    python -m scripts.bench_html_parsers --fetch --details-per-board 2
+    # 2) 벤치마크
+    python -m scripts.bench_html_parsers --repeat 20
+
+메모리는 tracemalloc 최대치(파이썬 객체)와 RSS 증가분(C 확장 할당 포함)을 함께 보여줍니다.
+"""
+import argparse
+import asyncio
+import gc
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from app.core.config import NOTICE_CONFIGS, get_urls
+from app.core.html_parser import available_backends, parse_html
+from app.services.knu_notice_service import LIST_REGION, extract_cms_list_rows
+from app.services.scraper import extract_notice_fields
+
+DEFAULT_HTML_DIR = Path(__file__).resolve().parent / "fixtures" / "html"
+
+
+def _rss_bytes() -> int:
+    """현재 RSS (리눅스 /proc 기반, 그 외 환경에서는 0)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        import resource
+        return pages * resource.getpagesize()
+    except (OSError, ImportError, ValueError):
+        return 0
+
+
+def _list_job(markup: str, backend: str):
+    doc = parse_html(markup, backend=backend, strain=LIST_REGION)
+    extract_cms_list_rows(doc.select("div.tbody > ul"), "https://bench.local/menu/board/info/x.do")
+    return doc
+
+
+def _detail_job(markup: str, backend: str):
+    doc = parse_html(markup, backend=backend)
+    extract_notice_fields(doc, "https://bench.local/menu/board/info/x.do")
+    return doc
+
+
+def _measure(job: Callable, markup: str, backend: str, repeat: int) -> Dict[str, float]:
+    timings: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        job(markup, backend)
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    rss_before = _rss_bytes()
+    tracemalloc.start()
+    doc = job(markup, backend)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_delta = max(0, _rss_bytes() - rss_before)
+    del doc
+
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "p95_ms": sorted(timings)[max(0, int(len(timings) * 0.95) - 1)] * 1000,
+        "py_peak_kb": peak / 1024,
+        "rss_delta_kb": rss_delta / 1024,
+    }
+
+
+async def _fetch_samples(html_dir: Path, details_per_board: int):
+    from app.core.http import close_client, fetch_html
+
+    html_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        for category in NOTICE_CONFIGS:
+            list_url, info_url, seq = get_urls(category)
+            try:
+                markup = await fetch_html(list_url, params={"searchMenuSeq": seq})
+            except Exception as e:
+                print(f"skip {category}: {e}")
+                continue
+            (html_dir / f"list_{category}.html").write_text(markup, encoding="utf-8")
+
+            doc = parse_html(markup, strain=LIST_REGION)
+            detail_urls = list(extract_cms_list_rows(doc.select("div.tbody > ul"), info_url))
+            for i, url in enumerate(detail_urls[:details_per_board]):
+                try:
+                    detail = await fetch_html(url)
+                except Exception as e:
+                    print(f"skip detail {url}: {e}")
+                    continue
+                (html_dir / f"detail_{category}_{i}.html").write_text(detail, encoding="utf-8")
+            print(f"saved {category}")
+    finally:
+        await close_client()
+
+
+def run_benchmark(html_dir: Path, repeat: int, backends: List[str]):
+    files = sorted(html_dir.glob("*.html"))
+    if not files:
+        print(f"HTML 샘플이 없습니다: {html_dir} (--fetch로 먼저 저장하세요)")
+        return
+
+    totals: Dict[str, Dict[str, List[float]]] = {b: {"list": [], "detail": []} for b in backends}
+    header = f"{'page':<36} {'backend':<12} {'median ms':>10} {'p95 ms':>9} {'py peak KB':>11} {'rss Δ KB':>9}"
+    print(header)
+    print("-" * len(header))
+
+    for path in files:
+        markup = path.read_text(encoding="utf-8", errors="ignore")
+        kind = "list" if path.name.startswith("list_") else "detail"
+        job = _list_job if kind == "list" else _detail_job
+        for backend in backends:
+            m = _measure(job, markup, backend, repeat)
+            totals[backend][kind].append(m["median_ms"])
+            print(
+                f"{path.name[:36]:<36} {backend:<12} {m['median_ms']:>10.2f} {m['p95_ms']:>9.2f} "
+                f"{m['py_peak_kb']:>11.0f} {m['rss_delta_kb']:>9.0f}"
+            )
+
+    print("\n[요약] 페이지당 median 평균 (ms)")
+    for backend in backends:
+        lists, details = totals[backend]["list"], totals[backend]["detail"]
+        list_avg = statistics.mean(lists) if lists else 0.0
+        detail_avg = statistics.mean(details) if details else 0.0
+        print(f"  {backend:<12} list {list_avg:8.2f}   detail {detail_avg:8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 파서 백엔드 벤치마크")
+    parser.add_argument("--html-dir", type=Path, default=DEFAULT_HTML_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--backends", nargs="*", default=None, help=f"기본: {' '.join(available_backends())}")
+    parser.add_argument("--fetch", action="store_true", help="현재 게시판 HTML을 html-dir에 저장")
+    parser.add_argument("--details-per-board", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.fetch:
+        asyncio.run(_fetch_samples(args.html_dir, args.details_per_board))
+
+    backends = [b for b in (args.backends or available_backends()) if b in available_backends()]
+    run_benchmark(args.html_dir, max(1, args.repeat), backends)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# scripts/bench_push.py
+"""
+푸시 전송 벤치마크 (순차 전송 vs 동시 전송)
+
+모의 Expo 서버(scripts/mock_expo_server.py)에 메시지 N건(기본 20,000)을 push_dispatcher.dispatch로 보내
+동시 전송 수(--concurrency)별 처리량(msgs/sec)을 비교합니다. 동시 전송 1은 기존의 배치 순차 전송과 같습니다.
+--api-base를 주지 않으면 모의 서버를 하위 프로세스로 띄웁니다.
+
+사용법 (backend 디렉토리에서):
+    python -m scripts.bench_push
+    python -m scripts.bench_push --messages 50000 --concurrency 1 4 8 16 --latency 0.1 --error-rate 0.02
+    python -m scripts.bench_push --api-base http://127.0.0.1:8900/--/api/v2
+
+주의: 실제 Expo 주소로 실행하지 마세요.
+"""
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+import httpx
+
+from app.services import push_dispatcher
+
+
+async def _messages(n: int) -> AsyncIterator[Tuple[Dict[str, Any], int]]:
+    for i in range(n):
+        token = f"ExponentPushToken[bench-{i}]" if i % 500 else f"ExponentPushToken[unregistered-{i}]"
+        yield {"to": token, "title": "[벤치마크] 새 공지", "body": f"공지 {i}", "sound": "default"}, i
+
+
+async def _run(n: int, concurrency: int) -> Dict[str, Any]:
+    push_dispatcher.PUSH_MAX_CONCURRENCY = concurrency
+    await push_dispatcher.stop()  # 동시 연결 수에 맞춰 클라이언트를 다시 만듦
+
+    counts = {"ok": 0, "error": 0}
+
+    async def on_result(batch: List[Tuple[Dict[str, Any], Any]], tickets: List[Dict[str, Any]]):
+        for ticket in tickets:
+            counts["ok" if ticket.get("status") == "ok" else "error"] += 1
+
+    report = await push_dispatcher.dispatch(_messages(n), on_result)
+    return {**report, **counts}
+
+
+async def _wait_ready(api_base: str, timeout: float = 15.0):
+    root = api_base.split("/--/")[0]
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                await client.get(f"{root}/stats")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"모의 서버가 응답하지 않습니다: {root}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 6, 12])
+    parser.add_argument("--api-base", default=None, help="이미 띄운 모의 서버 주소 (없으면 직접 띄움)")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.05, help="직접 띄우는 모의 서버의 응답 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="직접 띄우는 모의 서버의 429/503 비율")
+    args = parser.parse_args()
+
+    server = None
+    api_base = args.api_base
+    if api_base is None:
+        api_base = f"http://127.0.0.1:{args.port}/--/api/v2"
+        server = subprocess.Popen([
+            sys.executable, "-m", "scripts.mock_expo_server",
+            "--port", str(args.port), "--latency", str(args.latency), "--error-rate", str(args.error_rate),
+        ])
+    push_dispatcher.EXPO_API_BASE = api_base.rstrip("/")
+
+    try:
+        await _wait_ready(api_base)
+        print(f"메시지 {args.messages:,}건, 배치 {push_dispatcher.PUSH_BATCH_SIZE}건, 서버 {api_base}")
+        print(f"{'동시 전송':>8} {'시간(s)':>9} {'msgs/sec':>10} {'ok':>8} {'error':>7}")
+        for concurrency in args.concurrency:
+            result = await _run(args.messages, concurrency)
+            print(f"{concurrency:>8} {result['seconds']:>9.2f} {result['messages_per_sec']:>10,.0f} {result['ok']:>8,} {result['error']:>7,}")
+        stats = push_dispatcher.get_stats()
+        print(f"요청 {stats['requests']:,}회, 재시도 {stats['retries']:,}회 (429 {stats['throttled']:,}회)")
+    finally:
+        await push_dispatcher.stop()
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,178 @@
+# scripts/bench_search.py
+"""
+공지 검색 벤치마크 (기존 ILIKE vs 검색 인덱스)
+
+합성 공지 N건(기본 100,000)을 넣은 DB에서 같은 검색어로
+  - 기존 경로: title ILIKE OR content ILIKE, 최신순
+  - 새 경로  : search_index.match_clause (최신순) / search_index.ranked_search (관련도 순)
+의 응답 시간 p50/p95를 비교합니다. 2글자 검색어는 trigram 인덱스를 쓸 수 없어 LIKE로 처리되는 경우입니다.
+
+사용법 (backend 디렉토리에서):
+    python -m scripts.bench_search                      # 임시 SQLite 파일 (FTS5 trigram)
+    python -m scripts.bench_search --rows 20000 --repeat 30
+    python -m scripts.bench_search --db-url postgresql+asyncpg://user:pw@localhost/bench_db
+
+주의: --db-url 로 준 DB의 bench 카테고리 공지는 시작/종료 시 삭제됩니다. 운영 DB에 실행하지 마세요.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import bulk
+from app.database.database import Base
+from app.database.models import Notice
+from app.services import search_index
+
+CATEGORY = "bench"
+
+_WORDS = [
+    "장학금", "수강신청", "졸업", "등록금", "계절학기", "기숙사", "채용", "인턴십", "공모전", "특강",
+    "학사일정", "휴학", "복학", "성적", "교환학생", "봉사활동", "설명회", "모집", "안내", "변경",
+    "신청", "마감", "제출", "서류", "면접", "합격자", "발표", "프로그램", "세미나", "워크숍",
+]
+
+# (라벨, 검색어) — 2글자는 LIKE 경로, 3글자 이상은 인덱스 경로
+QUERIES = [
+    ("2글자", "졸업"),
+    ("2글자", "특강"),
+    ("3글자+", "장학금"),
+    ("3글자+", "수강신청"),
+    ("3글자+", "교환학생 모집"),
+    ("3글자+ 희소", "희소키워드"),
+]
+
+
+def _rows(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    rnd = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    base = date(2025, 1, 1)
+    rows = []
+    for i in range(n):
+        title = " ".join(rnd.sample(_WORDS, 3)) + f" 공지 {i}"
+        body = " ".join(rnd.choice(_WORDS) for _ in range(60))
+        if i % 5000 == 0:
+            body += " 희소키워드"
+        rows.append({
+            "title": title,
+            "link": f"https://bench.local/info.do?encMenuBoardSeq={i}",
+            "date": base - timedelta(days=i % 1500),
+            "content": body,
+            "images": [],
+            "files": [],
+            "category": CATEGORY,
+            "univ_views": i % 500,
+            "app_views": 0,
+            "is_pinned": False,
+            "is_notified": True,
+            "crawled_at": now,
+        })
+    return rows
+
+
+async def _reset(sessionmaker: async_sessionmaker):
+    async with sessionmaker() as db:
+        await db.execute(delete(Notice).where(Notice.category == CATEGORY))
+        await db.commit()
+
+
+async def _fill(sessionmaker: async_sessionmaker, n: int):
+    rows = _rows(n)
+    started = time.perf_counter()
+    async with sessionmaker() as db:
+        for i in range(0, n, 5000):
+            await bulk.insert_notices(db, rows[i:i + 5000])
+        await db.commit()
+    print(f"합성 공지 {n}건 저장 {time.perf_counter() - started:.1f}초 (인덱스 동기화 포함)")
+
+
+def _feed(stmt, limit: int):
+    return (
+        stmt.where(Notice.category == CATEGORY)
+        .order_by(Notice.is_pinned.desc(), Notice.date.desc().nulls_last(), Notice.id.desc())
+        .limit(limit)
+    )
+
+
+async def _ilike(db: AsyncSession, q: str, limit: int):
+    pattern = f"%{q}%"
+    stmt = _feed(select(Notice).where(or_(Notice.title.ilike(pattern), Notice.content.ilike(pattern))), limit)
+    return (await db.execute(stmt)).scalars().all()
+
+
+async def _indexed(db: AsyncSession, q: str, limit: int):
+    stmt = _feed(select(Notice).where(search_index.match_clause(q)), limit)
+    return (await db.execute(stmt)).scalars().all()
+
+
+async def _ranked(db: AsyncSession, q: str, limit: int):
+    return await search_index.ranked_search(db, q, category=CATEGORY, limit=limit)
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def _measure(sessionmaker: async_sessionmaker, job, q: str, repeat: int, limit: int):
+    samples: List[float] = []
+    found = 0
+    async with sessionmaker() as db:
+        await job(db, q, limit)  # 워밍업
+        for _ in range(repeat):
+            started = time.perf_counter()
+            found = len(await job(db, q, limit))
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), _percentile(samples, 95), found
+
+
+async def run(db_url: str, rows: int, repeat: int, limit: int):
+    engine = create_async_engine(db_url)
+    sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with engine.begin() as conn:
+        await conn.run_sync(search_index.setup_search_index)
+    print(f"DB: {engine.dialect.name} / 검색 백엔드: {search_index.get_backend()}")
+
+    try:
+        await _reset(sessionmaker)
+        await _fill(sessionmaker, rows)
+
+        print(f"\n{'검색어':<16} {'경로':<14} {'p50(ms)':>9} {'p95(ms)':>9} {'결과':>5}")
+        for label, q in QUERIES:
+            for name, job in (("ILIKE", _ilike), ("index", _indexed), ("ranked", _ranked)):
+                p50, p95, found = await _measure(sessionmaker, job, q, repeat, limit)
+                print(f"{label + ' ' + q:<16} {name:<14} {p50:>9.2f} {p95:>9.2f} {found:>5}")
+        await _reset(sessionmaker)
+    finally:
+        await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="공지 검색 벤치마크")
+    parser.add_argument("--db-url", default=None, help="기본: 임시 SQLite 파일")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.db_url:
+        asyncio.run(run(args.db_url, args.rows, args.repeat, args.limit))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}", args.rows, args.repeat, args.limit))
+
+
+if __name__ == "__main__":
+    main()
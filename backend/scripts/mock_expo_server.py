@@ -0,0 +1,109 @@
+# scripts/mock_expo_server.py
+"""
+Expo 푸시 API 모의 서버 (부하 테스트용)
+
+/push/send, /push/getReceipts 를 흉내 냅니다.
+  - gzip 요청 본문(Content-Encoding: gzip) 처리
+  - --error-rate 비율로 429 / 503 응답 (Retry-After 포함)
+  - --latency 초만큼 응답 지연 (실제 Expo 왕복 시간 흉내)
+  - 토큰에 "unregistered"가 들어 있으면 DeviceNotRegistered 티켓/영수증
+
+사용법 (backend 디렉토리에서):
+    python -m scripts.mock_expo_server --port 8900 --latency 0.05 --error-rate 0.05
+    EXPO_API_BASE=http://127.0.0.1:8900/--/api/v2 python -m scripts.bench_push
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import random
+import uuid
+from typing import Any, Dict
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+UNREGISTERED_MARK = "unregistered"
+
+
+def create_app(latency: float = 0.0, error_rate: float = 0.0) -> FastAPI:
+    app = FastAPI(title="Mock Expo Push API")
+    tickets: Dict[str, str] = {}  # 티켓 id → 토큰
+    stats: Dict[str, int] = {"requests": 0, "messages": 0, "throttled": 0}
+
+    async def read_json(request: Request) -> Any:
+        body = await request.body()
+        if request.headers.get("content-encoding") == "gzip":
+            body = gzip.decompress(body)
+        return json.loads(body)
+
+    def unavailable():
+        if error_rate and random.random() < error_rate:
+            status = random.choice([429, 503])
+            stats["throttled"] += 1
+            return JSONResponse({"errors": [{"code": "TOO_MANY_REQUESTS"}]}, status_code=status, headers={"Retry-After": "0.1"})
+        return None
+
+    @app.post("/--/api/v2/push/send")
+    async def send(request: Request):
+        stats["requests"] += 1
+        if latency:
+            await asyncio.sleep(latency)
+        error = unavailable()
+        if error is not None:
+            return error
+
+        messages = await read_json(request)
+        if isinstance(messages, dict):
+            messages = [messages]
+        if len(messages) > 100:
+            return JSONResponse({"errors": [{"code": "PUSH_TOO_MANY_NOTIFICATIONS"}]}, status_code=400)
+
+        data = []
+        for message in messages:
+            token = str(message.get("to", ""))
+            if UNREGISTERED_MARK in token:
+                data.append({"status": "error", "message": "not registered", "details": {"error": "DeviceNotRegistered"}})
+                continue
+            ticket_id = str(uuid.uuid4())
+            tickets[ticket_id] = token
+            data.append({"status": "ok", "id": ticket_id})
+        stats["messages"] += len(messages)
+        return {"data": data}
+
+    @app.post("/--/api/v2/push/getReceipts")
+    async def get_receipts(request: Request):
+        stats["requests"] += 1
+        error = unavailable()
+        if error is not None:
+            return error
+
+        ids = (await read_json(request)).get("ids") or []
+        data = {}
+        for ticket_id in ids:
+            token = tickets.pop(ticket_id, None)
+            if token is None:
+                continue
+            data[ticket_id] = {"status": "ok"}
+        return {"data": data}
+
+    @app.get("/stats")
+    async def get_stats():
+        return {**stats, "open_tickets": len(tickets)}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.05, help="응답 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429/503 응답 비율 (0~1)")
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency, args.error_rate), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# tests/conftest.py
+"""
+테스트 공통 설정
+
+app 모듈은 import 시점에 DATABASE_URL로 엔진을 만들므로, app을 import하기 전에
+임시 SQLite 파일을 가리키도록 환경 변수를 먼저 설정합니다.
+pytest-asyncio 없이 동기 테스트에서 run()으로 코루틴을 실행합니다.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(prefix="knoti-test-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from app.database.database import engine, init_db  # noqa: E402
+
+
+def run(coro):
+    """코루틴을 새 이벤트 루프에서 실행하고, 루프에 묶인 풀 연결은 닫습니다."""
+    async def _main():
+        try:
+            return await coro
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(_main())
+
+
+@pytest.fixture
+def db_path():
+    """DB 파일을 지운 뒤 경로를 돌려줍니다. (기존 스키마를 흉내 낸 뒤 init_db를 직접 부를 때)"""
+    if os.path.exists(_DB_PATH):
+        os.remove(_DB_PATH)
+    return _DB_PATH
+
+
+@pytest.fixture
+def fresh_db(db_path):
+    """테스트마다 빈 DB 파일로 시작합니다. (검색 인덱스 테이블/트리거까지 새로 만듦)"""
+    run(init_db())
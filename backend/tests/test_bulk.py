@@ -0,0 +1,80 @@
+# tests/test_bulk.py
+"""bulk: INSERT ... ON CONFLICT 기반 대량 저장"""
+from sqlalchemy import func, select
+
+from app.database import bulk
+from app.database.database import AsyncSessionLocal
+from app.database.models import Device, Notice, NotificationHistory, NotificationOutbox
+from conftest import run
+
+
+def _notice(i, category="academic", **extra):
+    row = {"title": f"공지 {i}", "link": f"https://example.com/{i}", "category": category, "content": "본문"}
+    row.update(extra)
+    return row
+
+
+def test_insert_notices_skips_conflicts_and_returns_new_rows(fresh_db):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            first = await bulk.insert_notices(db, [_notice(i) for i in range(3)])
+            # 1, 2는 이미 있음 / 같은 link라도 카테고리가 다르면 새 공지
+            second = await bulk.insert_notices(db, [_notice(1), _notice(2), _notice(3), _notice(1, category="event")])
+            await db.commit()
+            total = (await db.execute(select(func.count(Notice.id)))).scalar()
+        return first, second, total
+
+    first, second, total = run(scenario())
+    assert [link for _, link in first] == [f"https://example.com/{i}" for i in range(3)]
+    assert sorted(link for _, link in second) == ["https://example.com/1", "https://example.com/3"]
+    assert total == 5
+
+
+def test_insert_notices_update_columns(fresh_db):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await bulk.insert_notices(db, [_notice(1)])
+            updated = await bulk.insert_notices(db, [_notice(1, title="수정된 제목")], update_columns=["title"])
+            await db.commit()
+            title = (await db.execute(select(Notice.title))).scalar()
+        return updated, title
+
+    updated, title = run(scenario())
+    assert len(updated) == 1
+    assert title == "수정된 제목"
+
+
+def test_insert_notices_chunks_large_batches(fresh_db, monkeypatch):
+    monkeypatch.setattr(bulk, "INSERT_CHUNK_SIZE", 7)
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            saved = await bulk.insert_notices(db, [_notice(i) for i in range(50)])
+            await db.commit()
+        return saved
+
+    saved = run(scenario())
+    assert len(saved) == 50
+    assert len({notice_id for notice_id, _ in saved}) == 50
+
+
+def test_history_and_outbox_ignore_duplicates(fresh_db):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            saved = await bulk.insert_notices(db, [_notice(i) for i in range(2)])
+            notice_ids = [notice_id for notice_id, _ in saved]
+            db.add_all([Device(token=f"ExponentPushToken[{i}]") for i in range(2)])
+            await db.flush()
+            device_ids = (await db.execute(select(Device.id))).scalars().all()
+
+            rows = [{"device_id": d, "notice_id": n} for d in device_ids for n in notice_ids]
+            await bulk.insert_notification_history(db, rows)
+            await bulk.insert_notification_history(db, rows[:2])
+            await bulk.enqueue_notifications(db, notice_ids)
+            await bulk.enqueue_notifications(db, notice_ids)
+            await db.commit()
+            history = (await db.execute(select(func.count(NotificationHistory.id)))).scalar()
+            outbox = (await db.execute(select(func.count(NotificationOutbox.id)))).scalar()
+        return history, outbox
+
+    assert run(scenario()) == (4, 2)
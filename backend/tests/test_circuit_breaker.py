@@ -0,0 +1,146 @@
+# tests/test_circuit_breaker.py
+"""호스트별 회로 차단기 / 적응형 타임아웃"""
+import time
+
+import httpx
+import pytest
+
+from app.core import http
+from conftest import run
+
+
+@pytest.fixture
+def mock_host(monkeypatch):
+    """호스트 상태를 비우고, 요청은 handler가 돌려주는 응답으로 대신합니다."""
+    monkeypatch.setattr(http, "_host_health", {})
+    monkeypatch.setattr(http, "_host_limiters", {})
+    monkeypatch.setattr(http, "_host_semaphores", {})
+    # 회로 동작만 보도록 속도 제한은 사실상 끔
+    monkeypatch.setattr(http, "HOST_RATE_START", 1000.0)
+    monkeypatch.setattr(http, "HOST_RATE_MAX", 1000.0)
+    seen = []
+    behaviour = {"status": 200}
+
+    async def handler(request):
+        seen.append(request.extensions["timeout"]["read"])
+        if behaviour["status"] == "timeout":
+            raise httpx.ReadTimeout("timeout", request=request)
+        return httpx.Response(behaviour["status"], text="ok")
+
+    monkeypatch.setattr(http, "_global_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return behaviour, seen
+
+
+def _expire_cooldown(health):
+    health.opened_at = time.monotonic() - health.cooldown - 1
+
+
+def test_opens_after_consecutive_failures():
+    health = http.HostHealth("example.com")
+    for _ in range(http.CIRCUIT_FAILURE_THRESHOLD - 1):
+        health.record_failure()
+    health.record_success(0.1)
+    assert health.consecutive_failures == 0
+
+    for _ in range(http.CIRCUIT_FAILURE_THRESHOLD):
+        health.record_failure()
+    assert health.state == "open"
+    with pytest.raises(http.CircuitOpenError):
+        health.acquire()
+    assert health.rejected == 1
+
+
+def test_half_open_allows_one_probe_and_backs_off_on_failure():
+    health = http.HostHealth("example.com")
+    for _ in range(http.CIRCUIT_FAILURE_THRESHOLD):
+        health.record_failure()
+    _expire_cooldown(health)
+
+    assert health.acquire() is True
+    assert health.state == "half_open"
+    with pytest.raises(http.CircuitOpenError):
+        health.acquire()
+
+    health.probing = False
+    health.record_failure()
+    assert health.state == "open"
+    assert health.cooldown == min(http.CIRCUIT_COOLDOWN_MAX, http.CIRCUIT_COOLDOWN * 2)
+
+
+def test_probe_success_closes_and_resets_cooldown():
+    health = http.HostHealth("example.com")
+    for _ in range(http.CIRCUIT_FAILURE_THRESHOLD):
+        health.record_failure()
+    health.cooldown = http.CIRCUIT_COOLDOWN * 4
+    _expire_cooldown(health)
+
+    assert health.acquire() is True
+    health.probing = False
+    health.record_success(0.2)
+    assert health.state == "closed"
+    assert health.cooldown == http.CIRCUIT_COOLDOWN
+    assert health.acquire() is False
+
+
+def test_adaptive_timeout_tracks_latency_and_timeouts():
+    health = http.HostHealth("example.com")
+    assert health.timeout(15.0) == 15.0  # 표본이 적으면 요청 타임아웃 그대로
+
+    for _ in range(http.LATENCY_MIN_SAMPLES):
+        health.record_success(0.1)
+    assert health.timeout(15.0) == max(http.ADAPTIVE_TIMEOUT_MIN, 0.1 * http.ADAPTIVE_TIMEOUT_MULTIPLIER)
+
+    # 타임아웃은 그 값을 응답 시간 표본으로 넣어 다음 타임아웃이 늘어나게 함
+    for _ in range(http.LATENCY_MIN_SAMPLES):
+        health.record_failure(timed_out_after=5.0)
+        health.consecutive_failures = 0
+    assert health.timeout(15.0) == 15.0
+
+    # 회로가 열리면 지난 표본은 버림
+    for _ in range(http.CIRCUIT_FAILURE_THRESHOLD):
+        health.record_failure()
+    assert len(health.latencies) == 0
+
+
+def test_request_get_short_circuits_and_probes_with_full_timeout(mock_host):
+    behaviour, seen = mock_host
+
+    async def scenario():
+        for _ in range(http.LATENCY_MIN_SAMPLES + 1):
+            await http.request_get("http://example.com/ok", timeout=15.0)
+        adaptive = seen[-1]
+
+        behaviour["status"] = 503
+        for _ in range(http.CIRCUIT_FAILURE_THRESHOLD):
+            await http.request_get("http://example.com/down", timeout=15.0)
+        sent = len(seen)
+        with pytest.raises(http.CircuitOpenError):
+            await http.request_get("http://example.com/down", timeout=15.0)
+        rejected_without_request = len(seen) == sent
+
+        health = http.get_host_health("example.com")
+        _expire_cooldown(health)
+        behaviour["status"] = 200
+        await http.request_get("http://example.com/ok", timeout=15.0)
+        return adaptive, rejected_without_request, seen[-1], health.state
+
+    adaptive, rejected_without_request, probe_timeout, state = run(scenario())
+    assert adaptive < 15.0
+    assert rejected_without_request
+    assert probe_timeout == 15.0
+    assert state == "closed"
+
+
+def test_request_get_counts_timeouts(mock_host):
+    behaviour, _ = mock_host
+    behaviour["status"] = "timeout"
+
+    async def scenario():
+        for _ in range(http.CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises(httpx.TimeoutException):
+                await http.request_get("http://example.com/slow", timeout=2.0)
+        return http.get_host_health("example.com")
+
+    health = run(scenario())
+    assert health.state == "open"
+    assert health.failures == http.CIRCUIT_FAILURE_THRESHOLD
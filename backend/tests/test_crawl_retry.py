@@ -0,0 +1,119 @@
+# tests/test_crawl_retry.py
+"""상세 수집 실패 재시도 대기열"""
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.database.database import AsyncSessionLocal, init_db
+from app.database.models import CrawlFailureLog
+from app.services import crawl_retry
+from conftest import run
+
+
+def _failure(url, **extra):
+    failure = {"url": url, "category": "academic", "list_title": f"제목 {url}", "is_pinned": False, "error": "timeout"}
+    failure.update(extra)
+    return failure
+
+
+async def _rows():
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(CrawlFailureLog).order_by(CrawlFailureLog.url))
+        return list(result.scalars().all())
+
+
+def test_record_failures_inserts_then_counts_retries(fresh_db):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            # 같은 호출 안에서 겹친 URL은 한 번만 기록
+            await crawl_retry.record_failures(db, [_failure("u1"), _failure("u1", error="again"), _failure("u2", notify=False)])
+            await db.commit()
+        first = await _rows()
+        async with AsyncSessionLocal() as db:
+            await crawl_retry.record_failures(db, [_failure("u1", error="503")])
+            await db.commit()
+        return first, await _rows()
+
+    first, second = run(scenario())
+    assert [(r.url, r.retry_count, r.notify) for r in first] == [("u1", 0, True), ("u2", 0, False)]
+    assert all(r.next_retry_at is not None for r in first)
+    u1 = second[0]
+    assert (u1.retry_count, u1.error_message) == (1, "503")
+    assert u1.last_retry_at is not None
+    assert second[1].retry_count == 0
+
+
+def test_gives_up_after_max_attempts(fresh_db, monkeypatch):
+    monkeypatch.setattr(crawl_retry, "CRAWL_RETRY_MAX_ATTEMPTS", 2)
+
+    async def scenario():
+        for _ in range(3):
+            async with AsyncSessionLocal() as db:
+                await crawl_retry.record_failures(db, [_failure("u1")])
+                await db.commit()
+        async with AsyncSessionLocal() as db:
+            blocked = await crawl_retry.blocked_urls(db, "academic", ["u1", "u2"])
+            due = await crawl_retry.due(db)
+        return (await _rows())[0], blocked, due
+
+    row, blocked, due = run(scenario())
+    assert row.retry_count == 2
+    assert row.next_retry_at is None
+    # 포기한 URL은 정기 크롤링에서도 건너뛰고 재시도 대상도 아님
+    assert blocked == {"u1"}
+    assert due == []
+
+
+def test_due_and_resolve(fresh_db):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await crawl_retry.record_failures(db, [_failure("u1"), _failure("u2")])
+            await db.execute(
+                update(CrawlFailureLog)
+                .where(CrawlFailureLog.url == "u1")
+                .values(next_retry_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+            )
+            await db.commit()
+        async with AsyncSessionLocal() as db:
+            due = [row.url for row in await crawl_retry.due(db)]
+            blocked = await crawl_retry.blocked_urls(db, "academic", ["u1", "u2"])
+            await crawl_retry.resolve(db, [("u1", "academic")])
+            await db.commit()
+        return due, blocked, [row.url for row in await _rows()]
+
+    due, blocked, left = run(scenario())
+    assert due == ["u1"]
+    assert blocked == {"u2"}
+    assert left == ["u2"]
+
+
+def test_backoff_grows_and_is_capped():
+    assert 0.8 * crawl_retry.CRAWL_RETRY_BASE <= crawl_retry.backoff(0) <= 1.2 * crawl_retry.CRAWL_RETRY_BASE
+    assert crawl_retry.backoff(3) >= 0.8 * crawl_retry.CRAWL_RETRY_BASE * 8
+    assert crawl_retry.backoff(50) <= 1.2 * crawl_retry.CRAWL_RETRY_MAX_DELAY
+
+
+def test_init_db_dedupes_legacy_rows_before_unique_index(db_path):
+    # (url, category) 유니크 인덱스가 생기기 전의 테이블에 남은 중복 행
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE crawl_failures (id INTEGER PRIMARY KEY, url VARCHAR, category VARCHAR, "
+        "error_message TEXT, retry_count INTEGER, created_at DATETIME, last_retry_at DATETIME)"
+    )
+    conn.executemany(
+        "INSERT INTO crawl_failures (url, category, error_message, retry_count) VALUES (?, ?, ?, 0)",
+        [("u1", "academic", "old"), ("u1", "academic", "new"), ("u2", "academic", "e")],
+    )
+    conn.commit()
+    conn.close()
+
+    async def scenario():
+        await init_db()
+        async with AsyncSessionLocal() as db:
+            await crawl_retry.record_failures(db, [_failure("u1")])
+            await db.commit()
+        return await _rows()
+
+    rows = run(scenario())
+    assert [(r.url, r.error_message, r.retry_count) for r in rows] == [("u1", "timeout", 1), ("u2", "e", 0)]
@@ -0,0 +1,99 @@
+# tests/test_crawl_sync.py
+"""정기 크롤링: 워터마크는 목록 처리가 끝까지 성공했을 때만 올라감"""
+import pytest
+from sqlalchemy import func, select
+
+from app.database import bulk
+from app.database.database import AsyncSessionLocal
+from app.database.models import CrawlWatermark, Notice
+from app.services import crawl_watermark, knu_notice_service
+from conftest import run
+
+CATEGORY = "academic"
+
+
+def _page(seqs, pinned=()):
+    rows = {}
+    for seq in pinned:
+        rows[f"https://example.com/notice/{seq}"] = {"title": f"필독 {seq}", "is_pinned": True, "seq": str(seq)}
+    for seq in seqs:
+        rows[f"https://example.com/notice/{seq}"] = {"title": f"공지 {seq}", "is_pinned": False, "seq": str(seq)}
+    return rows
+
+
+@pytest.fixture
+def site(monkeypatch):
+    """목록 1페이지 / 이어지는 페이지 / 상세 수집을 흉내 냅니다."""
+    state = {"first_page": {}, "older_pages": {}, "down_pages": set()}
+    monkeypatch.setattr(crawl_watermark, "_cache", {})
+
+    async def crawl_list(category, watermark=None):
+        return state["first_page"], f"digest-{len(state['first_page'])}-{sorted(state['first_page'])}"
+
+    async def fetch_page(category, page):
+        if page in state["down_pages"]:
+            raise ConnectionError(f"page {page} down")
+        return state["older_pages"].get(page, {})
+
+    async def scrape(url):
+        return {"title": url.rsplit("/", 1)[-1], "texts": ["본문입니다"], "images": [], "files": []}
+
+    monkeypatch.setattr(knu_notice_service, "_crawl_main_cms_list", crawl_list)
+    monkeypatch.setattr(knu_notice_service, "fetch_cms_list_page", fetch_page)
+    monkeypatch.setattr(knu_notice_service, "scrape_detail", scrape)
+    return state
+
+
+async def _sweep():
+    async with AsyncSessionLocal() as db:
+        await knu_notice_service.crawl_and_sync_notices(db, CATEGORY)
+    async with AsyncSessionLocal() as db:
+        watermark = await db.get(CrawlWatermark, CATEGORY)
+        count = (await db.execute(select(func.count(Notice.id)))).scalar()
+        pinned = set((await db.execute(select(Notice.link).where(Notice.is_pinned.is_(True)))).scalars())
+    return watermark, count, pinned
+
+
+def test_older_page_failure_keeps_watermark(fresh_db, site):
+    site["first_page"] = _page(range(10, 0, -1))
+    watermark, count, _ = run(_sweep())
+    assert (watermark.last_board_seq, count) == ("10", 10)
+
+    # 서버 중단 뒤: 1페이지가 전부 신규이고 2페이지를 못 가져옴
+    site["first_page"] = _page(range(30, 20, -1))
+    site["older_pages"] = {2: _page(range(20, 10, -1)), 3: _page(range(10, 0, -1))}
+    site["down_pages"] = {2}
+    watermark, count, _ = run(_sweep())
+    assert watermark.last_board_seq == "10"
+    assert count == 20  # 받아 둔 1페이지 후보는 저장
+
+    # 다음 스윕에서 같은 구간을 다시 읽어 밀린 공지를 채움
+    site["down_pages"] = set()
+    watermark, count, _ = run(_sweep())
+    assert watermark.last_board_seq == "30"
+    assert count == 30
+
+
+def test_pin_reconcile_failure_keeps_pinned_digest(fresh_db, site, monkeypatch):
+    site["first_page"] = _page(range(5, 0, -1))
+    watermark, _, pinned = run(_sweep())
+    old_digest = watermark.pinned_digest
+    assert pinned == set()
+
+    # 이미 저장된 공지 3이 필독으로 바뀌었는데 재정리가 실패
+    site["first_page"] = _page([5, 4, 2, 1], pinned=[3])
+    original = bulk.reconcile_pins
+
+    async def broken(*args, **kwargs):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(bulk, "reconcile_pins", broken)
+    watermark, _, pinned = run(_sweep())
+    assert watermark.pinned_digest == old_digest
+    assert pinned == set()
+
+    # 다이제스트가 그대로라 다음 스윕이 다시 재정리함
+    monkeypatch.setattr(bulk, "reconcile_pins", original)
+    watermark, _, pinned = run(_sweep())
+    assert pinned == {"https://example.com/notice/3"}
+    assert watermark.pinned_digest == crawl_watermark.pinned_digest(site["first_page"])
@@ -0,0 +1,54 @@
+# tests/test_extraction_plan.py
+"""상세 페이지 단일 순회 추출기: 도메인별 학습 계획"""
+from datetime import date
+
+import pytest
+
+from app.core.html_parser import parse_html
+from app.services import extraction_plan
+
+PAGE_WITHOUT_DATE = """
+<html><body>
+  <h3 class="title">날짜 없는 공지</h3>
+  <div class="content_view"><p>첫 번째 본문입니다</p></div>
+</body></html>
+"""
+
+PAGE_WITH_DATE = """
+<html><body>
+  <h3 class="title">날짜 있는 공지</h3>
+  <div class="date">작성일 2025.03.04 조회수 17</div>
+  <div class="content_view"><p>두 번째 본문입니다</p></div>
+</body></html>
+"""
+
+
+@pytest.fixture(autouse=True)
+def clear_learned(monkeypatch):
+    monkeypatch.setattr(extraction_plan, "_learned", {})
+    monkeypatch.setattr(extraction_plan, "_learned_plans", {})
+
+
+def _extract(markup, url):
+    return extraction_plan.extract_with_plan(parse_html(markup, backend="html.parser"), url, "main_cms")
+
+
+def test_field_missing_from_first_page_is_still_found():
+    first = _extract(PAGE_WITHOUT_DATE, "https://example.com/board/1")
+    assert first["date"] is None
+    assert extraction_plan.FIELD_DATE not in extraction_plan._learned["example.com"]
+
+    second = _extract(PAGE_WITH_DATE, "https://example.com/board/2")
+    assert second["title"] == "날짜 있는 공지"
+    assert second["date"] == date(2025, 3, 4)
+    assert second["univ_views"] == 17
+    # 새로 찾은 필드는 학습에 더함
+    assert extraction_plan._learned["example.com"][extraction_plan.FIELD_DATE] == ".date"
+
+
+def test_learned_plan_matches_fresh_extraction():
+    _extract(PAGE_WITH_DATE, "https://example.com/board/2")
+    learned = _extract(PAGE_WITH_DATE, "https://example.com/board/3")
+    extraction_plan._learned.clear()
+    extraction_plan._learned_plans.clear()
+    assert learned == _extract(PAGE_WITH_DATE, "https://example.com/board/3")
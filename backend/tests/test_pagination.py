@@ -0,0 +1,80 @@
+# tests/test_pagination.py
+"""목록 API 키셋(커서) 페이지네이션"""
+import random
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.database import bulk
+from app.database.database import AsyncSessionLocal
+from app.services import knu_notice_service
+from app.utils.pagination import decode_cursor, encode_cursor, next_cursor_for
+from conftest import run
+
+
+def _rows(count=300):
+    rng = random.Random(7)
+    rows = []
+    for i in range(count):
+        rows.append({
+            "title": f"공지 {i}",
+            "link": f"https://example.com/{i}",
+            "category": rng.choice(["academic", "event"]),
+            "content": "본문",
+            # 날짜 없는 공지, 같은 날짜/조회수가 겹치는 공지, 필독 공지를 섞음
+            "date": None if i % 9 == 0 else date(2025, 1, 1) + timedelta(days=i % 15),
+            "univ_views": rng.randint(0, 4),
+            "is_pinned": i % 31 == 0,
+        })
+    return rows
+
+
+def _walk(category, sort_by, size):
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            full = await knu_notice_service.search_notices(db, category, limit=10_000, sort_by=sort_by)
+            paged, cursor, pages = [], None, 0
+            while True:
+                page = await knu_notice_service.search_notices(
+                    db, category, limit=size, sort_by=sort_by, cursor=decode_cursor(cursor, sort_by)
+                )
+                paged.extend(page)
+                pages += 1
+                cursor = next_cursor_for(page, size, sort_by)
+                if cursor is None:
+                    break
+        return [n.id for n in full], [n.id for n in paged], pages
+
+    return run(scenario())
+
+
+@pytest.mark.parametrize("category", ["all", "academic"])
+@pytest.mark.parametrize("sort_by", ["date", "views"])
+def test_cursor_pages_match_full_ordering(fresh_db, category, sort_by):
+    async def seed():
+        async with AsyncSessionLocal() as db:
+            await bulk.insert_notices(db, _rows())
+            await db.commit()
+
+    run(seed())
+    full, paged, pages = _walk(category, sort_by, size=23)
+    assert paged == full
+    assert len(set(paged)) == len(paged)
+    assert pages == len(full) // 23 + 1
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("date", True, date(2025, 3, 1), 42)
+    assert decode_cursor(cursor, "date") == {"is_pinned": True, "key": date(2025, 3, 1), "id": 42}
+    assert decode_cursor(encode_cursor("views", False, None, 7), "views") == {"is_pinned": False, "key": None, "id": 7}
+    assert decode_cursor(None, "date") is None
+
+
+def test_cursor_rejects_other_sort_and_garbage():
+    cursor = encode_cursor("date", False, date(2025, 3, 1), 42)
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, "views")
+    assert exc.value.status_code == 400
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor", "date")
@@ -0,0 +1,113 @@
+# tests/test_push_outbox.py
+"""알림 대기열(outbox): 가져가기(claim) / 임대 만료 / 재시도"""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.database import bulk
+from app.database.database import AsyncSessionLocal
+from app.database.models import NotificationOutbox
+from app.services import push_outbox
+from conftest import run
+
+
+async def _enqueue(count):
+    async with AsyncSessionLocal() as db:
+        saved = await bulk.insert_notices(db, [
+            {"title": f"공지 {i}", "link": f"https://example.com/{i}", "category": "academic", "content": "본문"}
+            for i in range(count)
+        ])
+        notice_ids = [notice_id for notice_id, _ in saved]
+        await bulk.enqueue_notifications(db, notice_ids)
+        await db.commit()
+    return notice_ids
+
+
+async def _rows():
+    async with AsyncSessionLocal() as db:
+        return list((await db.execute(select(NotificationOutbox).order_by(NotificationOutbox.id))).scalars().all())
+
+
+def test_claim_takes_each_item_once(fresh_db):
+    async def scenario():
+        notice_ids = await _enqueue(2)
+        claims = [await push_outbox._claim() for _ in range(3)]
+        return notice_ids, claims, await _rows()
+
+    notice_ids, claims, rows = run(scenario())
+    assert [c[1] for c in claims[:2]] == notice_ids
+    assert [c[2] for c in claims[:2]] == [1, 1]
+    assert claims[2] is None
+    assert all(row.status == push_outbox.STATUS_PROCESSING and row.locked_at is not None for row in rows)
+
+
+def test_claim_waits_for_available_at(fresh_db):
+    async def scenario():
+        await _enqueue(1)
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(NotificationOutbox).values(
+                available_at=datetime.now(timezone.utc) + timedelta(minutes=5)
+            ))
+            await db.commit()
+        return await push_outbox._claim()
+
+    assert run(scenario()) is None
+
+
+def test_expired_lease_is_reclaimed(fresh_db):
+    async def scenario():
+        await _enqueue(1)
+        first = await push_outbox._claim()
+        # 임대 중에는 다른 워커가 가져가지 못함
+        while_leased = await push_outbox._claim()
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(NotificationOutbox).values(
+                locked_at=datetime.now(timezone.utc) - timedelta(seconds=push_outbox.PUSH_OUTBOX_LEASE + 1)
+            ))
+            await db.commit()
+        reclaimed = await push_outbox._claim()
+        return first, while_leased, reclaimed
+
+    first, while_leased, reclaimed = run(scenario())
+    assert while_leased is None
+    assert reclaimed[0] == first[0]
+    assert reclaimed[2] == 2  # 시도 횟수 증가
+
+
+def test_finish_retries_with_backoff_then_gives_up(fresh_db, monkeypatch):
+    monkeypatch.setattr(push_outbox, "PUSH_OUTBOX_MAX_ATTEMPTS", 2)
+
+    async def scenario():
+        await _enqueue(1)
+        outbox_id, notice_id, attempts = await push_outbox._claim()
+        await push_outbox._finish(outbox_id, notice_id, attempts, "일시적 전송 실패 1건")
+        retried = (await _rows())[0]
+        # 백오프 중에는 가져가지 않음
+        during_backoff = await push_outbox._claim()
+        async with AsyncSessionLocal() as db:
+            await db.execute(update(NotificationOutbox).values(available_at=datetime.now(timezone.utc)))
+            await db.commit()
+        outbox_id, notice_id, attempts = await push_outbox._claim()
+        await push_outbox._finish(outbox_id, notice_id, attempts, "일시적 전송 실패 1건")
+        return retried, during_backoff, attempts, (await _rows())[0]
+
+    retried, during_backoff, attempts, final = run(scenario())
+    assert retried.status == push_outbox.STATUS_PENDING
+    assert retried.locked_at is None
+    assert retried.last_error == "일시적 전송 실패 1건"
+    assert during_backoff is None
+    assert attempts == 2
+    assert final.status == push_outbox.STATUS_FAILED
+
+
+def test_finish_marks_done(fresh_db):
+    async def scenario():
+        await _enqueue(1)
+        job = await push_outbox._claim()
+        await push_outbox._finish(*job, None)
+        return (await _rows())[0], await push_outbox._claim()
+
+    row, next_claim = run(scenario())
+    assert row.status == push_outbox.STATUS_DONE
+    assert row.locked_at is None
+    assert next_claim is None
@@ -0,0 +1,155 @@
+# tests/test_rate_limiter.py
+"""호스트별 요청 속도 제한 (토큰 버킷, AIMD)"""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core import http
+from conftest import run
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    monkeypatch.setattr(http, "HOST_RATE_START", 2.0)
+    monkeypatch.setattr(http, "HOST_RATE_MAX", 10.0)
+    monkeypatch.setattr(http, "HOST_RATE_MIN", 0.2)
+    monkeypatch.setattr(http, "HOST_RATE_INCREASE", 0.5)
+    return http.HostRateLimiter("example.com")
+
+
+def test_additive_increase_up_to_max(limiter):
+    assert limiter.rate == 2.0
+    limiter.on_success(0.1)
+    assert limiter.rate == 2.5
+    for _ in range(100):
+        limiter.on_success(0.1)
+    assert limiter.rate == 10.0
+
+
+def test_host_cap_from_config(monkeypatch):
+    monkeypatch.setattr(http, "HOST_RATE_LIMITS", {"slow.example.com": 1.0})
+    capped = http.HostRateLimiter("slow.example.com")
+    assert capped.max_rate == 1.0
+    assert capped.rate == 1.0
+    capped.on_success(0.1)
+    assert capped.rate == 1.0
+
+
+def test_multiplicative_decrease_once_per_interval(limiter):
+    limiter.rate = 8.0
+    limiter.on_throttle("HTTP 429")
+    limiter.on_throttle("HTTP 429")  # 같은 구간의 감속 신호는 한 번만 반영
+    assert limiter.rate == 4.0
+    assert limiter.throttled == 2
+    assert limiter.decreases == 1
+
+    limiter.last_decrease -= http.HOST_RATE_DECREASE_INTERVAL
+    limiter.on_success(http.HOST_RATE_SLOW_LATENCY + 1)  # 느린 응답도 감속 신호
+    assert limiter.rate == 2.0
+
+    for _ in range(20):
+        limiter.last_decrease -= http.HOST_RATE_DECREASE_INTERVAL
+        limiter.on_throttle("타임아웃")
+    assert limiter.rate == http.HOST_RATE_MIN
+
+
+def test_retry_after_pauses(limiter):
+    limiter.on_throttle("HTTP 503", "2")
+    assert 1.5 < limiter.paused_until - time.monotonic() <= 2.0
+
+    limiter.last_decrease -= http.HOST_RATE_DECREASE_INTERVAL
+    paused_until = limiter.paused_until
+    limiter.on_throttle("HTTP 429", "Wed, 21 Oct 2015 07:28:00 GMT")  # 날짜 형식은 감속만
+    assert limiter.paused_until == paused_until
+    assert limiter.decreases == 2
+
+
+def test_acquire_spaces_requests(limiter):
+    limiter.rate = 50.0
+
+    async def scenario():
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(11)))
+        return time.monotonic() - started
+
+    # 버스트 1초 분량(토큰 1개로 시작) 뒤로는 1/rate 간격
+    assert run(scenario()) >= 9 / 50.0
+
+
+def test_take_borrows_without_waiting(limiter):
+    limiter.rate = 2.0
+    started = time.monotonic()
+    for _ in range(10):
+        limiter.take()
+    assert time.monotonic() - started < 0.05
+    # 빚은 최대 1초 분량까지만
+    assert limiter.tokens == -2.0
+    assert limiter.priority_requests == 10
+
+
+def test_priority_request_skips_queue_and_pause(monkeypatch):
+    monkeypatch.setattr(http, "_host_health", {})
+    monkeypatch.setattr(http, "_host_limiters", {})
+    monkeypatch.setattr(http, "_host_semaphores", {})
+    statuses = {"/busy": 429}
+
+    async def handler(request):
+        status = statuses.get(request.url.path, 200)
+        return httpx.Response(status, headers={"Retry-After": "30"} if status == 429 else {})
+
+    monkeypatch.setattr(http, "_global_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    async def scenario():
+        await http.request_get("http://example.com/busy")
+        limiter = http.get_host_limiter("example.com")
+        paused = limiter.paused_until - time.monotonic()
+        throttled_rate = limiter.rate
+        started = time.monotonic()
+        response = await http.request_get("http://example.com/detail", priority=True)
+        elapsed = time.monotonic() - started
+        # 우선 요청이 아니면 Retry-After 동안 기다림
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(http.request_get("http://example.com/list"), timeout=0.2)
+        return limiter, paused, throttled_rate, response.status_code, elapsed
+
+    limiter, paused, throttled_rate, status, elapsed = run(scenario())
+    assert paused > 25
+    assert throttled_rate == min(http.HOST_RATE_START, http.HOST_RATE_MAX) / 2
+    assert status == 200
+    assert elapsed < 0.5
+    assert limiter.priority_requests == 1
+
+
+def test_open_circuit_fails_before_waiting_for_a_token(monkeypatch):
+    monkeypatch.setattr(http, "_host_health", {})
+    monkeypatch.setattr(http, "_host_limiters", {})
+    monkeypatch.setattr(http, "_host_semaphores", {})
+    sent = []
+
+    async def handler(request):
+        sent.append(request.url)
+        return httpx.Response(200)
+
+    monkeypatch.setattr(http, "_global_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    # 죽은 호스트: 회로가 열렸고 속도도 최소로 내려가 토큰이 없음
+    health = http.get_host_health("down.example.com")
+    for _ in range(http.CIRCUIT_FAILURE_THRESHOLD):
+        health.record_failure()
+    limiter = http.get_host_limiter("down.example.com")
+    limiter.rate = http.HOST_RATE_MIN
+    limiter.tokens = 0.0
+
+    async def scenario():
+        started = time.monotonic()
+        for _ in range(5):
+            with pytest.raises(http.CircuitOpenError):
+                await http.request_get("http://down.example.com/detail")
+        return time.monotonic() - started
+
+    assert run(scenario()) < 0.5
+    assert sent == []
+    assert health.rejected == 5
+    assert limiter.tokens <= 0.0 and limiter.wait_seconds == 0.0
@@ -0,0 +1,70 @@
+# tests/test_scrap_membership.py
+"""스크랩 여부 캐시"""
+import pytest
+from sqlalchemy import delete
+
+from app.database.database import AsyncSessionLocal
+from app.database.models import Device, Notice, Scrap
+from app.services import scrap_membership
+from conftest import run
+
+
+@pytest.fixture(autouse=True)
+def clear_membership(monkeypatch):
+    monkeypatch.setattr(scrap_membership, "_membership", scrap_membership.OrderedDict())
+
+
+async def _seed():
+    async with AsyncSessionLocal() as db:
+        device = Device(token="ExponentPushToken[scrap]")
+        notices = [Notice(title=f"공지 {i}", link=f"https://example.com/{i}", category="academic", content="본문") for i in range(3)]
+        db.add(device)
+        db.add_all(notices)
+        await db.flush()
+        db.add(Scrap(device_id=device.id, notice_id=notices[0].id))
+        await db.commit()
+        return device.id, [n.id for n in notices]
+
+
+class _ToggleDuringQuery:
+    """조회가 끝나기 직전에 다른 요청의 스크랩 취소가 커밋되는 상황을 흉내 냅니다."""
+
+    def __init__(self, db, device_id, notice_id):
+        self.db = db
+        self.device_id = device_id
+        self.notice_id = notice_id
+
+    async def execute(self, stmt):
+        result = await self.db.execute(stmt)
+        async with AsyncSessionLocal() as other:
+            await other.execute(delete(Scrap).where(Scrap.notice_id == self.notice_id))
+            await other.commit()
+        scrap_membership.record_toggle(self.device_id, self.notice_id, False)
+        return result
+
+
+def test_remembers_query_results(fresh_db):
+    async def scenario():
+        device_id, ids = await _seed()
+        async with AsyncSessionLocal() as db:
+            first = await scrap_membership.scraped_ids(db, device_id, ids)
+            second = await scrap_membership.scraped_ids(db, device_id, ids)
+        return ids, first, second
+
+    ids, first, second = run(scenario())
+    assert first == second == {ids[0]}
+    assert scrap_membership.get_stats()["membership_hits"] >= 1
+
+
+def test_toggle_during_query_is_not_overwritten(fresh_db):
+    async def scenario():
+        device_id, ids = await _seed()
+        async with AsyncSessionLocal() as db:
+            during = await scrap_membership.scraped_ids(_ToggleDuringQuery(db, device_id, ids[0]), device_id, ids)
+            after = await scrap_membership.scraped_ids(db, device_id, ids)
+        return during, after
+
+    during, after = run(scenario())
+    # 조회 결과(토글 전 값)가 record_toggle의 값을 덮지 않음
+    assert during == set()
+    assert after == set()